@@ -0,0 +1,59 @@
+import json
+
+import numpy as np
+import pytest
+
+from components.trades import RecentTradesPanel
+from conftest import book_levels, kline_rows, trade_message
+from utils.resample import Bars, Resampler
+
+
+@pytest.mark.benchmark(group="decode")
+def test_trade_message(benchmark):
+    """WebSocket trade -> tape row (what the trades thread does per message)."""
+    messages = [trade_message(i) for i in range(1000)]
+
+    def run():
+        for m in messages:
+            d = json.loads(m)
+            RecentTradesPanel._row(d["T"], float(d["p"]), d["m"], d["t"])
+
+    benchmark(run)
+
+
+@pytest.mark.benchmark(group="decode")
+@pytest.mark.parametrize("depth", [5, 20, 100])
+def test_depth_message(benchmark, depth):
+    """Combined-stream depth update -> float arrays (feed process)."""
+    bids, asks = book_levels(depth)
+    message = json.dumps({"stream": f"btcusdt@depth{depth}@100ms",
+                          "data": {"lastUpdateId": 1, "bids": bids, "asks": asks}})
+
+    def run():
+        d = json.loads(message)["data"]
+        np.asarray(d["bids"], dtype=float).reshape(-1, 2)
+        np.asarray(d["asks"], dtype=float).reshape(-1, 2)
+
+    benchmark(run)
+
+
+@pytest.mark.benchmark(group="decode")
+@pytest.mark.parametrize("n", [60, 1000, 15_000])
+def test_klines_to_bars(benchmark, n):
+    rows = kline_rows(n)
+    benchmark(Bars.from_klines, rows)
+
+
+@pytest.mark.benchmark(group="decode")
+@pytest.mark.parametrize("n", [2, 1000])
+def test_resampler_merge(benchmark, n):
+    """Merging a poll into a full 15k-minute history (2 rows = the usual poll)."""
+    history = kline_rows(15_000)
+    update = kline_rows(15_000 + n)[-n:]
+
+    def setup():
+        r = Resampler(max_bars=15_000)
+        r.merge(history)
+        return (r,), {}
+
+    benchmark.pedantic(lambda r: r.merge(update), setup=setup, rounds=50)
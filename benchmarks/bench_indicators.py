@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from conftest import kline_rows
+from utils.indicators import IndicatorGraph, ema, parse_spec
+from utils.resample import INTERVAL_MINUTES, Bars, resample
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+@pytest.mark.benchmark(group="ema")
+@pytest.mark.parametrize("n", SIZES)
+def test_ema(benchmark, n):
+    values = 30_000 + np.cumsum(np.random.default_rng(0).normal(0, 5, n))
+    benchmark(ema, values, 26)
+
+
+def _graph():
+    g = IndicatorGraph()
+    close = g.source("close")
+    g.ema(close, 12)
+    g.ema(close, 26)
+    for spec in ("bb:20:2", "rsi:14", "macd"):
+        parse_spec(g, spec, close)
+    return g
+
+
+@pytest.mark.benchmark(group="indicator-graph")
+@pytest.mark.parametrize("n", [1_000, 15_000])
+def test_graph_full(benchmark, n):
+    """First render of a symbol: every node over the whole history."""
+    bars = Bars.from_klines(kline_rows(n))
+    benchmark(lambda: _graph().update(bars))
+
+
+@pytest.mark.benchmark(group="indicator-graph")
+def test_graph_incremental(benchmark):
+    """Steady state: one more closed bar on a 15k history."""
+    rows = kline_rows(15_001)
+    before, after = Bars.from_klines(rows[:-1]), Bars.from_klines(rows)
+
+    def setup():
+        g = _graph()
+        g.update(before)
+        return (g,), {}
+
+    benchmark.pedantic(lambda g: g.update(after), setup=setup, rounds=50)
+
+
+@pytest.mark.benchmark(group="resample")
+@pytest.mark.parametrize("interval", ["5m", "1h", "4h"])
+def test_resample(benchmark, interval):
+    """Full 1m -> interval rebuild (timeframe switch without a cached series)."""
+    m1 = Bars.from_klines(kline_rows(15_000))
+    benchmark(resample, m1, INTERVAL_MINUTES[interval])
@@ -0,0 +1,33 @@
+import pytest
+
+from components.orderbook import OrderBookPanel
+from conftest import book_levels
+from utils.book_analytics import BookAnalytics
+
+DEPTHS = [5, 20, 100, 1000]
+
+
+@pytest.mark.benchmark(group="book-analytics")
+@pytest.mark.parametrize("depth", DEPTHS)
+def test_analytics_update(benchmark, depth):
+    """String levels -> arrays -> spread / imbalance / slippage, plus the stats line."""
+    bids, asks = book_levels(depth)
+    analytics = BookAnalytics()
+    benchmark(lambda: OrderBookPanel._format_stats(analytics.update(bids, asks)))
+
+
+@pytest.mark.benchmark(group="book-panel")
+@pytest.mark.parametrize("depth", DEPTHS)
+def test_apply_snapshot(benchmark, tk_root, depth):
+    """Full panel update (analytics + ladder redraw); alternating books so rows really change."""
+    panel = OrderBookPanel(tk_root, None, "BTCUSDT", limit=depth)
+    panel.pack()
+    books = [book_levels(depth, seed=s) for s in range(2)]
+    i = iter(range(1 << 30))
+
+    def run():
+        panel.apply_snapshot(*books[next(i) % 2])
+        tk_root.update_idletasks()
+
+    benchmark(run)
+    panel.destroy()
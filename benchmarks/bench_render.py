@@ -0,0 +1,58 @@
+import pytest
+
+from components.chart import CandleChartPanel
+from components.trades import RecentTradesPanel
+from conftest import START_MS, kline_rows
+from utils.chart_export import draw_chart, render_figure, snapshot_from_bars
+from utils.resample import Bars, Resampler
+
+
+@pytest.mark.benchmark(group="trades-render")
+@pytest.mark.parametrize("rows", [10, 50, 200, 1000])
+def test_trades_render(benchmark, tk_root, rows):
+    """RecentTradesPanel._render: Treeview rebuilt from the row deque."""
+    panel = RecentTradesPanel(tk_root, max_rows=rows)
+    panel.pack()
+    for i in range(rows):
+        panel._rows.appendleft(panel._row(START_MS + i, 30_000 + i * 0.01, bool(i % 2)))
+
+    def run():
+        panel._render()
+        tk_root.update_idletasks()
+
+    benchmark(run)
+    panel.destroy()
+
+
+@pytest.mark.benchmark(group="chart-redraw")
+@pytest.mark.parametrize("limit", [60, 500, 5000])
+def test_chart_agg(benchmark, limit):
+    """Headless chart: draw_chart + Agg rasterisation of the same figure the panel shows."""
+    snap = snapshot_from_bars("BTCUSDT", "1m", Bars.from_klines(kline_rows(limit + 100)), limit=limit,
+                              overlays=("bb:20:2",))
+    fig = render_figure(snap)
+    ax = fig.axes[0]
+
+    def run():
+        draw_chart(ax, snap)
+        fig.canvas.draw()
+
+    benchmark(run)
+
+
+@pytest.mark.benchmark(group="chart-redraw")
+@pytest.mark.parametrize("limit", [60, 500])
+def test_chart_panel(benchmark, tk_root, limit):
+    """CandleChartPanel._render on Tk (indicators, readouts, TkAgg draw)."""
+    panel = CandleChartPanel(tk_root, None, "BTCUSDT", limit=limit, overlays=("bb:20:2",))
+    panel.pack()
+    resampler = Resampler()
+    resampler.merge(kline_rows(15_000))
+    panel.set_symbol("BTCUSDT", resampler)
+
+    def run():
+        panel._render()
+        tk_root.update_idletasks()
+
+    benchmark(run)
+    panel.destroy()
@@ -0,0 +1,53 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pytest
+
+START_MS = 1_700_000_000_000
+
+
+def kline_rows(n: int, seed: int = 0):
+    """Binance-style 1m kline rows (strings, like the REST response)."""
+    rng = np.random.default_rng(seed)
+    close = 30_000 + np.cumsum(rng.normal(0, 5, n))
+    rows = []
+    for i, c in enumerate(close):
+        t = START_MS + i * 60_000
+        rows.append([t, f"{c - 1:.2f}", f"{c + 3:.2f}", f"{c - 4:.2f}", f"{c:.2f}", f"{rng.random() * 10:.5f}",
+                     t + 59_999, "0", 100, "0", "0", "0"])
+    return rows
+
+
+def book_levels(depth: int, mid: float = 30_000.0, seed: int = 0):
+    """([price, qty] bids, asks) as strings, best first."""
+    rng = np.random.default_rng(seed)
+    bids = [[f"{mid - 0.01 * (i + 1):.2f}", f"{rng.random() * 2:.6f}"] for i in range(depth)]
+    asks = [[f"{mid + 0.01 * (i + 1):.2f}", f"{rng.random() * 2:.6f}"] for i in range(depth)]
+    return bids, asks
+
+
+def trade_message(i: int = 0, symbol: str = "BTCUSDT") -> str:
+    return json.dumps({
+        "e": "trade", "E": START_MS + i, "s": symbol, "t": 1_000_000 + i, "p": f"{30_000 + i % 100 * 0.01:.2f}",
+        "q": "0.01200000", "T": START_MS + i, "m": bool(i % 2), "M": True,
+    })
+
+
+@pytest.fixture(scope="session")
+def tk_root():
+    """A hidden Tk root, or skip when there is no display (use xvfb-run)."""
+    import tkinter as tk
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display for Tk")
+    root.withdraw()
+    yield root
+    root.destroy()
@@ -0,0 +1,432 @@
+"""
+Capacity test of the whole UI pipeline against synthetic in-process feeds.
+
+DashboardApp runs unchanged; only the Binance REST client and the feed
+process are swapped for generators that write the same shared-memory
+blocks, so data reaches the panels through FeedBridge exactly as live data
+does. For each symbol count the trade rate is ramped; every step reports
+Tk loop lag, frames per second, event-to-render latency percentiles, CPU
+and RSS, and the ramp stops at the first SLO breach.
+
+    python benchmarks/stress.py --symbols 5,20,50 --rates 100,1000,5000 --csv stress.csv
+
+Needs a display (xvfb-run works). The generator thread shares the process
+(and the GIL) with Tk, so CPU includes it.
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import threading
+import time
+import tkinter as tk
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+try:
+    import psutil
+except Exception:
+    psutil = None
+
+import main as dashboard
+from utils.feed_process import TRADE_DTYPE, FeedProcess
+from utils.resample import INTERVAL_MINUTES, MINUTE_MS
+from utils.settings import Settings
+
+
+def _base_price(symbol: str) -> float:
+    return 10.0 + sum(map(ord, symbol)) % 97 * 50.0
+
+
+# =========================
+# Synthetic sources
+# =========================
+class SyntheticClient:
+    """BinanceRESTClient stand-in: generated klines / books / trades, no network."""
+
+    used_weight = 0
+
+    def __init__(self, seed: int = 0):
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()  # called from the Tk thread and workers
+
+    def _walk(self, symbol: str, n: int, step: float) -> np.ndarray:
+        with self._lock:
+            steps = self._rng.normal(0, step, n)
+        return _base_price(symbol) * (1 + np.cumsum(steps))
+
+    def get_klines(self, symbol, interval, limit=60, start_time=None, end_time=None):
+        span = INTERVAL_MINUTES.get(interval, 1) * MINUTE_MS
+        end = int(end_time if end_time is not None else time.time() * 1000)
+        first = (end // span - limit + 1) * span
+        close = self._walk(symbol, limit, 0.0005)
+        return [[first + i * span, f"{c:.4f}", f"{c * 1.001:.4f}", f"{c * 0.999:.4f}", f"{c:.4f}", "1.0",
+                 first + (i + 1) * span - 1] for i, c in enumerate(close)]
+
+    def get_klines_many(self, items, max_threads=8):
+        return [self.get_klines(symbol, interval, limit) for symbol, interval, limit in items]
+
+    def get_orderbook(self, symbol, limit=10):
+        mid = _base_price(symbol)
+        return {"bids": [[f"{mid - 0.01 * (i + 1):.4f}", "1.0"] for i in range(limit)],
+                "asks": [[f"{mid + 0.01 * (i + 1):.4f}", "1.0"] for i in range(limit)]}
+
+    def get_trades(self, symbol, limit=20):
+        now = int(time.time() * 1000)
+        price = _base_price(symbol)
+        return [{"id": i, "price": f"{price:.4f}", "qty": "0.1", "time": now - (limit - i) * 100,
+                 "isBuyerMaker": bool(i % 2)} for i in range(limit)]
+
+    def get_24hr_stats(self, symbol):
+        price = _base_price(symbol)
+        return {"symbol": symbol, "lastPrice": f"{price:.4f}", "priceChange": "0", "priceChangePercent": "0"}
+
+    def get_price(self, symbol):
+        return {"symbol": symbol, "price": f"{_base_price(symbol):.4f}"}
+
+    def close(self):
+        pass
+
+
+class SyntheticFeed(FeedProcess):
+    """
+    FeedProcess whose writer is a thread generating market data instead of
+    a socket: `rate` trades/s for the shown symbol (stamped with the wall
+    clock, so the reader can measure latency), a 100 ms book, a 1 s kline
+    update, and one ticker per symbol per second, spread over the second.
+    """
+
+    TICK_S = 0.005
+
+    def __init__(self, symbols: Sequence[str], symbol: str, depth: int = 20, rate: float = 100.0, seed: int = 0):
+        super().__init__("", symbols, symbol, depth=depth, trade_capacity=1 << 16)
+        self.rate = rate
+        self._rng = np.random.default_rng(seed)
+        self._price = np.array([_base_price(s) for s in self.symbols])
+        self._open = self._price.copy()
+        self._thread: Optional[threading.Thread] = None
+        self._running = threading.Event()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="synthetic-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        for block in (self.tickers, self.trades, self.book, self.kline):
+            block.close(unlink=True)
+
+    def set_symbol(self, symbol: str):
+        if symbol.upper() == self.symbol:
+            return
+        self.symbol = symbol.upper()
+        self.gen += 1
+
+    def _run(self):
+        owed = 0.0
+        tick = 0
+        next_book = next_kline = time.monotonic()
+        while self._running.is_set():
+            now = time.monotonic()
+            now_ms = int(time.time() * 1000)
+            i = self.symbols.index(self.symbol)
+
+            owed += self.rate * self.TICK_S
+            n = int(owed)
+            owed -= n
+            if n:
+                steps = self._rng.normal(0, 1e-5, n)
+                prices = self._price[i] * (1 + np.cumsum(steps))
+                self._price[i] = prices[-1]
+                batch = np.empty(n, dtype=TRADE_DTYPE)
+                batch["gen"] = self.gen
+                batch["time"] = now_ms
+                batch["price"] = prices
+                batch["qty"] = self._rng.random(n)
+                batch["sell"] = steps < 0
+                self.trades.push_many(batch)
+
+            # every symbol once per second, a slice per tick
+            per_tick = max(1, int(round(1 / self.TICK_S)))
+            due = np.arange(tick % per_tick, len(self.symbols), per_tick)
+            if due.size:
+                self._price[due] *= 1 + self._rng.normal(0, 1e-4, due.size)
+                with self.tickers.writing() as t:
+                    t[due, 0] = self._price[due]
+                    t[due, 1] = self._price[due] - self._open[due]
+                    t[due, 2] = (self._price[due] / self._open[due] - 1) * 100
+                    t[due, 3] = now_ms
+
+            if now >= next_book:
+                next_book = now + 0.1
+                mid = self._price[i]
+                offsets = 0.0001 * mid * np.arange(1, self.depth + 1)
+                with self.book.writing() as b:
+                    b["gen"] = self.gen
+                    b["nb"] = b["na"] = self.depth
+                    b["bids"][:, 0] = mid - offsets
+                    b["asks"][:, 0] = mid + offsets
+                    b["bids"][:, 1] = b["asks"][:, 1] = self._rng.random(self.depth) * 2
+
+            if now >= next_kline:
+                next_kline = now + 1.0
+                p = self._price[i]
+                with self.kline.writing() as k:
+                    k["gen"] = self.gen
+                    k["row"] = (now_ms - now_ms % MINUTE_MS, p, p * 1.0005, p * 0.9995, p, 1.0)
+                    k["closed"] = 0
+
+            tick += 1
+            time.sleep(max(0.0, self.TICK_S - (time.monotonic() - now)))
+
+
+# =========================
+# Measurement
+# =========================
+@dataclass
+class SLO:
+    """Limits a step must stay within (0 disables a check)."""
+    lag_p99_ms: float = 100.0
+    latency_p99_ms: float = 250.0
+    min_fps: float = 8.0
+    max_cpu_pct: float = 0.0
+
+    def breaches(self, r: "StepResult") -> List[str]:
+        out = []
+        if self.lag_p99_ms and r.lag_p99_ms > self.lag_p99_ms:
+            out.append(f"lag p99 {r.lag_p99_ms:.0f}>{self.lag_p99_ms:.0f}ms")
+        if self.latency_p99_ms and r.latency_p99_ms > self.latency_p99_ms:
+            out.append(f"latency p99 {r.latency_p99_ms:.0f}>{self.latency_p99_ms:.0f}ms")
+        if self.min_fps and r.fps < self.min_fps:
+            out.append(f"fps {r.fps:.1f}<{self.min_fps:.1f}")
+        if self.max_cpu_pct and r.cpu_pct > self.max_cpu_pct:
+            out.append(f"cpu {r.cpu_pct:.0f}>{self.max_cpu_pct:.0f}%")
+        return out
+
+
+@dataclass
+class StepResult:
+    symbols: int
+    rate: int
+    delivered_per_s: float
+    lag_p50_ms: float
+    lag_p99_ms: float
+    fps: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+    cpu_pct: float
+    rss_mb: float
+    breach: str = ""
+
+
+def rss_mb() -> float:
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 2**20
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except Exception:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # peak, not current
+
+
+def _pct(values, q: float) -> float:
+    return float(np.percentile(values, q)) if len(values) else 0.0
+
+
+class StressRun:
+    """
+    Drives one DashboardApp per symbol count from the Tk event loop (no
+    blocking waits): each rate step runs `warmup_s` unmeasured, then
+    `step_s` measured. Latency is trade generation -> the trades panel's
+    push_trades() (which renders) returning; frames are redraws of the
+    trades table (the panel every trade batch repaints).
+    """
+
+    def __init__(self, symbol_steps: Sequence[int], rate_steps: Sequence[int], step_s: float = 10.0,
+                 warmup_s: float = 2.0, slo: Optional[SLO] = None, on_result=None):
+        self.symbol_steps = list(symbol_steps)
+        self.rate_steps = list(rate_steps)
+        self.step_s = step_s
+        self.warmup_s = warmup_s
+        self.slo = slo or SLO()
+        self.on_result = on_result
+        self.results: List[StepResult] = []
+
+        self._frames = 0
+        self._latencies: List[np.ndarray] = []
+        self._delivered = 0
+
+    def run(self) -> List[StepResult]:
+        # prefs / runtime snapshot of the stress app must not replace the user's
+        tmp = Path(tempfile.mkdtemp(prefix="dashboard-stress-"))
+        dashboard.PREF_PATH = tmp / "prefs.json"
+        dashboard.RUNTIME_PATH = tmp / "runtime.npz"
+
+        for n in self.symbol_steps:
+            breached = self._run_symbols(n)
+            if breached is not None and breached == self.rate_steps[0]:
+                break  # even the lowest rate fails: more symbols will not do better
+        return self.results
+
+    def _run_symbols(self, n: int) -> Optional[int]:
+        """Ramp the rate with `n` symbols; returns the rate that breached (None if none did)."""
+        assets = [(f"S{i:03d}USDT", f"S{i:03d}/USDT") for i in range(n)]
+        settings = Settings(assets=assets, feed_process=True, power_save=False, record=False,
+                            prefetch_assets=False, metrics_port=0)
+        feed = SyntheticFeed([s for s, _ in assets], assets[0][0], depth=settings.orderbook_limit)
+        root = tk.Tk()
+        app = dashboard.DashboardApp(root, settings, client=SyntheticClient(), feed=feed)
+        self._hook(app)
+
+        state = {"step": 0, "breached": None}
+
+        def start_step():
+            rate = self.rate_steps[state["step"]]
+            feed.rate = rate
+            root.after(int(self.warmup_s * 1000), measure, rate)
+
+        def measure(rate):
+            self._reset()
+            wall, cpu = time.perf_counter(), time.process_time()
+            since = time.time()
+            root.after(int(self.step_s * 1000), finish, rate, wall, cpu, since)
+
+        def finish(rate, wall, cpu, since):
+            elapsed = time.perf_counter() - wall
+            lags = [lag for t, lag in app.monitor.lags if t >= since]
+            lat = np.concatenate(self._latencies) if self._latencies else np.empty(0)
+            r = StepResult(
+                symbols=n,
+                rate=rate,
+                delivered_per_s=self._delivered / elapsed,
+                lag_p50_ms=_pct(lags, 50),
+                lag_p99_ms=_pct(lags, 99),
+                fps=self._frames / elapsed,
+                latency_p50_ms=_pct(lat, 50),
+                latency_p95_ms=_pct(lat, 95),
+                latency_p99_ms=_pct(lat, 99),
+                cpu_pct=(time.process_time() - cpu) / elapsed * 100,
+                rss_mb=rss_mb(),
+            )
+            r.breach = "; ".join(self.slo.breaches(r))
+            self.results.append(r)
+            if self.on_result:
+                self.on_result(r)
+            state["step"] += 1
+            if r.breach:
+                state["breached"] = rate
+            if r.breach or state["step"] >= len(self.rate_steps):
+                app.on_close()  # destroys root -> mainloop returns
+            else:
+                start_step()
+
+        root.after(500, start_step)
+        root.mainloop()
+        return state["breached"]
+
+    def _hook(self, app):
+        bridge = app.feed_bridge
+        on_trades = bridge.on_trades
+
+        def timed_trades(records):
+            on_trades(records)
+            self._latencies.append(time.time() * 1000 - records["time"])
+            self._delivered += records.size
+
+        bridge.on_trades = timed_trades
+
+        # instance override, so only this app's panel is counted
+        panel = app.trades_panel
+        if panel is None:
+            return
+        render = panel._render
+
+        def counted_render():
+            render()
+            self._frames += 1
+
+        panel._render = counted_render
+
+    def _reset(self):
+        self._frames = 0
+        self._latencies = []
+        self._delivered = 0
+
+
+# =========================
+# Output
+# =========================
+COLUMNS = [
+    ("symbols", "{:>7d}"), ("rate", "{:>7d}"), ("delivered_per_s", "{:>9.0f}"),
+    ("lag_p50_ms", "{:>7.1f}"), ("lag_p99_ms", "{:>7.1f}"), ("fps", "{:>5.1f}"),
+    ("latency_p50_ms", "{:>7.1f}"), ("latency_p95_ms", "{:>7.1f}"), ("latency_p99_ms", "{:>7.1f}"),
+    ("cpu_pct", "{:>6.0f}"), ("rss_mb", "{:>7.1f}"), ("breach", "{}"),
+]
+HEADERS = ["symbols", "rate", "deliv/s", "lag50", "lag99", "fps", "lat50", "lat95", "lat99", "cpu%", "rss MB", "SLO"]
+
+
+def table_header() -> str:
+    widths = [len(fmt.format(0)) if name != "breach" else 0 for name, fmt in COLUMNS[:-1]] + [0]
+    return "  ".join(h.rjust(w) for h, w in zip(HEADERS, widths))
+
+
+def table_row(r: StepResult) -> str:
+    values = asdict(r)
+    return "  ".join(fmt.format(values[name]) for name, fmt in COLUMNS)
+
+
+def write_csv(path, results: Sequence[StepResult]):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=[fl.name for fl in fields(StepResult)])
+        w.writeheader()
+        for r in results:
+            w.writerow(asdict(r))
+
+
+def _ints(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    p = argparse.ArgumentParser(description="Ramp synthetic feeds through DashboardApp until an SLO breaks")
+    p.add_argument("--symbols", type=_ints, default=[5, 20, 50, 100], help="symbol counts (comma separated)")
+    p.add_argument("--rates", type=_ints, default=[100, 500, 1000, 2000, 5000, 10000],
+                   help="trades/s of the shown symbol (comma separated)")
+    p.add_argument("--step-s", type=float, default=10.0, help="measured seconds per step")
+    p.add_argument("--warmup-s", type=float, default=2.0, help="unmeasured seconds after a rate change")
+    p.add_argument("--max-lag-ms", type=float, default=SLO.lag_p99_ms, help="SLO: Tk loop lag p99")
+    p.add_argument("--max-latency-ms", type=float, default=SLO.latency_p99_ms, help="SLO: event-to-render p99")
+    p.add_argument("--min-fps", type=float, default=SLO.min_fps, help="SLO: trades table redraws/s")
+    p.add_argument("--max-cpu", type=float, default=SLO.max_cpu_pct, help="SLO: process CPU %% (0 = off)")
+    p.add_argument("--csv", default=f"stress-{time.strftime('%Y%m%d-%H%M%S')}.csv", help="CSV output path")
+    args = p.parse_args(argv)
+
+    slo = SLO(args.max_lag_ms, args.max_latency_ms, args.min_fps, args.max_cpu)
+    print(table_header())
+    run = StressRun(args.symbols, args.rates, args.step_s, args.warmup_s, slo,
+                    on_result=lambda r: print(table_row(r), flush=True))
+    try:
+        results = run.run()
+    except tk.TclError as e:
+        raise SystemExit(f"Tk: {e} (no display? try xvfb-run)")
+    write_csv(args.csv, results)
+    print(f"\n{len(results)} steps -> {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
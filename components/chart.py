@@ -1,3 +1,5 @@
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk
 from typing import Optional, List
@@ -7,6 +9,9 @@ from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 from utils.binance_api import BinanceRESTClient
+from utils.chart_export import OVERLAY_COLORS, ChartSnapshot, draw_chart
+from utils.resample import INTERVAL_MINUTES, MINUTE_MS, Bars, Resampler
+from utils.indicators import IndicatorGraph, parse_spec
 
 
 class CandleChartPanel(ttk.Frame):
@@ -15,6 +20,8 @@ class CandleChartPanel(ttk.Frame):
     - Draw close price line
     - Draw EMA fast/slow
     - Display signal: BUY/SELL/NEUTRAL (based on EMA crossover)
+    Only 1m klines are downloaded; other timeframes are resampled locally,
+    so switching timeframe is a redraw without network.
     """
 
     def __init__(
@@ -27,6 +34,10 @@ class CandleChartPanel(ttk.Frame):
         poll_ms: int = 10_000,
         ema_fast: int = 12,
         ema_slow: int = 26,
+        history_minutes: int = 15_000,
+        overlays=(),
+        readouts=(),
+        cadence=None,
     ):
         super().__init__(parent, padding=12)
         self.client = client
@@ -34,12 +45,28 @@ class CandleChartPanel(ttk.Frame):
         self.interval = interval
         self.limit = limit
         self.poll_ms = poll_ms
+        self.cadence = cadence  # AdaptiveCadence: poll faster when the market is busy
 
         self.ema_fast = int(ema_fast)
         self.ema_slow = int(ema_slow)
 
+        # indicator specs ("ema:50", "bb:20:2", "rsi:14", ...); overlays are
+        # plotted on the price axis, readouts shown as text
+        self.overlays = list(overlays)
+        self.readouts = list(readouts)
+        self._graphs = {}  # interval -> (IndicatorGraph, nodes dict)
+        self._snapshot: Optional[ChartSnapshot] = None  # what is on screen (for exports)
+        self._taps = []  # fn(symbol, rows) with every batch of 1m klines polled/streamed
+
         self._job: Optional[str] = None
         self._active = False
+        self._suspended = False
+
+        # 1m series + derived timeframes; intervals that can't be derived
+        # from 1m (e.g. 1w) are downloaded directly into _direct
+        self.resampler = Resampler(max_bars=history_minutes)
+        self._direct = Bars()
+        self._backfilling = False
 
         self._build_ui()
 
@@ -57,6 +84,12 @@ class CandleChartPanel(ttk.Frame):
         )
         self.info.pack(side=tk.RIGHT)
 
+        self.tf_var = tk.StringVar(value=self.interval)
+        self.tf_box = ttk.Combobox(top, textvariable=self.tf_var, values=list(INTERVAL_MINUTES),
+                                   state="readonly", width=5)
+        self.tf_box.pack(side=tk.RIGHT, padx=(0, 8))
+        self.tf_box.bind("<<ComboboxSelected>>", lambda e: self.set_interval(self.tf_var.get()))
+
         # status row
         row = ttk.Frame(self)
         row.pack(fill=tk.X, pady=(8, 0))
@@ -71,6 +104,9 @@ class CandleChartPanel(ttk.Frame):
         )
         self.signal_label.pack(side=tk.RIGHT)
 
+        self.readout_label = ttk.Label(row, text="", font=("Arial", 9))
+        self.readout_label.pack(side=tk.RIGHT, padx=(0, 12))
+
         # matplotlib
         fig = Figure(figsize=(7, 3.6), facecolor="#111827")
         self.ax = fig.add_subplot(111)
@@ -84,19 +120,26 @@ class CandleChartPanel(ttk.Frame):
         self.canvas_widget.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
 
     # ---------- helpers ----------
-    @staticmethod
-    def _ema(values: np.ndarray, period: int) -> np.ndarray:
-        """Compute EMA (same length as values)."""
-        if len(values) == 0:
-            return values
-        period = max(1, int(period))
-        alpha = 2.0 / (period + 1.0)
-
-        ema = np.empty_like(values, dtype=float)
-        ema[0] = values[0]
-        for i in range(1, len(values)):
-            ema[i] = alpha * values[i] + (1 - alpha) * ema[i - 1]
-        return ema
+    def _graph(self):
+        """Indicator graph for the current interval (built once, updated incrementally)."""
+        entry = self._graphs.get(self.interval)
+        if entry is None:
+            g = IndicatorGraph()
+            close = g.source("close")
+            nodes = {
+                "fast": g.ema(close, self.ema_fast),
+                "slow": g.ema(close, self.ema_slow),
+                "overlays": {},
+                "readouts": {},
+            }
+            # same specs share nodes (e.g. ema:12 overlay == signal EMA, MACD reuses both)
+            for spec in self.overlays:
+                nodes["overlays"].update(parse_spec(g, spec, close))
+            for spec in self.readouts:
+                label, node = next(iter(parse_spec(g, spec, close).items()))
+                nodes["readouts"][label] = node
+            entry = self._graphs[self.interval] = (g, nodes)
+        return entry
 
     def _set_signal(self, text: str, color: str):
         # ttk label color: use style OR fallback via tk.Label
@@ -104,18 +147,53 @@ class CandleChartPanel(ttk.Frame):
         self.signal_label.config(text=text, foreground=color)
 
     # ---------- control ----------
-    def set_symbol(self, symbol: str):
+    def set_symbol(self, symbol: str, resampler: Optional[Resampler] = None, graphs: Optional[dict] = None):
+        """
+        Switch symbol. A warm resampler / indicator graphs (SymbolCache) are
+        adopted as-is and drawn right away; otherwise the chart starts empty.
+        """
         self.symbol = symbol.upper()
         self.info.config(text=f"{self.symbol} | {self.interval} | last {self.limit}")
+        self.resampler = resampler if resampler is not None else Resampler(max_bars=self.resampler.max_bars)
+        self._graphs = graphs if graphs is not None else {}
+        self._direct = Bars()
+        self._snapshot = None
+        if len(self.resampler) and self.interval in INTERVAL_MINUTES:
+            self._render()
+
+    def set_interval(self, interval: str):
+        """Switch timeframe; derived intervals redraw from memory immediately."""
+        self.interval = interval
+        self.tf_var.set(interval)
+        self.info.config(text=f"{self.symbol} | {self.interval} | last {self.limit}")
+        if interval in INTERVAL_MINUTES and len(self.resampler):
+            self._render()
+            self._ensure_history()
+        elif self._active:
+            self._tick()
 
     def start(self):
         if self._active:
             return
         self._active = True
+        if self.cadence:
+            self.cadence.enabled = True
         self._schedule()
 
     def stop(self):
         self._active = False
+        if self.cadence:
+            self.cadence.enabled = False
+        if self._job:
+            try:
+                self.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def suspend(self):
+        """Low-power: no polling and no drawing until resume()."""
+        self._suspended = True
         if self._job:
             try:
                 self.after_cancel(self._job)
@@ -123,11 +201,95 @@ class CandleChartPanel(ttk.Frame):
                 pass
             self._job = None
 
+    def resume(self):
+        """Catch up with one poll + redraw, then continue the normal cadence."""
+        if not self._suspended:
+            return
+        self._suspended = False
+        if self._active:
+            self._schedule()
+
     def _schedule(self):
-        if not self._active:
+        if not self._active or self._suspended:
             return
-        self._job = self.after(self.poll_ms, self._tick)
+        # update now, then re-arm the timer for the next poll
         self._tick()
+        if self._active:
+            delay = self.cadence.next_ms() if self.cadence else self.poll_ms
+            self._job = self.after(delay, self._schedule)
+
+    def add_tap(self, fn):
+        """fn(symbol, rows) with the raw 1m kline rows of every poll / stream update."""
+        self._taps.append(fn)
+
+    # ---------- data ----------
+    def apply_kline(self, row):
+        """Forming/closed 1m bar from a stream ([open_time, o, h, l, c, v]); shown on the next render."""
+        for fn in self._taps:
+            fn(self.symbol, [row])
+        if self.resampler.last_open_time is not None and row[0] >= self.resampler.last_open_time:
+            self.resampler.merge([row])
+
+    def _fetch(self):
+        if self.interval not in INTERVAL_MINUTES:
+            self._direct = Bars.from_klines(self.client.get_klines(self.symbol, self.interval, self.limit))
+            return
+
+        last = self.resampler.last_open_time
+        if last is None:
+            rows = self.client.get_klines(self.symbol, "1m", 1000)
+        else:
+            # only the bars since the last poll (+ the one still forming)
+            missing = int((time.time() * 1000 - last) // MINUTE_MS) + 2
+            rows = self.client.get_klines(self.symbol, "1m", min(1000, max(2, missing)))
+        for fn in self._taps:
+            fn(self.symbol, rows)
+        self.resampler.merge(rows)
+        self._ensure_history()
+
+    def _bars(self) -> Bars:
+        if self.interval not in INTERVAL_MINUTES:
+            return self._direct
+        return self.resampler.get(self.interval)
+
+    def _needed_minutes(self) -> int:
+        minutes = INTERVAL_MINUTES.get(self.interval, 1)
+        # a few slow-EMA periods of warm-up before the visible window
+        return min(self.resampler.max_bars, (self.limit + 3 * self.ema_slow) * minutes)
+
+    def _ensure_history(self):
+        """Page older 1m bars in the background until the current timeframe is covered."""
+        first = self.resampler.first_open_time
+        if self._backfilling or first is None or len(self.resampler) >= self._needed_minutes():
+            return
+        self._backfilling = True
+        symbol = self.symbol
+
+        def run(end=first - 1, missing=self._needed_minutes() - len(self.resampler)):
+            try:
+                while missing > 0 and self.symbol == symbol:
+                    rows = self.client.get_klines(symbol, "1m", 1000, end_time=end)
+                    if not rows:
+                        break
+                    end = int(rows[0][0]) - 1
+                    missing -= len(rows)
+                    self.after(0, self._merge_backfill, symbol, rows)
+            except Exception:
+                pass
+            finally:
+                self.after(0, self._backfill_done)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _merge_backfill(self, symbol: str, rows):
+        if symbol != self.symbol:
+            return
+        self.resampler.merge(rows)
+        if not self._suspended:
+            self._render()
+
+    def _backfill_done(self):
+        self._backfilling = False
 
     # ---------- main loop ----------
     def _tick(self):
@@ -136,63 +298,77 @@ class CandleChartPanel(ttk.Frame):
 
         try:
             self.status.config(text="Status: Updating...")
-            klines = self.client.get_klines(self.symbol, self.interval, self.limit)
+            self._fetch()
+            self._render()
+            if self.cadence and len(self.resampler):
+                self.cadence.activity.observe_price(float(self.resampler.m1.close[-1]))
+            self.status.config(text="Status: OK")
 
-            close_prices = np.array([float(k[4]) for k in klines], dtype=float)
+        except Exception:
+            self.status.config(text="Status: Error (REST)")
+            self._set_signal("Signal: --", "#9ca3af")
 
-            # compute EMA
-            ema_fast = self._ema(close_prices, self.ema_fast)
-            ema_slow = self._ema(close_prices, self.ema_slow)
+    def _render(self):
+        bars = self._bars()
+        if len(bars) == 0:
+            return
 
-            # signal from crossover (use last 2 points)
-            signal = "NEUTRAL"
-            sig_color = "#9ca3af"
+        # indicators over all history (incremental after the first pass),
+        # show the last `limit` points
+        graph, nodes = self._graph()
+        graph.update(bars)
+        ema_fast = graph.values(nodes["fast"], self.limit)
+        ema_slow = graph.values(nodes["slow"], self.limit)
+        close_prices = bars.close[-self.limit:]
 
-            if len(close_prices) >= 2:
-                prev_fast, prev_slow = ema_fast[-2], ema_slow[-2]
-                curr_fast, curr_slow = ema_fast[-1], ema_slow[-1]
+        self.readout_label.config(
+            text=" | ".join(f"{label} {graph.last(node):,.2f}" for label, node in nodes["readouts"].items())
+        )
 
-                # crossover up
-                if prev_fast <= prev_slow and curr_fast > curr_slow:
-                    signal = "BUY (EMA Cross Up)"
+        # signal from crossover (use last 2 points)
+        signal = "NEUTRAL"
+        sig_color = "#9ca3af"
+
+        if len(close_prices) >= 2:
+            prev_fast, prev_slow = ema_fast[-2], ema_slow[-2]
+            curr_fast, curr_slow = ema_fast[-1], ema_slow[-1]
+
+            # crossover up
+            if prev_fast <= prev_slow and curr_fast > curr_slow:
+                signal = "BUY (EMA Cross Up)"
+                sig_color = "#22c55e"
+            # crossover down
+            elif prev_fast >= prev_slow and curr_fast < curr_slow:
+                signal = "SELL (EMA Cross Down)"
+                sig_color = "#ef4444"
+            else:
+                # trend bias
+                if curr_fast > curr_slow:
+                    signal = "BULLISH"
                     sig_color = "#22c55e"
-                # crossover down
-                elif prev_fast >= prev_slow and curr_fast < curr_slow:
-                    signal = "SELL (EMA Cross Down)"
+                elif curr_fast < curr_slow:
+                    signal = "BEARISH"
                     sig_color = "#ef4444"
-                else:
-                    # trend bias
-                    if curr_fast > curr_slow:
-                        signal = "BULLISH"
-                        sig_color = "#22c55e"
-                    elif curr_fast < curr_slow:
-                        signal = "BEARISH"
-                        sig_color = "#ef4444"
-
-            self._set_signal(f"Signal: {signal}", sig_color)
-
-            # redraw
-            self.ax.clear()
-
-            # reapply dark style after clear()
-            self.ax.set_facecolor("#111827")
-            self.ax.tick_params(colors="#9ca3af")
-            for spine in self.ax.spines.values():
-                spine.set_visible(False)
-
-            # plot lines
-            self.ax.plot(close_prices, color="#3b82f6", linewidth=2, label="Close")
-            self.ax.plot(ema_fast, color="#f59e0b", linewidth=1.6, label=f"EMA{self.ema_fast}")
-            self.ax.plot(ema_slow, color="#a78bfa", linewidth=1.6, label=f"EMA{self.ema_slow}")
-
-            self.ax.set_title(f"{self.symbol} Close Price ({self.interval})", color="#e5e7eb")
-            self.ax.set_xlabel("Time Index", color="#9ca3af")
-            self.ax.set_ylabel("Price", color="#9ca3af")
-            self.ax.legend(loc="upper left", frameon=False, labelcolor="#e5e7eb")
-
-            self.canvas.draw()
-            self.status.config(text="Status: OK")
 
-        except Exception:
-            self.status.config(text="Status: Error (REST)")
-            self._set_signal("Signal: --", "#9ca3af")
+        self._set_signal(f"Signal: {signal}", sig_color)
+
+        # redraw (copies: the snapshot must not change under a background export)
+        lines = [
+            (f"EMA{self.ema_fast}", ema_fast, "#f59e0b", 1.6),
+            (f"EMA{self.ema_slow}", ema_slow, "#a78bfa", 1.6),
+        ]
+        for i, (label, node) in enumerate(nodes["overlays"].items()):
+            lines.append((label, graph.values(node, self.limit), OVERLAY_COLORS[i % len(OVERLAY_COLORS)], 1.2))
+        self._snapshot = ChartSnapshot(self.symbol, self.interval, np.array(close_prices), lines)
+        draw_chart(self.ax, self._snapshot)
+
+        self.canvas.draw()
+
+    def redraw(self):
+        """Render from memory (no network), e.g. after bars were merged by a replay."""
+        if len(self._bars()):
+            self._render()
+
+    def snapshot(self) -> Optional[ChartSnapshot]:
+        """The chart currently shown (None before the first render)."""
+        return self._snapshot
@@ -0,0 +1,96 @@
+import tkinter as tk
+
+import numpy as np
+
+BG = "#ffffff"
+TEXT_SUB = "#6b7280"
+BID_FILL = "#bbf7d0"
+BID_LINE = "#16a34a"
+ASK_FILL = "#fecaca"
+ASK_LINE = "#dc2626"
+MID_LINE = "#9ca3af"
+
+
+class DepthChart(tk.Canvas):
+    """
+    Cumulative depth chart (bids left of mid, asks right) on a Canvas.
+    The two area polygons and their outlines are created once; each update
+    only recomputes their coordinates with NumPy and calls coords().
+    """
+
+    PAD = 4
+    LABEL_H = 14
+
+    def __init__(self, parent, **kwargs):
+        kwargs.setdefault("bg", BG)
+        kwargs.setdefault("highlightthickness", 0)
+        kwargs.setdefault("bd", 0)
+        super().__init__(parent, **kwargs)
+
+        self._bid_area = self.create_polygon(0, 0, 0, 0, 0, 0, fill=BID_FILL, outline="")
+        self._ask_area = self.create_polygon(0, 0, 0, 0, 0, 0, fill=ASK_FILL, outline="")
+        self._bid_line = self.create_line(0, 0, 0, 0, fill=BID_LINE, width=2)
+        self._ask_line = self.create_line(0, 0, 0, 0, fill=ASK_LINE, width=2)
+        self._mid = self.create_line(0, 0, 0, 0, fill=MID_LINE, dash=(3, 3))
+        self._lo = self.create_text(self.PAD, 0, text="", anchor="sw", fill=TEXT_SUB, font=("Arial", 8))
+        self._hi = self.create_text(0, 0, text="", anchor="se", fill=TEXT_SUB, font=("Arial", 8))
+        self._depth = self.create_text(self.PAD, self.PAD, text="", anchor="nw", fill=TEXT_SUB, font=("Arial", 8))
+
+        self._last = None
+        self.bind("<Configure>", lambda e: self._redraw())
+
+    def update_book(self, bid_px: np.ndarray, bid_qty: np.ndarray, ask_px: np.ndarray, ask_qty: np.ndarray):
+        """Arrays are best-first, as returned by BookAnalytics."""
+        self._last = (bid_px, bid_qty, ask_px, ask_qty)
+        if self.winfo_ismapped():
+            self._redraw()
+
+    def _redraw(self):
+        if self._last is None:
+            return
+        bid_px, bid_qty, ask_px, ask_qty = self._last
+        if bid_px.size == 0 or ask_px.size == 0:
+            return
+
+        w = max(2, self.winfo_width())
+        h = max(2, self.winfo_height())
+        top, bottom = self.PAD, h - self.LABEL_H
+
+        # symmetric price window around mid so both sides share one x scale
+        mid = (bid_px[0] + ask_px[0]) / 2.0
+        half = max(mid - bid_px[-1], ask_px[-1] - mid, 1e-12)
+        lo, hi = mid - half, mid + half
+
+        bid_cum = np.cumsum(bid_qty)
+        ask_cum = np.cumsum(ask_qty)
+        max_cum = max(bid_cum[-1], ask_cum[-1], 1e-12)
+
+        def x(p):
+            return self.PAD + (p - lo) / (hi - lo) * (w - 2 * self.PAD)
+
+        def y(q):
+            return bottom - q / max_cum * (bottom - top)
+
+        self._place_side(self._bid_area, self._bid_line, x(bid_px), y(bid_cum), x(lo), bottom)
+        self._place_side(self._ask_area, self._ask_line, x(ask_px), y(ask_cum), x(hi), bottom)
+
+        mx = x(mid)
+        self.coords(self._mid, mx, top, mx, bottom)
+        self.coords(self._lo, self.PAD, h)
+        self.coords(self._hi, w - self.PAD, h)
+        self.itemconfigure(self._lo, text=f"{lo:,.2f}")
+        self.itemconfigure(self._hi, text=f"{hi:,.2f}")
+        self.itemconfigure(self._depth, text=f"max depth {max_cum:,.4f}")
+
+    def _place_side(self, area: int, line: int, xs: np.ndarray, ys: np.ndarray, edge_x: float, base_y: float):
+        """Step outline from the best level outwards, closed down to the baseline."""
+        n = xs.size
+        # step points: (x0,y0) (x1,y0) (x1,y1) (x2,y1) ...
+        step = np.empty((2 * n, 2))
+        step[0::2, 0] = xs
+        step[1::2, 0] = np.append(xs[1:], edge_x)
+        step[0::2, 1] = ys
+        step[1::2, 1] = ys
+        line_coords = step.ravel().tolist()
+        self.coords(line, *line_coords)
+        self.coords(area, xs[0], base_y, *line_coords, edge_x, base_y)
@@ -0,0 +1,170 @@
+import tkinter as tk
+from itertools import accumulate
+from tkinter import ttk
+from typing import List, Optional, Sequence, Tuple
+
+BG = "#ffffff"
+TEXT_MAIN = "#111827"
+TEXT_SUB = "#6b7280"
+BID_TEXT = "#16a34a"
+ASK_TEXT = "#dc2626"
+BID_BAR = "#dcfce7"
+ASK_BAR = "#fee2e2"
+
+Level = Tuple[str, str]  # (price, qty) as the raw strings Binance sends
+
+
+class _LadderRow:
+    """Pre-created Canvas items for one visible level."""
+
+    def __init__(self, bar: int, price: int, qty: int):
+        self.bar = bar
+        self.price = price
+        self.qty = qty
+        self.level: Optional[Level] = None
+        self.bar_px = -1
+
+
+class DepthLadder(tk.Frame):
+    """
+    One side of the order book drawn on a Canvas.
+    - text and bar items are created once per visible row and reused
+    - a row is only reconfigured when its (price, qty) strings changed
+    - bars show cumulative size; coords move only when the pixel width changes
+    - virtual scrolling: any number of levels, only the visible window is drawn
+    """
+
+    ROW_H = 18
+    HEADER_H = 20
+
+    def __init__(self, parent, side: str = "bid", price_fmt: str = "{:,.2f}", qty_fmt: str = "{:,.6f}"):
+        super().__init__(parent, bg=BG)
+        self.side = side
+        self.price_fmt = price_fmt
+        self.qty_fmt = qty_fmt
+        self.text_color = BID_TEXT if side == "bid" else ASK_TEXT
+        self.bar_color = BID_BAR if side == "bid" else ASK_BAR
+
+        self._levels: List[Level] = []
+        self._cum: List[float] = []
+        self._top = 0
+        self._rows: List[_LadderRow] = []
+        self._width = 1
+
+        self.canvas = tk.Canvas(self, bg=BG, highlightthickness=0, bd=0, height=self.HEADER_H + self.ROW_H * 10)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scroll = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self._h_price = self.canvas.create_text(4, self.HEADER_H // 2, text="Price", anchor="w",
+                                                fill=TEXT_SUB, font=("Arial", 9, "bold"))
+        self._h_qty = self.canvas.create_text(0, self.HEADER_H // 2, text="Qty", anchor="e",
+                                              fill=TEXT_SUB, font=("Arial", 9, "bold"))
+
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<MouseWheel>", lambda e: self._set_top(self._top + (-1 if e.delta > 0 else 1)))
+        self.canvas.bind("<Button-4>", lambda e: self._set_top(self._top - 3))
+        self.canvas.bind("<Button-5>", lambda e: self._set_top(self._top + 3))
+
+    # ---------- layout ----------
+    def _on_resize(self, event):
+        self._width = max(1, event.width)
+        self.canvas.coords(self._h_qty, self._width - 4, self.HEADER_H // 2)
+
+        needed = max(0, (event.height - self.HEADER_H) // self.ROW_H)
+        while len(self._rows) < needed:
+            self._rows.append(self._create_row(len(self._rows)))
+        # extra rows (window got smaller) are simply left blank by _render
+
+        for i, row in enumerate(self._rows):
+            y = self.HEADER_H + i * self.ROW_H + self.ROW_H // 2
+            self.canvas.coords(row.price, 4, y)
+            self.canvas.coords(row.qty, self._width - 4, y)
+            row.bar_px = -1  # force bar coords on next render
+        self._render(force=True)
+
+    def _create_row(self, i: int) -> _LadderRow:
+        y = self.HEADER_H + i * self.ROW_H
+        bar = self.canvas.create_rectangle(0, y + 1, 0, y + self.ROW_H - 1, width=0, fill=self.bar_color)
+        price = self.canvas.create_text(4, y + self.ROW_H // 2, text="", anchor="w",
+                                        fill=self.text_color, font=("Consolas", 10))
+        qty = self.canvas.create_text(self._width - 4, y + self.ROW_H // 2, text="", anchor="e",
+                                      fill=TEXT_MAIN, font=("Consolas", 10))
+        return _LadderRow(bar, price, qty)
+
+    def _visible_count(self) -> int:
+        h = self.canvas.winfo_height()
+        return max(1, min(len(self._rows), (h - self.HEADER_H) // self.ROW_H))
+
+    # ---------- scrolling ----------
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self._set_top(int(float(args[1]) * len(self._levels)))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self._visible_count()
+            self._set_top(self._top + step)
+
+    def _set_top(self, top: int):
+        top = max(0, min(top, max(0, len(self._levels) - self._visible_count())))
+        if top != self._top:
+            self._top = top
+            self._render(force=True)
+
+    # ---------- data ----------
+    def set_levels(self, levels: Sequence[Sequence[str]]):
+        """Replace the side with new [price, qty] levels (best first)."""
+        self._levels = [(p, q) for p, q, *_ in levels]
+        self._cum = list(accumulate(float(q) for _, q in self._levels))
+        self._render()
+
+    def clear(self):
+        self._levels = []
+        self._cum = []
+        self._top = 0
+        self._render(force=True)
+
+    def _render(self, force: bool = False):
+        n = len(self._levels)
+        visible = self._visible_count()
+        self._top = max(0, min(self._top, max(0, n - visible)))
+
+        # scale bars to the deepest level in view so the ladder keeps contrast
+        last = min(n, self._top + visible)
+        max_cum = self._cum[last - 1] if last else 0.0
+        bar_w = self._width
+
+        for i, row in enumerate(self._rows):
+            idx = self._top + i
+            if i >= visible or idx >= n:
+                if row.level is not None or force:
+                    self.canvas.itemconfigure(row.price, text="")
+                    self.canvas.itemconfigure(row.qty, text="")
+                    row.level = None
+                if row.bar_px != 0:
+                    self.canvas.coords(row.bar, 0, 0, 0, 0)
+                    row.bar_px = 0
+                continue
+
+            level = self._levels[idx]
+            if level != row.level:
+                if row.level is None or level[0] != row.level[0]:
+                    self.canvas.itemconfigure(row.price, text=self.price_fmt.format(float(level[0])))
+                if row.level is None or level[1] != row.level[1]:
+                    self.canvas.itemconfigure(row.qty, text=self.qty_fmt.format(float(level[1])))
+                row.level = level
+
+            px = int(bar_w * self._cum[idx] / max_cum) if max_cum > 0 else 0
+            if px != row.bar_px:
+                y = self.HEADER_H + i * self.ROW_H
+                if self.side == "bid":
+                    self.canvas.coords(row.bar, bar_w - px, y + 1, bar_w, y + self.ROW_H - 1)
+                else:
+                    self.canvas.coords(row.bar, 0, y + 1, px, y + self.ROW_H - 1)
+                row.bar_px = px
+
+        if n:
+            self.scroll.set(self._top / n, min(1.0, (self._top + visible) / n))
+        else:
+            self.scroll.set(0.0, 1.0)
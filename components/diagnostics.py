@@ -0,0 +1,110 @@
+import time
+import tkinter as tk
+from tkinter import ttk
+from typing import Optional
+
+from utils.loop_monitor import TkLoopMonitor
+
+
+class DiagnosticsPanel(ttk.Frame):
+    """
+    Diagnostics view for TkLoopMonitor.
+    - loop lag summary (last / p50 / p95 / max)
+    - table of slow callbacks (newest first)
+    - sampled stack of the selected callback
+    """
+
+    def __init__(self, parent, monitor: TkLoopMonitor, refresh_ms: int = 1000):
+        super().__init__(parent, padding=12)
+        self.monitor = monitor
+        self.refresh_ms = refresh_ms
+
+        self._job: Optional[str] = None
+        self._active = False
+        self._shown = 0  # monitor.slow_total already in the table
+
+        self._build_ui()
+
+    def _build_ui(self):
+        top = ttk.Frame(self)
+        top.pack(fill=tk.X)
+
+        ttk.Label(top, text="Event Loop", font=("Arial", 12, "bold")).pack(side=tk.LEFT)
+        self.lag_label = ttk.Label(top, text="Lag: --", font=("Arial", 10))
+        self.lag_label.pack(side=tk.RIGHT)
+
+        self.tree = ttk.Treeview(
+            self,
+            columns=("time", "callback", "ms"),
+            show="headings",
+            height=10,
+        )
+        self.tree.heading("time", text="Time")
+        self.tree.heading("callback", text="Callback")
+        self.tree.heading("ms", text="ms")
+        self.tree.column("time", width=80, anchor="w")
+        self.tree.column("callback", width=300, anchor="w")
+        self.tree.column("ms", width=70, anchor="e")
+        self.tree.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+
+        self.stack = tk.Text(self, height=10, width=80)
+        self.stack.pack(fill=tk.BOTH, expand=True, pady=(8, 0))
+        self.stack.config(state="disabled")
+
+    def start(self):
+        if self._active:
+            return
+        self._active = True
+        self._refresh()
+
+    def stop(self):
+        self._active = False
+        if self._job:
+            try:
+                self.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def _refresh(self):
+        if not self._active:
+            return
+        stats = self.monitor.lag_stats()
+        self.lag_label.config(
+            text=f"Lag: {stats['last']:.0f} ms | p50 {stats['p50']:.0f} | p95 {stats['p95']:.0f} | max {stats['max']:.0f}"
+        )
+
+        # only append records we have not shown yet
+        records = list(self.monitor.slow)
+        new_count = min(self.monitor.slow_total - self._shown, len(records))
+        for rec in records[len(records) - new_count:]:
+            self.tree.insert(
+                "",
+                0,
+                values=(time.strftime("%H:%M:%S", time.localtime(rec.when)), rec.label, f"{rec.duration_ms:.1f}"),
+                tags=("stack",) if rec.stack else (),
+            )
+        self._shown = self.monitor.slow_total
+
+        # keep table bounded like the monitor history
+        children = self.tree.get_children()
+        if len(children) > len(records):
+            self.tree.delete(*children[len(records):])
+
+        self._job = self.after(self.refresh_ms, self._refresh)
+
+    def _on_select(self, _event=None):
+        sel = self.tree.selection()
+        if not sel:
+            return
+        index = self.tree.index(sel[0])
+        records = list(self.monitor.slow)
+        text = "(no stack sampled)"
+        if 0 <= index < len(records):
+            rec = records[len(records) - 1 - index]
+            text = rec.stack or text
+        self.stack.config(state="normal")
+        self.stack.delete("1.0", tk.END)
+        self.stack.insert(tk.END, text)
+        self.stack.config(state="disabled")
@@ -3,23 +3,36 @@ from tkinter import ttk
 from typing import Optional
 
 from utils.binance_api import BinanceRESTClient
+from utils.book_analytics import BookAnalytics
+from components.depth_ladder import DepthLadder
+from components.depth_chart import DepthChart
 
 
 class OrderBookPanel(ttk.Frame):
     """
     Order book panel (top bids/asks) via REST polling.
     Uses Tkinter after() timer (event-driven).
+    Levels are drawn by two Canvas DepthLadders (scrollable, diffed per level);
+    a cumulative depth chart and BookAnalytics stats are computed per update.
     """
 
-    def __init__(self, parent, client: BinanceRESTClient, symbol: str, poll_ms: int = 1500, limit: int = 10):
+    def __init__(self, parent, client: BinanceRESTClient, symbol: str, poll_ms: int = 1500, limit: int = 10,
+                 slippage_notionals=(10_000, 100_000, 1_000_000), external_feed=False, cadence=None):
         super().__init__(parent, padding=12)
         self.client = client
         self.symbol = symbol.upper()
         self.poll_ms = poll_ms
+        self.cadence = cadence  # AdaptiveCadence: poll faster when the market is busy
         self.limit = limit
+        self.analytics = BookAnalytics(notionals=slippage_notionals)
+        self.view = "ladder"
+        self.external_feed = external_feed  # snapshots pushed via apply_snapshot() (feed process)
+        self._last_levels = ([], [])  # (bids, asks) of the last snapshot
+        self._taps = []  # fn(symbol, bids, asks) for every snapshot, e.g. the recorder
 
         self._job: Optional[str] = None
         self._active = False
+        self._suspended = False
 
         self._build_ui()
 
@@ -27,12 +40,24 @@ class OrderBookPanel(ttk.Frame):
         top = ttk.Frame(self)
         top.pack(fill=tk.X)
 
-        ttk.Label(top, text="Order Book (Top 10)", font=("Arial", 12, "bold")).pack(side=tk.LEFT)
+        ttk.Label(top, text=f"Order Book (Top {self.limit})", font=("Arial", 12, "bold")).pack(side=tk.LEFT)
         self.sym_label = ttk.Label(top, text=f"Symbol: {self.symbol}", font=("Arial", 10))
         self.sym_label.pack(side=tk.RIGHT)
+        self.view_btn = ttk.Button(top, text="Depth", width=7, command=self.toggle_view)
+        self.view_btn.pack(side=tk.RIGHT, padx=(0, 8))
 
-        body = ttk.Frame(self)
-        body.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        # analytics line: spread / imbalance / microprice / slippage
+        self.stats_label = ttk.Label(self, text="Spread -- | Imb -- | Micro --", font=("Arial", 9))
+        self.stats_label.pack(anchor="w", pady=(6, 0))
+
+        self.body = ttk.Frame(self)
+        self.body.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+
+        self.depth_chart = DepthChart(self.body, height=180)
+
+        body = ttk.Frame(self.body)
+        body.pack(fill=tk.BOTH, expand=True)
+        self.ladder_view = body
 
         # Two tables: bids and asks
         bids_frame = ttk.Frame(body)
@@ -43,30 +68,62 @@ class OrderBookPanel(ttk.Frame):
         ttk.Label(bids_frame, text="BIDS", font=("Arial", 11, "bold")).pack(anchor="w")
         ttk.Label(asks_frame, text="ASKS", font=("Arial", 11, "bold")).pack(anchor="w")
 
-        self.bids = tk.Text(bids_frame, height=18, width=45)
-        self.asks = tk.Text(asks_frame, height=18, width=45)
+        self.bids = DepthLadder(bids_frame, side="bid")
+        self.asks = DepthLadder(asks_frame, side="ask")
         self.bids.pack(fill=tk.BOTH, expand=True, pady=(6, 0))
         self.asks.pack(fill=tk.BOTH, expand=True, pady=(6, 0))
 
         self.status = ttk.Label(self, text="Status: Idle", font=("Arial", 9))
         self.status.pack(anchor="w", pady=(8, 0))
 
-        # Make text read-only style
-        self.bids.config(state="disabled")
-        self.asks.config(state="disabled")
-
     def set_symbol(self, symbol: str):
         self.symbol = symbol.upper()
         self.sym_label.config(text=f"Symbol: {self.symbol}")
+        self.bids.clear()
+        self.asks.clear()
+        self._last_levels = ([], [])
+
+    def add_tap(self, fn):
+        """fn(symbol, bids, asks) for every snapshot (also while suspended)."""
+        self._taps.append(fn)
+
+    @property
+    def last_levels(self):
+        """(bids, asks) of the last snapshot shown."""
+        return self._last_levels
+
+    def toggle_view(self):
+        """Switch between the level ladder and the cumulative depth chart."""
+        if self.view == "ladder":
+            self.ladder_view.pack_forget()
+            self.depth_chart.pack(fill=tk.BOTH, expand=True)
+            self.view = "depth"
+            self.view_btn.config(text="Ladder")
+            a = self.analytics
+            self.depth_chart.update_book(a.bid_px, a.bid_qty, a.ask_px, a.ask_qty)
+        else:
+            self.depth_chart.pack_forget()
+            self.ladder_view.pack(fill=tk.BOTH, expand=True)
+            self.view = "ladder"
+            self.view_btn.config(text="Depth")
+            self.bids.set_levels(self._last_levels[0])
+            self.asks.set_levels(self._last_levels[1])
 
     def start(self):
         if self._active:
             return
         self._active = True
+        if self.cadence:
+            self.cadence.enabled = True
+        if self.external_feed:
+            self.status.config(text="Status: Live")
+            return
         self._schedule()
 
     def stop(self):
         self._active = False
+        if self.cadence:
+            self.cadence.enabled = False
         if self._job:
             try:
                 self.after_cancel(self._job)
@@ -74,12 +131,37 @@ class OrderBookPanel(ttk.Frame):
                 pass
             self._job = None
 
-    def _schedule(self):
+    def suspend(self):
+        """Low-power: no polling and no drawing until resume()."""
+        self._suspended = True
+        if self._job:
+            try:
+                self.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def resume(self):
+        """Redraw once from the latest state, then continue polling."""
+        if not self._suspended:
+            return
+        self._suspended = False
         if not self._active:
             return
-        self._job = self.after(self.poll_ms, self._tick)
-        # do first update immediately
+        if self.external_feed:
+            if self._last_levels[0]:
+                self.apply_snapshot(*self._last_levels)
+        else:
+            self._schedule()
+
+    def _schedule(self):
+        if not self._active or self._suspended:
+            return
+        # update now, then re-arm the timer for the next poll
         self._tick()
+        if self._active:
+            delay = self.cadence.next_ms() if self.cadence else self.poll_ms
+            self._job = self.after(delay, self._schedule)
 
     def _tick(self):
         if not self._active:
@@ -87,21 +169,52 @@ class OrderBookPanel(ttk.Frame):
         try:
             self.status.config(text="Status: Updating...")
             ob = self.client.get_orderbook(self.symbol, limit=self.limit)
-            bids = ob.get("bids", [])[: self.limit]
-            asks = ob.get("asks", [])[: self.limit]
-
-            bids_text = "Price\t\tQty\n" + "\n".join([f"{float(p):,.2f}\t{float(q):,.6f}" for p, q in bids])
-            asks_text = "Price\t\tQty\n" + "\n".join([f"{float(p):,.2f}\t{float(q):,.6f}" for p, q in asks])
-
-            self._set_text(self.bids, bids_text)
-            self._set_text(self.asks, asks_text)
-            self.status.config(text="Status: OK")
+            self.apply_snapshot(ob.get("bids", []), ob.get("asks", []))
+            if self.cadence:
+                mid = self.analytics.stats.mid
+                if mid == mid:
+                    self.cadence.activity.observe_price(mid)
+                self.status.config(text=f"Status: OK (every {self.cadence.last_ms / 1000:.1f}s)")
+            else:
+                self.status.config(text="Status: OK")
         except Exception as e:
             self.status.config(text="Status: Error (REST)")
 
+    def apply_snapshot(self, bids, asks, notify=True):
+        """
+        Show a book snapshot ([price, qty] pairs as strings or numbers, best first).
+        notify=False (replay) skips the taps.
+        """
+        if self.external_feed and not self._active:
+            return
+        bids = bids[: self.limit]
+        asks = asks[: self.limit]
+        self._last_levels = (bids, asks)
+        if notify:
+            for fn in self._taps:
+                fn(self.symbol, bids, asks)
+        if self._suspended:
+            return
+
+        stats = self.analytics.update(bids, asks)
+        self.stats_label.config(text=self._format_stats(stats))
+
+        if self.view == "ladder":
+            self.bids.set_levels(bids)
+            self.asks.set_levels(asks)
+        else:
+            a = self.analytics
+            self.depth_chart.update_book(a.bid_px, a.bid_qty, a.ask_px, a.ask_qty)
+
     @staticmethod
-    def _set_text(widget: tk.Text, text: str):
-        widget.config(state="normal")
-        widget.delete("1.0", tk.END)
-        widget.insert(tk.END, text)
-        widget.config(state="disabled")
+    def _format_stats(stats) -> str:
+        parts = [
+            f"Spread {stats.spread_bps:.2f} bps",
+            f"Imb {stats.imbalance_top:+.2f}",
+            f"Micro {stats.microprice:,.2f}",
+        ]
+        for notional, (buy, sell) in stats.slippage.items():
+            buy_s = f"{buy:.1f}" if buy == buy else "n/a"
+            sell_s = f"{sell:.1f}" if sell == sell else "n/a"
+            parts.append(f"${notional / 1000:,.0f}k {buy_s}/{sell_s}")
+        return " | ".join(parts)
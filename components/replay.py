@@ -0,0 +1,130 @@
+import tkinter as tk
+from datetime import datetime, timezone
+from pathlib import Path
+from tkinter import ttk
+from typing import Callable, List, Optional
+
+from utils.replay import SPEEDS, ReplayEngine
+
+
+def _fmt(time_ms: float) -> str:
+    return datetime.fromtimestamp(time_ms / 1000, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+
+class ReplayPanel(ttk.Frame):
+    """
+    Controls for replay mode.
+    - pick a recorded day and Load it (on_load(day) -> ReplayEngine, None on failure)
+    - play/pause, speed, and a scrubber that seeks on release
+    - the engine's clock is shown through set_time() (use it as on_time)
+    """
+
+    def __init__(self, parent, days: List[str], on_load: Callable[[str], Optional[ReplayEngine]],
+                 on_exit: Optional[Callable[[], None]] = None):
+        super().__init__(parent, padding=12)
+        self.on_load = on_load
+        self.on_exit = on_exit
+        self.engine: Optional[ReplayEngine] = None
+        self._dragging = False
+
+        self._build_ui(days)
+
+    def _build_ui(self, days: List[str]):
+        top = ttk.Frame(self)
+        top.pack(fill=tk.X)
+
+        ttk.Label(top, text="Replay", font=("Arial", 12, "bold")).pack(side=tk.LEFT)
+        self.status_label = ttk.Label(top, text="No recordings" if not days else "Pick a day", font=("Arial", 10))
+        self.status_label.pack(side=tk.RIGHT)
+
+        row = ttk.Frame(self)
+        row.pack(fill=tk.X, pady=(10, 0))
+        self.day_var = tk.StringVar(value=days[-1] if days else "")
+        ttk.Combobox(row, textvariable=self.day_var, values=days, width=10, state="readonly").pack(side=tk.LEFT)
+        ttk.Button(row, text="Load", command=self._load).pack(side=tk.LEFT, padx=(6, 0))
+
+        self.play_btn = ttk.Button(row, text="Play", command=self.toggle, state="disabled")
+        self.play_btn.pack(side=tk.LEFT, padx=(18, 0))
+        ttk.Label(row, text="Speed").pack(side=tk.LEFT, padx=(12, 4))
+        self.speed_var = tk.StringVar(value=f"{SPEEDS[0]}x")
+        speed = ttk.Combobox(row, textvariable=self.speed_var, values=[f"{s}x" for s in SPEEDS], width=5, state="readonly")
+        speed.pack(side=tk.LEFT)
+        speed.bind("<<ComboboxSelected>>", lambda _e: self._apply_speed())
+
+        if self.on_exit:
+            ttk.Button(row, text="Exit Replay", command=self.on_exit).pack(side=tk.RIGHT)
+
+        self.scale = ttk.Scale(self, from_=0, to=1, orient=tk.HORIZONTAL, state="disabled")
+        self.scale.pack(fill=tk.X, pady=(10, 0))
+        self.scale.bind("<ButtonPress-1>", self._on_press)
+        self.scale.bind("<ButtonRelease-1>", self._on_release)
+
+        self.time_label = ttk.Label(self, text="--", font=("Arial", 10))
+        self.time_label.pack(anchor="w", pady=(6, 0))
+
+    def _load(self):
+        day = self.day_var.get()
+        if not day:
+            return
+        if self.engine is not None:
+            self.engine.pause()
+        self.engine = self.on_load(day)
+        if self.engine is None:
+            self.status_label.config(text=f"Could not load {day}")
+            self.play_btn.config(state="disabled")
+            return
+        data = self.engine.data
+        self.scale.config(from_=data.start_ms, to=data.end_ms, state="normal")
+        self.play_btn.config(state="normal", text="Play")
+        self._apply_speed()
+        self.engine.seek(data.start_ms)
+        self._show_status()
+
+    def toggle(self):
+        if self.engine is None:
+            return
+        if self.engine.playing:
+            self.engine.pause()
+            self.play_btn.config(text="Play")
+        else:
+            self.engine.play()
+            self.play_btn.config(text="Pause")
+
+    def _apply_speed(self):
+        if self.engine is not None:
+            self.engine.set_speed(float(self.speed_var.get().rstrip("x")))
+
+    def _on_press(self, _event):
+        self._dragging = True
+
+    def _on_release(self, _event):
+        self._dragging = False
+        if self.engine is not None:
+            self.engine.seek(int(self.scale.get()))
+
+    def set_time(self, time_ms: int):
+        """Engine clock callback (Tk thread)."""
+        self.time_label.config(text=_fmt(time_ms))
+        self._show_status()
+        if not self._dragging:
+            self.scale.set(time_ms)
+        if self.engine is not None and not self.engine.playing:
+            self.play_btn.config(text="Play")
+
+    def _show_status(self):
+        """Symbol and day, or how many chunks could not be read (hours are read lazily)."""
+        data = self.engine.data if self.engine is not None else None
+        if data is None:
+            return
+        if data.errors:
+            path, err = next(reversed(data.errors.items()))
+            text = f"{len(data.errors)} unreadable chunk(s), last {Path(path).name}: {err}"
+        else:
+            text = f"{data.symbol} {data.day}"
+        if self.status_label.cget("text") != text:
+            self.status_label.config(text=text)
+
+    def close(self):
+        if self.engine is not None:
+            self.engine.pause()
+            self.engine = None
@@ -0,0 +1,162 @@
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, List, Optional
+
+from utils.screener import Screener
+
+COLUMNS = (
+    ("symbol", "Symbol", 90, "w"),
+    ("last", "Last", 100, "e"),
+    ("change", "Chg %", 70, "e"),
+    ("ema_fast", "EMA fast", 100, "e"),
+    ("ema_slow", "EMA slow", 100, "e"),
+    ("rsi", "RSI", 60, "e"),
+    ("signal", "Signal", 160, "w"),
+)
+
+
+class ScreenerPanel(ttk.Frame):
+    """
+    Sortable table of Screener results.
+    - refreshes shortly after every bar close of the screener interval
+    - fetching + evaluation run on a worker thread; the table is filled on the Tk thread
+    - click a header to sort, double-click a row to show that symbol
+    """
+
+    CLOSE_DELAY_MS = 2000  # let the exchange publish the closed bar
+
+    def __init__(self, parent, screener: Screener, on_select: Optional[Callable[[str], None]] = None):
+        super().__init__(parent, padding=12)
+        self.screener = screener
+        self.on_select = on_select
+
+        self._rows: List[dict] = []
+        self._sort_key = "change"
+        self._sort_desc = True
+        self._job: Optional[str] = None
+        self._active = False
+        self._busy = False
+        self._suspended = False
+
+        self._build_ui()
+
+    def _build_ui(self):
+        top = ttk.Frame(self)
+        top.pack(fill=tk.X)
+
+        ttk.Label(top, text="Screener", font=("Arial", 12, "bold")).pack(side=tk.LEFT)
+        self.status_label = ttk.Label(top, text="Loading...", font=("Arial", 10))
+        self.status_label.pack(side=tk.RIGHT)
+
+        self.tree = ttk.Treeview(self, columns=[c[0] for c in COLUMNS], show="headings", height=18)
+        for key, title, width, anchor in COLUMNS:
+            self.tree.heading(key, text=title, command=lambda k=key: self.set_sort(k))
+            self.tree.column(key, width=width, anchor=anchor)
+        self.tree.tag_configure("up", foreground="#16a34a")
+        self.tree.tag_configure("down", foreground="#dc2626")
+        self.tree.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        self.tree.bind("<Double-1>", self._on_double_click)
+
+    def start(self):
+        if self._active:
+            return
+        self._active = True
+        self._refresh()
+
+    def stop(self):
+        self._active = False
+        if self._job:
+            try:
+                self.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def suspend(self):
+        """Low-power: no refreshes and no worker processes until resume()."""
+        if self._suspended or not self._active:
+            return
+        self._suspended = True
+        self.stop()
+        self.screener.stop()  # the pool is re-created by the next parallel refresh
+
+    def resume(self):
+        """Refresh now (catching up the missed bars) and re-arm the bar-close timer."""
+        if not self._suspended:
+            return
+        self._suspended = False
+        self.start()
+
+    def set_sort(self, key: str):
+        if key == self._sort_key:
+            self._sort_desc = not self._sort_desc
+        else:
+            self._sort_key = key
+            self._sort_desc = key != "symbol"
+        self._render()
+
+    def _refresh(self):
+        if not self._active:
+            return
+        if not self._busy:
+            self._busy = True
+            threading.Thread(target=self._worker, daemon=True).start()
+        self._job = self.after(self.screener.ms_until_next_close() + self.CLOSE_DELAY_MS, self._refresh)
+
+    def _worker(self):
+        try:
+            rows = self.screener.refresh()
+            error = None
+        except Exception as e:
+            rows, error = None, str(e)
+        try:
+            self.after(0, self._on_result, rows, error)
+        except Exception:
+            pass  # window closed meanwhile
+
+    def _on_result(self, rows, error):
+        self._busy = False
+        if not self._active:
+            return
+        if error:
+            self.status_label.config(text=f"Error: {error}")
+            return
+        self._rows = rows
+        self.status_label.config(
+            text=f"{len(rows)} symbols | {self.screener.interval} | {time.strftime('%H:%M:%S')}"
+        )
+        self._render()
+
+    def _render(self):
+        key = self._sort_key
+        rows = sorted(self._rows, key=lambda r: r[key], reverse=self._sort_desc)
+
+        for key_, title, _, _ in COLUMNS:
+            mark = (" ▼" if self._sort_desc else " ▲") if key_ == self._sort_key else ""
+            self.tree.heading(key_, text=title + mark)
+
+        self.tree.delete(*self.tree.get_children())
+        for r in rows:
+            tag = "up" if r["code"] > 0 else "down" if r["code"] < 0 else ""
+            self.tree.insert(
+                "",
+                tk.END,
+                iid=r["symbol"],
+                values=(
+                    r["symbol"],
+                    f"{r['last']:,.4f}",
+                    f"{r['change']:+.2f}",
+                    f"{r['ema_fast']:,.4f}",
+                    f"{r['ema_slow']:,.4f}",
+                    f"{r['rsi']:.1f}",
+                    r["signal"],
+                ),
+                tags=(tag,) if tag else (),
+            )
+
+    def _on_double_click(self, _event=None):
+        sel = self.tree.selection()
+        if sel and self.on_select:
+            self.on_select(sel[0])
@@ -4,6 +4,9 @@ import tkinter as tk
 from tkinter import ttk
 import websocket
 
+from utils import metrics
+from utils.feed_process import combined_url
+
 # ----- THEME -----
 CARD_BG = "#111827"
 TEXT_MAIN = "#e5e7eb"
@@ -13,7 +16,8 @@ RED = "#ef4444"
 
 
 class CryptoTickerPanel(tk.Frame):
-    def __init__(self, parent, symbol, display_name, ws_base):
+    def __init__(self, parent, symbol, display_name, ws_base, external_feed=False, book_ticker=False, render_ms=100,
+                 aio=None):
         super().__init__(parent, bg=CARD_BG, padx=16, pady=14)
 
         self.symbol = symbol.lower()
@@ -21,6 +25,24 @@ class CryptoTickerPanel(tk.Frame):
         self.ws_base = ws_base
         self.ws = None
         self.active = False
+        self.stream = f"{self.symbol}@ticker"
+        self._connects = 0
+        self._listeners = []  # fn(symbol, price), called on the WebSocket thread
+        self.external_feed = external_feed  # prices pushed via push_ticker() (feed process)
+        self.aio = aio  # AsyncBinanceClient: stream over its shared hub connection instead of a socket thread
+        self._sub = None  # HubSubscription on aio.hub
+        self._live = False  # first aio message seen (status shown as Live)
+
+        # optional @bookTicker on the same connection: the card shows the live
+        # mid and spread; messages only store the latest values and a render
+        # timer draws them at most every `render_ms`
+        self.book_ticker = book_ticker and not external_feed
+        self.render_ms = render_ms
+        self._ticker = None  # (last, change, percent) from @ticker
+        self._book = None    # (bid, ask) from @bookTicker
+        self._dirty = False
+        self._render_job = None
+        self._suspended = False
 
         self.configure(highlightbackground="#1f2937", highlightthickness=1)
 
@@ -45,6 +67,14 @@ class CryptoTickerPanel(tk.Frame):
         )
         self.change_label.pack(anchor="w")
 
+        self.book_label = tk.Label(
+            self, text="",
+            fg=TEXT_SUB, bg=CARD_BG,
+            font=("Arial", 9)
+        )
+        if self.book_ticker:
+            self.book_label.pack(anchor="w", pady=(2, 0))
+
         self.status = tk.Label(
             self, text="Disconnected",
             fg=TEXT_SUB, bg=CARD_BG,
@@ -52,13 +82,40 @@ class CryptoTickerPanel(tk.Frame):
         )
         self.status.pack(anchor="e", pady=(8, 0))
 
+    @property
+    def last_ticker(self):
+        """(price, change, percent) of the last ticker message, or None."""
+        return self._ticker
+
+    def restore(self, price, change, percent):
+        """Paint saved values until the feed delivers (warm restart)."""
+        if self._ticker is None:
+            self._ticker = (price, change, percent)
+            self.update_ui(price, change, percent)
+
+    def add_listener(self, fn):
+        """fn(symbol, price) for every ticker message; must be cheap (feed thread)."""
+        self._listeners.append(fn)
+
     # ----- WebSocket -----
     def start(self):
         if self.active:
             return
         self.active = True
+        if self.external_feed:
+            self.status.config(text="Live")
+            return
+
+        if self.book_ticker:
+            self._render_job = self.after(self.render_ms, self._render_tick)
+        if self.aio is not None:
+            self._subscribe()
+            return
 
-        url = f"{self.ws_base}/{self.symbol}@ticker"
+        if self.book_ticker:
+            url = combined_url(self.ws_base, [self.stream, f"{self.symbol}@bookTicker"])
+        else:
+            url = f"{self.ws_base}/{self.stream}"
         self.ws = websocket.WebSocketApp(
             url,
             on_open=self.on_open,
@@ -69,26 +126,163 @@ class CryptoTickerPanel(tk.Frame):
 
     def stop(self):
         self.active = False
+        if self._render_job:
+            try:
+                self.after_cancel(self._render_job)
+            except Exception:
+                pass
+            self._render_job = None
+        if self.external_feed or self._sub is not None:
+            self.status.config(text="Disconnected")
+        if self._sub is not None:
+            self._sub.cancel()
+            self._sub = None
         if self.ws:
             self.ws.close()
 
+    def _subscribe(self):
+        """(Re)open the stream on the shared loop with the streams the card needs now."""
+        if self._sub is not None:
+            self._sub.cancel()
+        self._live = False
+        streams = [self.stream]
+        if self.book_ticker and not self._suspended:
+            streams.append(f"{self.symbol}@bookTicker")
+        self._sub = self.aio.hub.subscribe(streams, self._on_aio)
+
+    def _on_aio(self, stream, data):
+        """subscribe() callback (event loop thread); the stream already counted the message."""
+        if not self.active:
+            return
+        if not self._live:
+            self._live = True
+            self.after(0, lambda: self.status.config(text="Live"))
+        if self.book_ticker:
+            self._on_stream(stream, data)
+        else:
+            self._on_ticker(data)
+
     def on_open(self, ws):
+        self._connects += 1
+        metrics.registry.inc("dashboard_ws_connects_total", stream=self.stream)
+        if self._connects > 1:
+            metrics.registry.inc("dashboard_ws_reconnects_total", stream=self.stream)
+        metrics.registry.set("dashboard_ws_connected", 1, stream=self.stream)
         self.after(0, lambda: self.status.config(text="Live"))
 
     def on_close(self, ws, *_):
+        metrics.registry.set("dashboard_ws_connected", 0, stream=self.stream)
         if self.winfo_exists():
             self.after(0, lambda: self.status.config(text="Disconnected"))
 
     def on_message(self, ws, message):
         if not self.active:
             return
-        data = json.loads(message)
+        if self.book_ticker:
+            self._on_combined(json.loads(message))
+            return
+        metrics.registry.inc("dashboard_ws_messages_total", stream=self.stream)
+        self._on_ticker(json.loads(message))
 
+    def _on_ticker(self, data):
         price = float(data["c"])
         change = float(data["p"])
         percent = float(data["P"])
 
-        self.after(0, self.update_ui, price, change, percent)
+        for fn in self._listeners:
+            fn(data["s"], price)
+
+        self._ticker = (price, change, percent)
+        if not self._suspended:
+            self.after(0, self.update_ui, price, change, percent)
+
+    def suspend(self):
+        """Low-power: drop @bookTicker, keep @ticker (alerts), stop drawing."""
+        if self._suspended:
+            return
+        self._suspended = True
+        if self._render_job:
+            try:
+                self.after_cancel(self._render_job)
+            except Exception:
+                pass
+            self._render_job = None
+        if self.book_ticker:
+            if self.aio is not None:
+                self._subscribe()
+            else:
+                self._send("UNSUBSCRIBE", f"{self.symbol}@bookTicker")
+            self._book = None
+            self.book_label.config(text="--")
+
+    def resume(self):
+        """Restore the live feed and redraw once from the latest values."""
+        if not self._suspended:
+            return
+        self._suspended = False
+        if not self.active:
+            return
+        if self.book_ticker:
+            if self.aio is not None:
+                self._subscribe()
+            else:
+                self._send("SUBSCRIBE", f"{self.symbol}@bookTicker")
+            self._dirty = True
+            self._render_tick()
+        elif self._ticker is not None:
+            self.update_ui(*self._ticker)
+
+    def _send(self, method, stream):
+        try:
+            self.ws.send(json.dumps({"method": method, "params": [stream], "id": 1}))
+        except Exception:
+            pass  # not connected yet: the URL already has the stream
+
+    def _on_combined(self, msg):
+        """Combined-stream message: only keep the latest values (rendered by _render_tick)."""
+        stream, data = msg.get("stream", ""), msg.get("data")
+        if data is None:
+            return
+        metrics.registry.inc("dashboard_ws_messages_total", stream=stream)
+        self._on_stream(stream, data)
+
+    def _on_stream(self, stream, data):
+        if stream.endswith("@bookTicker"):
+            self._book = (float(data["b"]), float(data["a"]))
+        else:
+            price = float(data["c"])
+            self._ticker = (price, float(data["p"]), float(data["P"]))
+            for fn in self._listeners:
+                fn(data["s"], price)
+        self._dirty = True
+
+    def _render_tick(self):
+        if not self.active or self._suspended:
+            return
+        if self._dirty and self._ticker is not None:
+            self._dirty = False
+            last, change, percent = self._ticker
+            book = self._book
+            if book is None:
+                self.update_ui(last, change, percent)
+            else:
+                # 24h change re-based on the live mid (open = last - change)
+                bid, ask = book
+                mid = (bid + ask) / 2.0
+                open_ = last - change
+                self.update_ui(mid, mid - open_, (mid / open_ - 1.0) * 100.0 if open_ else percent)
+                self.book_label.config(text=f"Bid {bid:,.2f} | Ask {ask:,.2f} | Spread {(ask - bid) / mid * 1e4:.2f} bps")
+        self._render_job = self.after(self.render_ms, self._render_tick)
+
+    def push_ticker(self, price, change, percent):
+        """Ticker from an external feed (Tk thread)."""
+        if not self.active:
+            return
+        for fn in self._listeners:
+            fn(self.symbol, price)
+        self._ticker = (price, change, percent)
+        if not self._suspended:
+            self.update_ui(price, change, percent)
 
     def update_ui(self, price, change, percent):
         color = GREEN if change >= 0 else RED
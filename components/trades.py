@@ -1,5 +1,7 @@
 import json
+import queue
 import threading
+import time
 from collections import deque
 from datetime import datetime
 import tkinter as tk
@@ -10,6 +12,13 @@ try:
 except Exception:
     websocket = None
 
+from utils import metrics
+from utils.trade_buckets import RateMeter, TradeConflator
+
+# feed modes: every print, aggregated trades, or aggTrades conflated into
+# fixed time buckets; "auto" picks one per symbol from the measured rate
+MODES = ("trade", "aggTrade", "conflate")
+
 
 class RecentTradesPanel(tk.Frame):
     """
@@ -17,19 +26,47 @@ class RecentTradesPanel(tk.Frame):
     Layout + Style ให้เหมือน UI mockup
     """
 
+    RATE_CHECK_MS = 5000
+
     def __init__(self, parent, symbol="BTCUSDT",
                  ws_base="wss://stream.binance.com:9443/ws",
-                 max_rows=10):
+                 max_rows=10, external_feed=False, client=None,
+                 mode="trade", bucket_ms=100, auto_rates=(5.0, 50.0)):
         super().__init__(parent, bg="#ffffff")
 
         self.symbol = symbol.upper()
         self.ws_base = ws_base
         self.max_rows = max_rows
+        self.client = client  # BinanceRESTClient for the tape backfill on symbol switch
 
         self._ws = None
         self._thread = None
         self._running = False
+        self._connected = False
+        self._request_id = 0
+        # rows: (time_ms, trade_id, time_str, side, price_str), newest first;
+        # trade_id is the raw trade id (@trade, REST) or None (aggTrade, buckets, feed process)
         self._rows = deque(maxlen=max_rows)
+        self._live_count = 0  # rows received live since the last switch
+        self._backfill_queue = queue.Queue()
+        self._backfill_thread = None
+        self._connects = 0
+        self._listeners = []  # fn(symbol, price), called on the WebSocket thread
+        self._taps = []       # fn(symbol, time_ms, price, qty, is_sell), e.g. the recorder
+        self._counted = []    # fn(symbol, price, n): n = trades the message stands for (aggTrade f..l)
+        self.external_feed = external_feed  # trades pushed via push_trades() (feed process)
+
+        # feed mode (auto: aggTrade until the rate has been measured)
+        self.auto = mode == "auto"
+        self.auto_rates = auto_rates  # trades/s: above [0] aggTrade, above [1] conflate
+        self.mode = "aggTrade" if self.auto else mode
+        self._symbol_modes = {}  # symbol -> mode picked by auto
+        self._conflator = TradeConflator(bucket_ms)
+        self._conflator_lock = threading.Lock()  # add() on the socket thread, flush() on the Tk thread
+        self._flush_job = None
+        self._rate = RateMeter()
+        self._rate_job = None
+        self._suspended = None  # (auto, mode) to restore after low-power mode
 
         # =====================
         # Header
@@ -45,13 +82,14 @@ class RecentTradesPanel(tk.Frame):
             font=("Arial", 13, "bold")
         ).pack(side=tk.LEFT)
 
-        tk.Label(
+        self.sym_label = tk.Label(
             header,
             text=f"Symbol: {self.symbol}",
             bg="#ffffff",
             fg="#6b7280",
             font=("Arial", 10)
-        ).pack(side=tk.RIGHT)
+        )
+        self.sym_label.pack(side=tk.RIGHT)
 
         # =====================
         # Table
@@ -102,43 +140,94 @@ class RecentTradesPanel(tk.Frame):
         if websocket is None:
             self.status.config(text="Status: websocket-client not installed")
 
+    def add_listener(self, fn, counted=False):
+        """
+        fn(symbol, price) for every trade message; must be cheap (feed thread).
+        counted=True: fn(symbol, price, n) with the number of trades the
+        message covers, which is more than one for aggTrades.
+        """
+        (self._counted if counted else self._listeners).append(fn)
+
+    def add_tap(self, fn):
+        """fn(symbol, time_ms, price, qty, is_sell) for every raw trade; must be cheap (feed thread)."""
+        self._taps.append(fn)
+
     # =====================
     # WebSocket
     # =====================
+    @property
+    def stream(self):
+        kind = "trade" if self.mode == "trade" else "aggTrade"
+        return f"{self.symbol.lower()}@{kind}"
+
     def start(self):
-        if websocket is None or self._running:
+        if self._running or (websocket is None and not self.external_feed):
             return
 
         self._running = True
         self.status.config(text="Status: Live")
+        if self.external_feed:
+            return
+        self._rate.reset()
+        self._rate_job = self.after(self.RATE_CHECK_MS, self._check_rate)
+        self._flush_job = self.after(self._conflator.bucket_ms, self._flush_bucket)
 
-        stream = f"{self.symbol.lower()}@trade"
-        url = f"{self.ws_base}/{stream}"
+        def on_open(ws):
+            self._connected = True
+            self._connects += 1
+            metrics.registry.inc("dashboard_ws_connects_total", stream=self.stream)
+            if self._connects > 1:
+                metrics.registry.inc("dashboard_ws_reconnects_total", stream=self.stream)
+            metrics.registry.set("dashboard_ws_connected", 1, stream=self.stream)
+
+        def on_close(ws, *_):
+            self._connected = False
+            metrics.registry.set("dashboard_ws_connected", 0, stream=self.stream)
 
         def on_message(ws, message):
             try:
                 data = json.loads(message)
+                # SUBSCRIBE acks and late trades of the previous symbol
+                if data.get("s") != self.symbol:
+                    return
+                metrics.registry.inc("dashboard_ws_messages_total", stream=self.stream)
+                # trades/s in every mode (an aggTrade covers trades f..l), so the
+                # auto thresholds compare the same quantity before and after a switch
+                n = data["l"] - data["f"] + 1 if "f" in data else 1
+                self._rate.tick(n)
 
                 price = float(data["p"])
-                trade_time = datetime.fromtimestamp(
-                    data["T"] / 1000
-                ).strftime("%H:%M:%S")
-
-                side = "SELL" if data["m"] else "BUY"
+                for fn in self._listeners:
+                    fn(data["s"], price)
+                for fn in self._counted:
+                    fn(data["s"], price, n)
+                for fn in self._taps:
+                    fn(data["s"], data["T"], price, float(data["q"]), data["m"])
 
-                self._rows.appendleft(
-                    (trade_time, side, f"{price:,.2f}")
-                )
+                if self.mode == "conflate":
+                    # one row (and one render) per closed bucket
+                    with self._conflator_lock:
+                        bucket = self._conflator.add(data["T"], price, float(data["q"]), data["m"])
+                    if bucket is None:
+                        return
+                    self._rows.appendleft(self._bucket_row(bucket))
+                else:
+                    self._rows.appendleft(self._row(data["T"], price, data["m"], data.get("t")))
+                self._live_count += 1
 
-                self.after(0, self._render)
+                if self._suspended is None:
+                    self.after(0, self._render)
 
             except Exception:
                 pass
 
         def run():
+            # the URL is built at connect time, so it follows set_symbol()
             self._ws = websocket.WebSocketApp(
-                url,
-                on_message=on_message
+                f"{self.ws_base}/{self.stream}",
+                on_open=on_open,
+                on_message=on_message,
+                on_close=on_close
             )
             self._ws.run_forever(ping_interval=20)
 
@@ -147,6 +236,14 @@ class RecentTradesPanel(tk.Frame):
 
     def stop(self):
         self._running = False
+        self._connected = False
+        for job in (self._rate_job, self._flush_job):
+            if job:
+                try:
+                    self.after_cancel(job)
+                except Exception:
+                    pass
+        self._rate_job = self._flush_job = None
         try:
             if self._ws:
                 self._ws.close()
@@ -154,16 +251,224 @@ class RecentTradesPanel(tk.Frame):
             pass
         self.status.config(text="Status: Idle")
 
+    def set_symbol(self, symbol, rows=()):
+        """
+        Switch the tape to another symbol on the live connection
+        (UNSUBSCRIBE old / SUBSCRIBE new, no new socket or thread).
+        `rows` (e.g. from SymbolCache) are shown until the REST backfill lands.
+        """
+        symbol = symbol.upper()
+        if symbol == self.symbol:
+            return
+        old = self.stream
+        if self.auto:
+            self._symbol_modes[self.symbol] = self.mode
+            self.mode = self._symbol_modes.get(symbol, "aggTrade")
+        self.symbol = symbol
+        self.sym_label.config(text=f"Symbol: {self.symbol}")
+        self._conflator.reset()
+        self._rate.reset()
+
+        self._rows.clear()
+        self._rows.extend(list(rows)[: self._rows.maxlen])
+        self._live_count = 0
+        self._render()
+
+        self._resubscribe(old)
+        self._request_backfill(symbol)
+
+    def suspend(self):
+        """Low-power: conflated feed, rows still collected, no rendering."""
+        if self._suspended is not None:
+            return
+        self._suspended = (self.auto, self.mode)
+        self.auto = False
+        self._switch_mode("conflate")
+
+    def resume(self):
+        """Restore the feed mode and redraw once from the collected rows."""
+        if self._suspended is None:
+            return
+        self.auto, mode = self._suspended
+        self._suspended = None
+        self._switch_mode(mode)
+        self._render()
+
+    def set_mode(self, mode):
+        """Switch feed mode on the live connection ("auto" re-enables automatic choice)."""
+        self.auto = mode == "auto"
+        if self.auto:
+            return
+        if mode not in MODES:
+            raise ValueError(f"unknown trades mode: {mode}")
+        self._switch_mode(mode)
+
+    def _switch_mode(self, mode):
+        if mode == self.mode:
+            return
+        old = self.stream
+        self.mode = mode
+        self._conflator.reset()
+        self._resubscribe(old)
+
+    def _resubscribe(self, old):
+        """Swap `old` for the current stream on the open socket (no reconnect)."""
+        new = self.stream
+        if old == new or not self._connected or self._ws is None or self.external_feed:
+            return
+        try:
+            self._request_id += 2
+            self._ws.send(json.dumps({"method": "UNSUBSCRIBE", "params": [old], "id": self._request_id - 1}))
+            self._ws.send(json.dumps({"method": "SUBSCRIBE", "params": [new], "id": self._request_id}))
+            metrics.registry.set("dashboard_ws_connected", 0, stream=old)
+            metrics.registry.set("dashboard_ws_connected", 1, stream=new)
+        except Exception:
+            pass
+
+    def _flush_bucket(self):
+        """Show the open conflation bucket once its time is over, even if no trade follows."""
+        if not self._running:
+            return
+        if self.mode == "conflate":
+            # one bucket of grace for clock skew against the exchange timestamps
+            now_ms = int(time.time() * 1000) - self._conflator.bucket_ms
+            with self._conflator_lock:
+                bucket = self._conflator.flush(now_ms)
+            if bucket is not None:
+                self._rows.appendleft(self._bucket_row(bucket))
+                self._live_count += 1
+                if self._suspended is None:
+                    self._render()
+        delay = 1000 if self._suspended is not None else self._conflator.bucket_ms
+        self._flush_job = self.after(delay, self._flush_bucket)
+
+    def _check_rate(self):
+        """Measure the trade rate and, in auto mode, pick the feed mode (with hysteresis)."""
+        if not self._running:
+            return
+        rate = self._rate.sample(time.monotonic())
+        if self.auto:
+            low, high = self.auto_rates
+            mode = self.mode
+            if mode == "trade" and rate > low:
+                mode = "aggTrade"
+            elif mode == "aggTrade" and rate > high:
+                mode = "conflate"
+            elif mode == "aggTrade" and rate < low / 2:
+                mode = "trade"
+            elif mode == "conflate" and rate < high / 2:
+                mode = "aggTrade"
+            self._switch_mode(mode)
+            self._symbol_modes[self.symbol] = mode
+        self.status.config(text=f"Status: Live ({self.mode}, {rate:.0f} trades/s)")
+        self._rate_job = self.after(self.RATE_CHECK_MS, self._check_rate)
+
+    def snapshot_rows(self):
+        """Current tape rows (newest first), e.g. to park in SymbolCache."""
+        return list(self._rows)
+
+    def clear_rows(self):
+        """Empty the tape (e.g. before a replay seek)."""
+        self._rows.clear()
+        self._live_count = 0
+        self._conflator.reset()
+        self._render()
+
+    def restore_rows(self, rows):
+        """Show saved rows while the tape is still empty (replaced by the REST backfill)."""
+        if self._rows:
+            return
+        self._rows.extend(list(rows)[: self._rows.maxlen])
+        self._render()
+
+    # =====================
+    # Backfill
+    # =====================
+    def _request_backfill(self, symbol):
+        if self.client is None:
+            return
+        self._backfill_queue.put(symbol)
+        if self._backfill_thread is None:
+            self._backfill_thread = threading.Thread(target=self._backfill_worker, daemon=True)
+            self._backfill_thread.start()
+
+    def _backfill_worker(self):
+        """One long-lived worker; bursts of switches only fetch the latest symbol."""
+        while True:
+            symbol = self._backfill_queue.get()
+            while not self._backfill_queue.empty():
+                symbol = self._backfill_queue.get_nowait()
+            try:
+                trades = self.client.get_trades(symbol, limit=self.max_rows)
+            except Exception:
+                continue
+            rows = [self._row(t["time"], float(t["price"]), t["isBuyerMaker"], t["id"]) for t in reversed(trades)]
+            try:
+                self.after(0, self._apply_backfill, symbol, rows)
+            except Exception:
+                return  # widget destroyed
+
+    def _apply_backfill(self, symbol, rows):
+        """Keep trades that arrived live since the switch; fill older slots from REST."""
+        if symbol != self.symbol:
+            return
+        live = list(self._rows)[: self._live_count]
+        if live:
+            cutoff = live[-1][0]
+            if all(r[1] is not None for r in live):
+                ids = {r[1] for r in live}
+                rows = [r for r in rows if r[0] <= cutoff and r[1] not in ids]
+            else:
+                # aggregate / bucket rows cannot be matched to REST trade ids:
+                # only take trades strictly older than the oldest live row
+                rows = [r for r in rows if r[0] < cutoff]
+        self._rows.clear()
+        self._rows.extend((live + rows)[: self._rows.maxlen])
+        self._render()
+
+    @staticmethod
+    def _row(time_ms, price, is_sell, trade_id=None):
+        trade_time = datetime.fromtimestamp(time_ms / 1000).strftime("%H:%M:%S")
+        side = "SELL" if is_sell else "BUY"
+        return (time_ms, trade_id, trade_time, side, f"{price:,.2f}")
+
+    @staticmethod
+    def _bucket_row(b):
+        """Conflated bucket: dominant side with trade count, close price."""
+        trade_time = datetime.fromtimestamp(b.start_ms / 1000).strftime("%H:%M:%S")
+        side = f"{b.side} ×{b.count}" if b.count > 1 else b.side
+        return (b.start_ms, None, trade_time, side, f"{b.close:,.2f}")
+
+    def push_trades(self, trades, notify=True):
+        """
+        Trades from an external feed (Tk thread): (time_ms, price, is_sell, qty)
+        oldest first; one render. notify=False (replay) skips listeners and taps.
+        """
+        if not self._running:
+            return
+        for time_ms, price, is_sell, qty in trades:
+            if notify:
+                for fn in self._listeners:
+                    fn(self.symbol, price)
+                for fn in self._counted:
+                    fn(self.symbol, price, 1)
+                for fn in self._taps:
+                    fn(self.symbol, time_ms, price, qty, is_sell)
+            self._rows.appendleft(self._row(time_ms, price, is_sell))
+            self._live_count += 1
+        if self._suspended is None:
+            self._render()
+
     # =====================
     # Render Table
     # =====================
     def _render(self):
         self.tree.delete(*self.tree.get_children())
 
-        for time_, side, price in list(self._rows):
+        for _, _, time_, side, price in list(self._rows):
             self.tree.insert(
                 "",
                 "end",
                 values=(time_, side, price),
-                tags=(side,)
+                tags=(side.split()[0],)
             )
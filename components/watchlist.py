@@ -0,0 +1,430 @@
+import json
+import threading
+import time
+import tkinter as tk
+from bisect import bisect_left
+from tkinter import ttk
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import websocket  # websocket-client
+except Exception:
+    websocket = None
+
+from utils import metrics
+
+BG = "#ffffff"
+ROW_ALT = "#f9fafb"
+TEXT_MAIN = "#111827"
+TEXT_SUB = "#6b7280"
+GREEN = "#16a34a"
+RED = "#dc2626"
+FLASH_UP = "#059669"    # text colour of a cell that just ticked up
+FLASH_DOWN = "#e11d48"  # ... or down
+
+
+class _Row:
+    """Canvas items for one visible row (reused while scrolling)."""
+
+    def __init__(self, bg: int, cells: List[int]):
+        self.bg = bg
+        self.cells = cells
+        self.symbol: Optional[str] = None
+        self.texts: List[str] = [""] * len(cells)
+        self.colors: List[str] = [""] * len(cells)  # current text colour per cell
+
+
+class WatchlistPanel(tk.Frame):
+    """
+    Market watchlist fed by the single !miniTicker@arr stream.
+    - only the rows scrolled into view exist on the Canvas (fixed row pool)
+    - sort by symbol / last / change / volume; updated symbols are re-sorted
+      incrementally with bisect instead of sorting the whole list
+    - only cells whose text changed are reconfigured, and their text flashes
+      briefly in the direction of the move (the row background never changes)
+    """
+
+    ROW_H = 22
+    HEADER_H = 24
+    # key, title, relative x, anchor
+    COLUMNS = (
+        ("symbol", "Symbol", 0.02, "w"),
+        ("last", "Last", 0.55, "e"),
+        ("change", "24h %", 0.77, "e"),
+        ("volume", "Vol (quote)", 0.98, "e"),
+    )
+
+    def __init__(
+        self,
+        parent,
+        ws_base: str,
+        quote: str = "USDT",
+        pinned: Iterable[str] = (),
+        render_ms: int = 250,
+        flash_ms: int = 600,
+        on_select: Optional[Callable[[str], None]] = None,
+        aio=None,
+    ):
+        super().__init__(parent, bg=BG)
+        self.ws_base = ws_base
+        self.quote = quote.upper()
+        self.pinned = {s.upper() for s in pinned}
+        self.render_ms = render_ms
+        self.flash_ms = flash_ms
+        self.on_select = on_select
+        self.stream = "!miniTicker@arr"
+        self.aio = aio  # AsyncBinanceClient: stream over its shared hub connection instead of a socket thread
+
+        self._ws = None
+        self._sub = None  # HubSubscription on aio.hub
+        self._running = False
+        self._job: Optional[str] = None
+        self._suspended = False
+
+        # symbol -> (last, change %, quote volume)
+        self._data: Dict[str, Tuple[float, float, float]] = {}
+        self._pending: Dict[str, Tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+
+        # sorted view: parallel lists of sort keys and symbols
+        self.sort_by = "change"
+        self.descending = True
+        self._keys: List[tuple] = []
+        self._order: List[str] = []
+
+        self._top = 0  # first visible row index
+        self._rows: List[_Row] = []
+        self._flash: Dict[Tuple[str, int], Tuple[float, str]] = {}  # (symbol, column) -> (expiry, colour)
+        self._dirty = True
+
+        self._build_ui()
+
+    # =====================
+    # UI
+    # =====================
+    def _build_ui(self):
+        header = tk.Frame(self, bg=BG)
+        header.pack(fill=tk.X, pady=(0, 6))
+
+        tk.Label(header, text="Watchlist", bg=BG, fg=TEXT_MAIN, font=("Arial", 13, "bold")).pack(side=tk.LEFT)
+        self.count_label = tk.Label(header, text="0 symbols", bg=BG, fg=TEXT_SUB, font=("Arial", 10))
+        self.count_label.pack(side=tk.RIGHT)
+
+        body = tk.Frame(self, bg=BG)
+        body.pack(fill=tk.BOTH, expand=True)
+
+        self.canvas = tk.Canvas(body, bg=BG, highlightthickness=0, bd=0)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scroll = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self._header_items = []
+        for i, (key, title, _, anchor) in enumerate(self.COLUMNS):
+            item = self.canvas.create_text(0, self.HEADER_H // 2, text=title, anchor=anchor,
+                                           fill=TEXT_SUB, font=("Arial", 10, "bold"), tags=("header",))
+            self.canvas.tag_bind(item, "<Button-1>", lambda e, k=key: self.set_sort(k))
+            self._header_items.append(item)
+
+        self.status = tk.Label(self, text="Status: Idle", bg=BG, fg=TEXT_SUB, font=("Arial", 9))
+        self.status.pack(anchor="w", pady=(4, 0))
+
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", lambda e: self._scroll_rows(-1 if e.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda e: self._scroll_rows(-3))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll_rows(3))
+
+        if websocket is None and self.aio is None:
+            self.status.config(text="Status: websocket-client not installed")
+
+    def _on_resize(self, event):
+        w = event.width
+        for item, (_, _, rx, _) in zip(self._header_items, self.COLUMNS):
+            self.canvas.coords(item, int(w * rx), self.HEADER_H // 2)
+
+        # grow the row pool to cover the visible height; never shrink
+        needed = max(0, (event.height - self.HEADER_H) // self.ROW_H + 1)
+        while len(self._rows) < needed:
+            self._rows.append(self._create_row(len(self._rows)))
+
+        for i, row in enumerate(self._rows):
+            y = self.HEADER_H + i * self.ROW_H
+            self.canvas.coords(row.bg, 0, y, w, y + self.ROW_H)
+            for cell, (_, _, rx, _) in zip(row.cells, self.COLUMNS):
+                self.canvas.coords(cell, int(w * rx), y + self.ROW_H // 2)
+        self._dirty = True
+        self._render()
+
+    def _create_row(self, i: int) -> _Row:
+        y = self.HEADER_H + i * self.ROW_H
+        fill = BG if i % 2 == 0 else ROW_ALT
+        bg = self.canvas.create_rectangle(0, y, 0, y + self.ROW_H, width=0, fill=fill)
+        cells = [
+            self.canvas.create_text(0, y + self.ROW_H // 2, text="", anchor=anchor, fill=TEXT_MAIN, font=("Arial", 10))
+            for _, _, _, anchor in self.COLUMNS
+        ]
+        return _Row(bg, cells)
+
+    def _visible_count(self) -> int:
+        h = self.canvas.winfo_height()
+        return max(1, min(len(self._rows), (h - self.HEADER_H) // self.ROW_H))
+
+    # =====================
+    # scrolling / selection
+    # =====================
+    def _scroll_rows(self, delta: int):
+        self._set_top(self._top + delta)
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self._set_top(int(float(args[1]) * len(self._order)))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self._visible_count()
+            self._set_top(self._top + step)
+
+    def _set_top(self, top: int):
+        top = max(0, min(top, max(0, len(self._order) - self._visible_count())))
+        if top != self._top:
+            self._top = top
+            self._dirty = True
+            self._render()
+
+    def _on_click(self, event):
+        if event.y < self.HEADER_H:
+            return
+        idx = self._top + (event.y - self.HEADER_H) // self.ROW_H
+        if 0 <= idx < len(self._order) and self.on_select:
+            self.on_select(self._order[idx])
+
+    # =====================
+    # sorting
+    # =====================
+    def _key(self, symbol: str, values: Tuple[float, float, float]) -> tuple:
+        if self.sort_by == "symbol":
+            if not self.descending:
+                return (symbol,)
+            # reversed string order; the trailing 0 puts "ABC" before its prefix "AB"
+            return (tuple(-ord(c) for c in symbol) + (0,),)
+        idx = {"last": 0, "change": 1, "volume": 2}[self.sort_by]
+        v = values[idx]
+        return (-v if self.descending else v, symbol)
+
+    def set_sort(self, column: str):
+        """Sort by column; clicking the same column again flips the order."""
+        if column == self.sort_by:
+            self.descending = not self.descending
+        else:
+            self.sort_by = column
+            self.descending = column != "symbol"
+
+        pairs = sorted((self._key(s, v), s) for s, v in self._data.items())
+        self._keys = [k for k, _ in pairs]
+        self._order = [s for _, s in pairs]
+        self._dirty = True
+        self._render()
+
+    def _resort(self, symbol: str, old: Optional[Tuple[float, float, float]], new: Tuple[float, float, float]):
+        """Move one symbol to its new sorted position (O(log n) search)."""
+        new_key = self._key(symbol, new)
+        if old is not None:
+            old_key = self._key(symbol, old)
+            if old_key == new_key:
+                return
+            i = bisect_left(self._keys, old_key)
+            if i < len(self._keys) and self._order[i] == symbol:
+                del self._keys[i]
+                del self._order[i]
+        i = bisect_left(self._keys, new_key)
+        self._keys.insert(i, new_key)
+        self._order.insert(i, symbol)
+
+    # =====================
+    # WebSocket
+    # =====================
+    def start(self):
+        if (websocket is None and self.aio is None) or self._running:
+            return
+        self._running = True
+        self.status.config(text="Status: Connecting...")
+
+        if self.aio is not None:
+            live = []
+
+            def on_data(stream, data):
+                if not self._running:
+                    return
+                if not live:
+                    live.append(True)
+                    self.after(0, lambda: self.status.config(text="Status: Live"))
+                try:
+                    self.apply_tickers(data)
+                except Exception:
+                    pass
+
+            self._sub = self.aio.hub.subscribe([self.stream], on_data)
+            self._schedule()
+            return
+
+        def on_open(ws):
+            metrics.registry.set("dashboard_ws_connected", 1, stream=self.stream)
+            metrics.registry.inc("dashboard_ws_connects_total", stream=self.stream)
+            self.after(0, lambda: self.status.config(text="Status: Live"))
+
+        def on_close(ws, *_):
+            metrics.registry.set("dashboard_ws_connected", 0, stream=self.stream)
+
+        def on_message(ws, message):
+            if not self._running:
+                return
+            metrics.registry.inc("dashboard_ws_messages_total", stream=self.stream)
+            try:
+                self.apply_tickers(json.loads(message))
+            except Exception:
+                pass
+
+        def run():
+            self._ws = websocket.WebSocketApp(
+                f"{self.ws_base}/{self.stream}",
+                on_open=on_open,
+                on_message=on_message,
+                on_close=on_close,
+            )
+            self._ws.run_forever(ping_interval=20)
+
+        threading.Thread(target=run, daemon=True).start()
+        self._schedule()
+
+    def stop(self):
+        self._running = False
+        if self._job:
+            try:
+                self.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+        if self._sub is not None:
+            self._sub.cancel()
+            self._sub = None
+        try:
+            if self._ws:
+                self._ws.close()
+        except Exception:
+            pass
+        self.status.config(text="Status: Idle")
+
+    def suspend(self):
+        """Low-power: keep collecting (the feed is already conflated), stop rendering."""
+        self._suspended = True
+        if self._job:
+            try:
+                self.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def resume(self):
+        if not self._suspended:
+            return
+        self._suspended = False
+        self._dirty = True
+        self._schedule()
+
+    def apply_tickers(self, tickers: List[dict]):
+        """Store decoded miniTicker objects (any thread); rendering is batched."""
+        updates = {}
+        for t in tickers:
+            sym = t["s"]
+            if self.quote and not sym.endswith(self.quote):
+                continue
+            last = float(t["c"])
+            open_ = float(t["o"])
+            pct = (last - open_) / open_ * 100.0 if open_ else 0.0
+            updates[sym] = (last, pct, float(t["q"]))
+        with self._lock:
+            self._pending.update(updates)
+
+    # =====================
+    # Render (batched on a fixed cadence)
+    # =====================
+    def _schedule(self):
+        if not self._running or self._suspended:
+            return
+        self._render()
+        self._job = self.after(self.render_ms, self._schedule)
+
+    def _apply_pending(self) -> Dict[str, Tuple[float, float, float]]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        changed = {}
+        for sym, values in pending.items():
+            old = self._data.get(sym)
+            if old == values:
+                continue
+            self._data[sym] = values
+            self._resort(sym, old, values)
+            changed[sym] = old
+        return changed
+
+    def _cell_texts(self, sym: str, values: Optional[Tuple[float, float, float]] = None) -> List[str]:
+        last, pct, qvol = values if values is not None else self._data[sym]
+        star = "★ " if sym in self.pinned else ""
+        sign = "+" if pct >= 0 else ""
+        return [f"{star}{sym}", f"{last:,.6g}", f"{sign}{pct:.2f}%", f"{qvol:,.0f}"]
+
+    def _render(self):
+        changed = self._apply_pending()
+        if not changed and not self._dirty and not self._flash:
+            return
+        self._dirty = False
+
+        now = time.monotonic()
+        n = len(self._order)
+        visible = self._visible_count()
+        self._top = max(0, min(self._top, max(0, n - visible)))
+
+        # new flashes: only the cells whose text changed, coloured by the last-price move
+        expiry = now + self.flash_ms / 1000.0
+        for sym, old in changed.items():
+            if old is not None:
+                colour = FLASH_UP if self._data[sym][0] >= old[0] else FLASH_DOWN
+                new_texts = self._cell_texts(sym)
+                for c, text in enumerate(self._cell_texts(sym, old)):
+                    if text != new_texts[c]:
+                        self._flash[(sym, c)] = (expiry, colour)
+
+        for i, row in enumerate(self._rows):
+            idx = self._top + i
+            if i >= visible or idx >= n:
+                if row.symbol is not None:
+                    for c, cell in enumerate(row.cells):
+                        self.canvas.itemconfigure(cell, text="")
+                        row.texts[c] = ""
+                    row.symbol = None
+                continue
+
+            sym = self._order[idx]
+            row.symbol = sym
+            pct = self._data[sym][1]
+            for c, (cell, text) in enumerate(zip(row.cells, self._cell_texts(sym))):
+                flash = self._flash.get((sym, c))
+                if flash and flash[0] > now:
+                    colour = flash[1]
+                else:
+                    colour = (GREEN if pct >= 0 else RED) if c == 2 else TEXT_MAIN
+                if text == row.texts[c] and colour == row.colors[c]:
+                    continue
+                row.texts[c] = text
+                row.colors[c] = colour
+                self.canvas.itemconfigure(cell, text=text, fill=colour)
+
+        # expire flashes (including symbols that are not in view)
+        for key in [k for k, (exp, _) in self._flash.items() if exp <= now]:
+            del self._flash[key]
+
+        if n:
+            self.scroll.set(self._top / n, min(1.0, (self._top + visible) / n))
+        else:
+            self.scroll.set(0.0, 1.0)
+        self.count_label.config(text=f"{n} symbols")
@@ -14,6 +14,12 @@ EXTRA_ASSETS = [
     ("XRPUSDT", "XRP/USDT"),
 ]
 
+# Ticker cards / asset toggles shown by default (the dashboard's original set)
+DASHBOARD_ASSETS = DEFAULT_ASSETS + [
+    ("BNBUSDT", "BNB/USDT"),
+    ("LTCUSDT", "LTC/USDT"),
+]
+
 REST_BASE = "https://api.binance.com"
 WS_BASE = "wss://stream.binance.com:9443/ws"
 
@@ -22,8 +28,108 @@ ORDERBOOK_POLL_MS = 1500
 TRADES_POLL_MS = 1500
 CHART_POLL_MS = 10_000
 
+# Adaptive cadence: chart / order book intervals scale with market activity
+# between base*min and base*max, inside the REST weight budget
+ADAPTIVE_CADENCE = True
+CADENCE_SCALE = (0.25, 4.0)
+
+# Low-power mode while the window is minimized/hidden, or unfocused with no
+# input for POWER_IDLE_MS (0 = only when hidden): no rendering, no REST
+# polling, conflated feeds; one redraw from the latest state on restore
+POWER_SAVE = True
+POWER_IDLE_MS = 300_000
+
 # Chart settings
 KLINE_INTERVAL = "1m"
-KLINE_LIMIT = 60  # last 60 minutes
+KLINE_LIMIT = 60  # last 60 bars of the selected timeframe
+KLINE_HISTORY_MINUTES = 15_000  # 1m bars kept for resampling (enough for 60 x 4h)
+
+# Chart indicators ("ema:50", "sma:20", "bb:20:2", "macd:12:26:9", "rsi:14", "atr:14", "vwap")
+CHART_OVERLAYS = ()
+CHART_READOUTS = ("rsi:14", "macd:12:26:9", "atr:14")
+
+# Chart export (Save PNG / Export Pack / python -m utils.chart_export);
+# packs cover every configured asset x EXPORT_INTERVALS, 0 workers = one per CPU
+EXPORT_DPI = 200
+EXPORT_INTERVALS = ("15m", "1h", "4h", "1d")
+EXPORT_WORKERS = 0
+
+# Feed process: one process owns the sockets and decoding, the UI reads
+# shared memory (book comes from the 20-level partial depth stream)
+FEED_PROCESS = False
+FEED_RENDER_MS = 100
+
+# Warm symbol cache: state of recently viewed symbols kept fresh so a
+# switch only re-renders (prefetch = also keep every configured asset warm)
+WARM_SYMBOLS = 6
+WARM_POLL_MS = 30_000
+WARM_MAX_MB = 64
+PREFETCH_ASSETS = False
+
+# Ticker cards: also subscribe @bookTicker (same socket) for a live mid and
+# spread; card redraws are conflated to CARD_RENDER_MS
+CARD_BOOK_TICKER = False
+CARD_RENDER_MS = 100
+
+# Panel sizes
+ORDERBOOK_LIMIT = 100  # same REST weight (5) as 10 levels; the ladder scrolls
+TRADES_ROWS = 12
+
+# Trades feed: "trade", "aggTrade", "conflate" (aggTrades in fixed buckets)
+# or "auto" (per symbol from the measured trades/s: above [0] aggTrade, above [1] conflate)
+TRADES_MODE = "auto"
+TRADES_BUCKET_MS = 100
+TRADES_AUTO_RATES = (5.0, 50.0)
+
+# Order book analytics: market-order sizes (quote notional) for slippage
+SLIPPAGE_NOTIONALS = (10_000, 100_000, 1_000_000)
+
+# Screener: symbols scanned on every bar close (empty = the configured assets)
+SCREENER_SYMBOLS = ()
+SCREENER_INTERVAL = "1m"
+SCREENER_BARS = 200
+SCREENER_WORKERS = 0  # >1: process pool for large universes
+SCREENER_POOL_MIN_SYMBOLS = 500
+
+# Resource budget (Binance allows 6000 weight/min per IP; keep headroom
+# for other tools on the same desk machine)
+REST_WEIGHT_BUDGET = 1200
+MAX_SOCKETS = 16
 
 PREF_FILE = "preferences.json"
+PREFS_DEBOUNCE_MS = 1000
+
+# Market-data recorder: trades, top of book and closed 1m klines of the
+# symbol on screen, written under RECORD_DIR/SYMBOL/YYYYMMDD-HH/
+# ("auto" = Parquet if pyarrow is installed, else .npy chunks)
+RECORD = False
+RECORD_DIR = "recordings"
+RECORD_FORMAT = "auto"
+RECORD_FLUSH_S = 5.0
+RECORD_MAX_PENDING = 200_000  # rows buffered per kind before new ones are dropped
+
+# Replay of recorded days (header "Replay" button)
+REPLAY_TICK_MS = 100       # playback step
+REPLAY_CACHED_HOURS = 4    # recorded hours kept in memory while scrubbing
+
+# Runtime snapshot (candles, book, tape, tickers of the cached symbols) for
+# a warm restart; written every RUNTIME_SNAPSHOT_MS and on exit
+RUNTIME_SNAPSHOT_FILE = "runtime_snapshot.npz"
+RUNTIME_SNAPSHOT_MS = 60_000
+RUNTIME_SNAPSHOT_BARS = 5000         # 1m bars kept per symbol
+RUNTIME_SNAPSHOT_MAX_AGE_S = 43_200  # older ones are ignored (catch-up polls fetch at most 1000 bars)
+
+# Price alerts (JSON list of {"symbol", "price", "direction", "once", "note"})
+ALERTS_FILE = "alerts.json"
+ALERTS_LOG_FILE = "alerts.log"
+ALERTS_DESKTOP = True
+
+# Diagnostics (Tk event-loop watchdog)
+LOOP_PROBE_MS = 100
+SLOW_CALLBACK_MS = 50
+DIAG_LOG_FILE = "diagnostics.log"
+DIAG_SAMPLE_STACKS = False
+
+# Prometheus metrics endpoint (0 = disabled)
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 0
@@ -1,13 +1,34 @@
 import json
-import os
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
 
+import config
+
 # ==== your modules (keep names same as your project) ====
+from utils import metrics
+from utils.alerts import AlertEngine, DesktopSink, LogSink
+from utils.feed_process import FeedBridge, FeedProcess
 from utils.binance_api import BinanceRESTClient
+from utils.chart_export import export_pack, export_png, fetch_snapshots
+from utils.loop_monitor import TkLoopMonitor
+from utils.persistence import PersistenceService, encode_snapshot, load_snapshot
+from utils.power import PowerManager
+from utils.recorder import Recorder
+from utils.replay import ReplayData, ReplayEngine, available_days
+from utils.resample import Resampler
+from utils.cadence import AdaptiveCadence, CadenceBudget, MarketActivity
+from utils.settings import (
+    WEIGHT_KLINES, ConfigError, Settings, background_weight_per_min, depth_weight, load_settings,
+)
+from utils.symbol_cache import SymbolCache, SymbolWarmer
 from components.ticker import CryptoTickerPanel
 from components.chart import CandleChartPanel
+from components.diagnostics import DiagnosticsPanel
+from components.replay import ReplayPanel
+from components.screener import ScreenerPanel
+from utils.screener import Screener
 
 try:
     from components.orderbook import OrderBookPanel
@@ -19,9 +40,15 @@ try:
 except Exception:
     RecentTradesPanel = None
 
+try:
+    from components.watchlist import WatchlistPanel
+except Exception:
+    WatchlistPanel = None
 
-WS_BASE = "wss://stream.binance.com:9443/ws"
-PREF_PATH = Path(__file__).with_name("preferences.json")
+
+PREF_PATH = Path(__file__).with_name(config.PREF_FILE)
+SETTINGS_PATH = Path(__file__).with_name("dashboard.json")
+RUNTIME_PATH = Path(__file__).with_name(config.RUNTIME_SNAPSHOT_FILE)
 
 
 # =========================
@@ -119,17 +146,27 @@ class RoundedCard(tk.Frame):
     Real rounded corners using Canvas.
     - Does NOT destroy inner widgets on redraw
     - Supports fixed height (prevents layout jitter)
+    - <Configure> storms are coalesced: cards whose size really changed are
+      redrawn together in one idle callback, by moving one polygon (coords)
     """
+
     def __init__(self, parent, theme: dict, radius=18, padding=16, height=None):
         super().__init__(parent, bg=theme["APP_BG"])
         self.theme = theme
         self.radius = int(radius)
         self.padding = int(padding)
         self.fixed_height = height  # can be None
+        self._size = (0, 0)  # size of the last redraw
 
         self.canvas = tk.Canvas(self, highlightthickness=0, bd=0, bg=theme["APP_BG"])
         self.canvas.pack(fill=tk.BOTH, expand=True)
 
+        # card background: one smoothed polygon, reshaped in place
+        self._bg = self.canvas.create_polygon(
+            0, 0, 0, 0, smooth=True,
+            fill=theme["CARD_BG"], outline=theme["BORDER"], width=1, tags="bg"
+        )
+
         # inner container
         self.inner = tk.Frame(self.canvas, bg=theme["CARD_INNER"])
         self._win = self.canvas.create_window(0, 0, window=self.inner, anchor="nw")
@@ -139,18 +176,40 @@ class RoundedCard(tk.Frame):
             self.pack_propagate(False)
             self.configure(height=self.fixed_height)
 
-        self.bind("<Configure>", self._redraw)
+        self.bind("<Configure>", self._on_configure)
 
     def set_theme(self, theme: dict):
         self.theme = theme
         self.configure(bg=theme["APP_BG"])
         self.canvas.configure(bg=theme["APP_BG"])
         self.inner.configure(bg=theme["CARD_INNER"])
-        self._redraw()
+        self.canvas.itemconfigure(self._bg, fill=theme["CARD_BG"], outline=theme["BORDER"])
 
-    def _rounded_rect(self, x1, y1, x2, y2, r, **kwargs):
+    def _on_configure(self, event):
+        if (event.width, event.height) == self._size:
+            return
+        # pending cards live on the Tk root, so they go away with it (a root
+        # destroyed before the idle callback ran leaves nothing behind)
+        root = self._root()
+        pending = getattr(root, "_rounded_cards", None)
+        if pending is None:
+            pending = root._rounded_cards = set()
+            root.after_idle(RoundedCard._flush, root)
+        pending.add(self)
+
+    @staticmethod
+    def _flush(root):
+        for card in root.__dict__.pop("_rounded_cards", ()):
+            try:
+                if card.winfo_exists():
+                    card._redraw()
+            except tk.TclError:
+                pass
+
+    @staticmethod
+    def _rounded_points(x1, y1, x2, y2, r):
         # points for smooth polygon
-        points = [
+        return [
             x1 + r, y1,
             x2 - r, y1,
             x2, y1,
@@ -164,27 +223,18 @@ class RoundedCard(tk.Frame):
             x1, y1 + r,
             x1, y1
         ]
-        return self.canvas.create_polygon(points, smooth=True, **kwargs)
 
     def _redraw(self, *_):
         w = self.winfo_width()
         h = self.winfo_height()
-        if w <= 2 or h <= 2:
+        if w <= 2 or h <= 2 or (w, h) == self._size:
             return
-
-        self.canvas.delete("bg")
+        self._size = (w, h)
 
         # outer rounded card
         pad = 1
         r = min(self.radius, max(6, min(w, h) // 6))
-        self._rounded_rect(
-            pad, pad, w - pad, h - pad,
-            r,
-            fill=self.theme["CARD_BG"],
-            outline=self.theme["BORDER"],
-            width=1,
-            tags="bg"
-        )
+        self.canvas.coords(self._bg, *self._rounded_points(pad, pad, w - pad, h - pad, r))
 
         # inner area placement
         ip = self.padding
@@ -196,25 +246,76 @@ class RoundedCard(tk.Frame):
 # Dashboard App
 # =========================
 class DashboardApp:
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, settings: Settings = None, client=None, feed=None):
+        """
+        `client` / `feed` replace the Binance REST client and the feed process
+        (same interfaces), e.g. with the synthetic ones of benchmarks/stress.py.
+        """
         self.root = root
+        self.settings = settings or load_settings([], default_file=SETTINGS_PATH)
         self.root.title("Cryptocurrency Dashboard")
         self.root.geometry("1280x820")
 
-        self.client = BinanceRESTClient()
+        # optional /metrics endpoint (no-op registry unless enabled)
+        self.metrics_server = None
+        if self.settings.metrics_port:
+            try:
+                self.metrics_server = metrics.enable(self.settings.metrics_host, self.settings.metrics_port)
+            except OSError:
+                self.metrics_server = None
+
+        self.client = client or BinanceRESTClient(self.settings.rest_base, ws_base=self.settings.ws_base)
+
+        # event-loop watchdog: instrument callbacks before any widget exists
+        self.monitor = TkLoopMonitor(
+            self.root,
+            probe_ms=config.LOOP_PROBE_MS,
+            slow_ms=config.SLOW_CALLBACK_MS,
+            log_path=str(Path(__file__).with_name(config.DIAG_LOG_FILE)),
+            sample_stacks=config.DIAG_SAMPLE_STACKS,
+        )
+        self._instrument_callbacks()
+        self.diag_window = None
+        self.screener_window = None
+        self.screener_panel = None
+        self._close_screener = None
+        self.replay_window = None
+        self.replay = None  # ReplayEngine while replay mode is on
+        self._replay_resampler = None
+        self._live_external = {}  # panel -> its external_feed flag before replay
+
+        # price alerts: fed by the ticker/trades threads, delivered by a worker
+        sinks = [LogSink(str(Path(__file__).with_name(config.ALERTS_LOG_FILE)))]
+        if config.ALERTS_DESKTOP:
+            sinks.append(DesktopSink())
+        self.alerts = AlertEngine(sinks)
+        alerts_path = Path(__file__).with_name(config.ALERTS_FILE)
+        if alerts_path.exists():
+            try:
+                self.alerts.load(alerts_path)
+            except Exception:
+                pass
+        self.alerts.start()
+
+        # debounced atomic writes (prefs, runtime snapshot) off the Tk thread
+        self.persist = PersistenceService(debounce_s=config.PREFS_DEBOUNCE_MS / 1000.0)
+        self.persist.start()
+        self._snapshot_job = None
 
         # state
         self.prefs = self._load_prefs()
         self.theme_name = self.prefs.get("theme", "light")
         self.theme = THEMES.get(self.theme_name, THEMES["light"])
 
-        self.visible_assets = self.prefs.get("visible_assets", {
-            "BTCUSDT": True, "ETHUSDT": True, "SOLUSDT": True, "BNBUSDT": True, "LTCUSDT": True
-        })
+        self.visible_assets = self.prefs.get("visible_assets", {})
+        for sym in self.settings.symbols:
+            self.visible_assets.setdefault(sym, True)
         self.visible_panels = self.prefs.get("visible_panels", {
             "chart": True, "orderbook": True, "trades": True
         })
-        self.current_symbol = self.prefs.get("current_symbol", "BTCUSDT")
+        self.visible_panels.setdefault("watchlist", False)
+        saved = self.prefs.get("current_symbol")
+        self.current_symbol = saved if saved in self.settings.symbols else self.settings.symbols[0]
 
         apply_style(self.root, self.theme)
         self.root.configure(bg=self.theme["APP_BG"])
@@ -224,11 +325,168 @@ class DashboardApp:
         self.ticker_panels = {}  # symbol -> CryptoTickerPanel
         self.asset_btns = {}     # symbol -> button
 
+        # adaptive poll intervals for chart / order book, sharing what is left
+        # of the REST budget after the background pollers
+        self.activity = MarketActivity()
+        self.activity.reset(self.current_symbol)
+        self.chart_cadence = self.orderbook_cadence = None
+        if self.settings.adaptive_cadence:
+            budget = CadenceBudget(
+                self.settings.rest_weight_budget - background_weight_per_min(self.settings), client=self.client
+            )
+            lo, hi = config.CADENCE_SCALE
+            self.chart_cadence = AdaptiveCadence(
+                self.activity, WEIGHT_KLINES, self.settings.chart_poll_ms, lo, hi, budget
+            )
+            if not self.settings.feed_process:
+                self.orderbook_cadence = AdaptiveCadence(
+                    self.activity, depth_weight(self.settings.orderbook_limit), self.settings.orderbook_poll_ms, lo, hi, budget
+                )
+
+        # optional feed process: sockets + decoding off the Tk process
+        self.feed = feed
+        self.feed_bridge = None
+        if self.feed is None and self.settings.feed_process:
+            self.feed = FeedProcess(
+                self.settings.ws_base, self.settings.symbols, self.current_symbol, depth=self.settings.orderbook_limit
+            )
+
         self._build_ui()
+
+        # per-symbol state kept warm so symbol switches only re-render
+        self.symbol_cache = SymbolCache(
+            max_symbols=self.settings.warm_symbols,
+            max_bytes=config.WARM_MAX_MB << 20,
+            history_minutes=config.KLINE_HISTORY_MINUTES,
+        )
+        if self.settings.prefetch_assets:
+            self.symbol_cache.set_prefetch(self.settings.symbols)
+        self._restore_runtime()
+        state = self.symbol_cache.get(self.current_symbol)
+        self.chart.set_symbol(self.current_symbol, state.resampler, state.graphs)
+        if self.orderbook and state.book[0]:
+            self.orderbook.apply_snapshot(*state.book)
+        if self.trades_panel and state.trades:
+            self.trades_panel.restore_rows(state.trades)
+        self.warmer = SymbolWarmer(
+            self.root,
+            self.client,
+            self.symbol_cache,
+            current=lambda: self.current_symbol,
+            poll_ms=self.settings.warm_poll_ms,
+            book_limit=self.settings.orderbook_limit,
+        )
+
         self._apply_visibility_from_state()
+        self.monitor.start()
+        if self.settings.warm_poll_ms > 0:
+            self.warmer.start()
+        if self.feed:
+            self._start_feed()
+        self._snapshot_job = self.root.after(config.RUNTIME_SNAPSHOT_MS, self._snapshot_tick)
+
+        # optional recorder of what the panels receive (taps only enqueue)
+        self.recorder = None
+        self.record_dir = Path(self.settings.record_dir)
+        if not self.record_dir.is_absolute():
+            self.record_dir = Path(__file__).parent / self.record_dir
+        if self.settings.record:
+            self.recorder = Recorder(
+                self.record_dir, fmt=config.RECORD_FORMAT, flush_s=config.RECORD_FLUSH_S, max_pending=config.RECORD_MAX_PENDING
+            )
+            if self.trades_panel:
+                self.trades_panel.add_tap(self.recorder.record_trade)
+            if self.orderbook:
+                self.orderbook.add_tap(self.recorder.record_book)
+            self.chart.add_tap(self.recorder.record_klines)
+            self.recorder.start()
+
+        # low-power mode while minimized / hidden / idle
+        self.power = None
+        if self.settings.power_save:
+            self.power = PowerManager(
+                self.root, self._suspend_all, self._resume_all, idle_ms=self.settings.power_idle_ms
+            )
+            self.power.start()
 
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
+    def _instrument_callbacks(self):
+        targets = [
+            (CandleChartPanel, "_tick"),
+            (CandleChartPanel, "_render"),
+            (CryptoTickerPanel, "update_ui"),
+            (RoundedCard, "_redraw"),
+        ]
+        if OrderBookPanel:
+            targets.append((OrderBookPanel, "_tick"))
+        if RecentTradesPanel:
+            targets.append((RecentTradesPanel, "_render"))
+        if WatchlistPanel:
+            targets.append((WatchlistPanel, "_render"))
+        if self.settings.feed_process:
+            targets.append((FeedBridge, "poll_once"))
+        for cls, name in targets:
+            self.monitor.instrument(cls, name)
+
+    def _start_feed(self):
+        """Route feed-process snapshots to the panels (Tk thread, fixed cadence)."""
+        # while replaying, the feed only keeps the ticker cards live
+        def on_ticker(symbol, price, change, percent):
+            panel = self.ticker_panels.get(symbol)
+            if panel is not None:
+                panel.push_ticker(price, change, percent)
+
+        def on_trades(records):
+            if self.trades_panel and self.replay is None:
+                self.trades_panel.push_trades(zip(
+                    records["time"].tolist(), records["price"].tolist(), records["sell"], records["qty"].tolist()
+                ))
+
+        def on_book(bids, asks):
+            if self.orderbook and self.replay is None:
+                self.orderbook.apply_snapshot(bids.tolist(), asks.tolist())
+
+        def on_kline(row):
+            if self.replay is None:
+                self.chart.apply_kline(row)
+
+        self.feed_bridge = FeedBridge(
+            self.root,
+            self.feed,
+            render_ms=config.FEED_RENDER_MS,
+            on_ticker=on_ticker,
+            on_trades=on_trades,
+            on_book=on_book,
+            on_kline=on_kline,
+        )
+        self.feed.start()
+        self.feed_bridge.start()
+
+    def _power_targets(self):
+        panels = list(self.ticker_panels.values())
+        panels += [self.chart, self.orderbook, self.trades_panel, self.watchlist, self.feed_bridge, self.screener_panel]
+        return [p for p in panels if p is not None]
+
+    def _suspend_all(self):
+        """Stop drawing and REST polling; feeds drop to conflated streams (alerts keep firing)."""
+        self.warmer.stop()
+        for panel in self._power_targets():
+            try:
+                panel.suspend()
+            except Exception:
+                pass
+
+    def _resume_all(self):
+        """Redraw once from the latest state and restart polling."""
+        for panel in self._power_targets():
+            try:
+                panel.resume()
+            except Exception:
+                pass
+        if self.settings.warm_poll_ms > 0:
+            self.warmer.start()
+
     # -------------------------
     # prefs
     # -------------------------
@@ -244,15 +502,59 @@ class DashboardApp:
     def _save_prefs(self):
         data = {
             "theme": self.theme_name,
-            "visible_assets": self.visible_assets,
-            "visible_panels": self.visible_panels,
+            # copies: the writer thread encodes them later, the UI keeps mutating the originals
+            "visible_assets": dict(self.visible_assets),
+            "visible_panels": dict(self.visible_panels),
             "current_symbol": self.current_symbol,
         }
-        try:
-            with open(PREF_PATH, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-        except Exception:
-            pass
+        self.persist.put(PREF_PATH, data)
+
+    # -------------------------
+    # runtime snapshot (warm restart)
+    # -------------------------
+    def _restore_runtime(self):
+        """Paint candles / book / tape / tickers from the last run before the network catches up."""
+        snap = load_snapshot(RUNTIME_PATH, config.RUNTIME_SNAPSHOT_MAX_AGE_S)
+        if not snap:
+            return
+        # saved least recently used first; the symbol on screen becomes the most recent
+        order = [s for s in snap["symbols"] if s != self.current_symbol]
+        if self.current_symbol in snap["symbols"]:
+            order.append(self.current_symbol)
+        for sym in order:
+            saved = snap["symbols"][sym]
+            state = self.symbol_cache.get(sym)
+            state.resampler.load(saved["bars"])
+            state.book = saved["book"]
+            state.trades = saved["trades"]
+        for sym, values in snap["tickers"].items():
+            panel = self.ticker_panels.get(sym)
+            if panel is not None:
+                panel.restore(*values)
+
+    def _save_runtime(self):
+        symbols = {}
+        for sym in self.symbol_cache.symbols():
+            state = self.symbol_cache.peek(sym)
+            if not len(state.resampler):
+                continue
+            book, trades = state.book, state.trades
+            # while replaying, the live panels show recorded data: keep the cached live state
+            if sym == self.current_symbol and self.replay is None:
+                if self.orderbook:
+                    book = self.orderbook.last_levels
+                if self.trades_panel:
+                    trades = self.trades_panel.snapshot_rows()
+            # merge() never modifies bar arrays in place, so the views need no copy
+            symbols[sym] = {"bars": state.resampler.m1.tail(config.RUNTIME_SNAPSHOT_BARS), "book": book, "trades": trades}
+        tickers = {sym: p.last_ticker for sym, p in self.ticker_panels.items() if p.last_ticker is not None}
+        self.persist.put(
+            RUNTIME_PATH, {"symbols": symbols, "tickers": tickers, "current": self.current_symbol}, encode_snapshot
+        )
+
+    def _snapshot_tick(self):
+        self._save_runtime()
+        self._snapshot_job = self.root.after(config.RUNTIME_SNAPSHOT_MS, self._snapshot_tick)
 
     # -------------------------
     # safe start/stop
@@ -304,6 +606,18 @@ class DashboardApp:
         self.save_btn = ttk.Button(header_btns, text="Save PNG", style="TopBtn.TButton", command=self.save_png)
         self.save_btn.pack(side=tk.LEFT, padx=(0, 10))
 
+        self.pack_btn = ttk.Button(header_btns, text="Export Pack", style="TopBtn.TButton", command=self.export_pack)
+        self.pack_btn.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.diag_btn = ttk.Button(header_btns, text="Diagnostics", style="TopBtn.TButton", command=self.open_diagnostics)
+        self.diag_btn.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.screener_btn = ttk.Button(header_btns, text="Screener", style="TopBtn.TButton", command=self.open_screener)
+        self.screener_btn.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.replay_btn = ttk.Button(header_btns, text="Replay", style="TopBtn.TButton", command=self.open_replay)
+        self.replay_btn.pack(side=tk.LEFT, padx=(0, 10))
+
         # ===== Button row (assets left, panels right) =====
         btn_row = ttk.Frame(self.wrapper)
         btn_row.grid(row=1, column=0, sticky="ew", pady=(10, 10))
@@ -316,14 +630,8 @@ class DashboardApp:
         panels_bar = ttk.Frame(btn_row)
         panels_bar.grid(row=0, column=1, sticky="e")
 
-        # asset toggles (mock-like)
-        self.assets = [
-            ("BTCUSDT", "BTC"),
-            ("ETHUSDT", "ETH"),
-            ("SOLUSDT", "SOL"),
-            ("BNBUSDT", "BNB"),
-            ("LTCUSDT", "LTC"),
-        ]
+        # asset toggles (mock-like), driven by settings
+        self.assets = [(sym, self.settings.short(sym)) for sym in self.settings.symbols]
 
         for sym, short in self.assets:
             b = ttk.Button(
@@ -358,7 +666,15 @@ class DashboardApp:
             style="MiniBtn.TButton",
             command=lambda: self.toggle_panel("trades")
         )
-        self.tr_btn.pack(side=tk.LEFT)
+        self.tr_btn.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.wl_btn = ttk.Button(
+            panels_bar,
+            text="Hide Watchlist" if self.visible_panels.get("watchlist", False) else "Show Watchlist",
+            style="MiniBtn.TButton",
+            command=lambda: self.toggle_panel("watchlist")
+        )
+        self.wl_btn.pack(side=tk.LEFT)
 
         # ===== Main grid (top tickers + bottom panels) =====
         main = ttk.Frame(self.wrapper)
@@ -367,52 +683,50 @@ class DashboardApp:
         main.columnconfigure(1, weight=2)
         main.rowconfigure(2, weight=1)
 
-        # --- top ticker area (two rows 3 + 2) ---
+        # --- top ticker area (rows of 3 cards) ---
         top = ttk.Frame(main)
         top.grid(row=0, column=0, columnspan=2, sticky="ew")
         top.columnconfigure(0, weight=1)
 
-        row1 = ttk.Frame(top)
-        row1.grid(row=0, column=0, sticky="ew")
-        row1.columnconfigure((0, 1, 2), weight=1)
-
-        row2 = ttk.Frame(top)
-        row2.grid(row=1, column=0, sticky="ew", pady=(12, 0))
-        row2.columnconfigure((0, 1), weight=1)
-
-        # fixed heights to look like mock and avoid jumping
+        # fixed height to look like mock and avoid jumping
         top_card_h = 126
-        top_card_h2 = 126
+        per_row = 3
 
-        # create ticker cards
-        placements = {
-            "BTCUSDT": (row1, 0, (0, 14)),
-            "ETHUSDT": (row1, 1, (0, 14)),
-            "SOLUSDT": (row1, 2, (0, 0)),
-            "BNBUSDT": (row2, 0, (0, 14)),
-            "LTCUSDT": (row2, 1, (0, 0)),
-        }
+        rows = []
+        for r in range((len(self.assets) + per_row - 1) // per_row):
+            row = ttk.Frame(top)
+            row.grid(row=r, column=0, sticky="ew", pady=(0 if r == 0 else 12, 0))
+            row.columnconfigure(tuple(range(min(per_row, len(self.assets) - r * per_row))), weight=1)
+            rows.append(row)
 
-        for sym, short in self.assets:
-            parent, col, padx = placements[sym]
-            card = RoundedCard(parent, self.theme, radius=18, padding=14, height=top_card_h if parent is row1 else top_card_h2)
-            card.grid(row=0, column=col, sticky="nsew", padx=padx)
+        # create ticker cards
+        for i, (sym, short) in enumerate(self.assets):
+            parent = rows[i // per_row]
+            col = i % per_row
+            last_in_row = col == per_row - 1 or i == len(self.assets) - 1
+            card = RoundedCard(parent, self.theme, radius=18, padding=14, height=top_card_h)
+            card.grid(row=0, column=col, sticky="nsew", padx=(0, 0) if last_in_row else (0, 14))
             self.ticker_cards[sym] = card
 
-            panel = CryptoTickerPanel(card.inner, sym, f"{short} / USDT", WS_BASE)
+            panel = CryptoTickerPanel(
+                card.inner, sym, f"{short} / USDT", self.settings.ws_base, external_feed=self.feed is not None,
+                book_ticker=self.settings.card_book_ticker, render_ms=config.CARD_RENDER_MS, aio=self.client.aio
+            )
             panel.pack(fill=tk.BOTH, expand=True)
             self.ticker_panels[sym] = panel
+            panel.add_listener(self.alerts.on_price)
 
         # start tickers that are visible
         for sym, _ in self.assets:
             if self.visible_assets.get(sym, True):
                 self._safe_start(self.ticker_panels[sym])
 
-        # --- bottom: left chart, right stack (orderbook + trades) ---
+        # --- bottom: left chart, right stack (orderbook + trades), optional watchlist ---
         bottom = ttk.Frame(main)
         bottom.grid(row=2, column=0, columnspan=2, sticky="nsew", pady=(14, 0))
         bottom.columnconfigure(0, weight=3)
         bottom.columnconfigure(1, weight=2)
+        bottom.columnconfigure(2, weight=2)
         bottom.rowconfigure(0, weight=1)
 
         # chart card
@@ -437,6 +751,11 @@ class DashboardApp:
         self.trades_card.grid(row=1, column=0, sticky="nsew")
         self._build_trades_area(self.trades_card.inner)
 
+        # watchlist card (whole market on one socket; ticker cards above are the pinned subset)
+        self.watchlist_card = RoundedCard(bottom, self.theme, radius=18, padding=16)
+        self.watchlist_card.grid(row=0, column=2, sticky="nsew", padx=(14, 0))
+        self._build_watchlist_area(self.watchlist_card.inner)
+
         # start main panels
         self._safe_start(self.chart)
         if hasattr(self, "orderbook") and self.orderbook:
@@ -473,18 +792,33 @@ class DashboardApp:
             parent,
             client=self.client,
             symbol=self.current_symbol,
-            interval="1m",
-            limit=60,
-            poll_ms=10_000
+            interval=self.settings.kline_interval,
+            limit=self.settings.kline_limit,
+            poll_ms=self.settings.chart_poll_ms,
+            history_minutes=config.KLINE_HISTORY_MINUTES,
+            overlays=config.CHART_OVERLAYS,
+            readouts=config.CHART_READOUTS,
+            cadence=self.chart_cadence
         )
         self.chart.pack(fill=tk.BOTH, expand=True, pady=(6, 0))
 
     def _build_orderbook_area(self, parent):
         ttk.Label(parent, text="Order Book", style="CardTitle.TLabel").pack(anchor="w")
-        ttk.Label(parent, text="Order Book (Top 10)", style="CardSub.TLabel").pack(anchor="w", pady=(6, 8))
+        # the feed process streams a partial book (@depth5/10/20), whatever the REST limit
+        depth = self.feed.depth if self.feed is not None else self.settings.orderbook_limit
+        ttk.Label(parent, text=f"Order Book (Top {depth})", style="CardSub.TLabel").pack(anchor="w", pady=(6, 8))
 
         if OrderBookPanel:
-            self.orderbook = OrderBookPanel(parent, client=self.client, symbol=self.current_symbol, limit=10, poll_ms=3000)
+            self.orderbook = OrderBookPanel(
+                parent,
+                client=self.client,
+                symbol=self.current_symbol,
+                limit=self.settings.orderbook_limit,
+                poll_ms=self.settings.orderbook_poll_ms,
+                slippage_notionals=config.SLIPPAGE_NOTIONALS,
+                external_feed=self.feed is not None,
+                cadence=self.orderbook_cadence
+            )
             self.orderbook.pack(fill=tk.BOTH, expand=True)
         else:
             self.orderbook = None
@@ -496,12 +830,32 @@ class DashboardApp:
 
         if RecentTradesPanel:
             # IMPORTANT: keep ONE instance and only start/stop, do not recreate on toggle
-            self.trades_panel = RecentTradesPanel(parent, self.current_symbol, WS_BASE, max_rows=12)
+            self.trades_panel = RecentTradesPanel(
+                parent, self.current_symbol, self.settings.ws_base,
+                max_rows=self.settings.trades_rows, external_feed=self.feed is not None, client=self.client,
+                mode=self.settings.trades_mode, bucket_ms=config.TRADES_BUCKET_MS, auto_rates=config.TRADES_AUTO_RATES
+            )
             self.trades_panel.pack(fill=tk.BOTH, expand=True)
+            self.trades_panel.add_listener(self.alerts.on_tape)
+            self.trades_panel.add_listener(self.activity.on_trade, counted=True)
         else:
             self.trades_panel = None
             ttk.Label(parent, text="(RecentTradesPanel not found)", style="CardSub.TLabel").pack(anchor="w")
 
+    def _build_watchlist_area(self, parent):
+        if WatchlistPanel:
+            self.watchlist = WatchlistPanel(
+                parent,
+                self.settings.ws_base,
+                pinned=[s for s, _ in self.assets],
+                on_select=self.set_symbol,
+                aio=self.client.aio,
+            )
+            self.watchlist.pack(fill=tk.BOTH, expand=True)
+        else:
+            self.watchlist = None
+            ttk.Label(parent, text="(WatchlistPanel not found)", style="CardSub.TLabel").pack(anchor="w")
+
     # -------------------------
     # apply visibility safely
     # -------------------------
@@ -519,7 +873,7 @@ class DashboardApp:
                 self.asset_btns[sym].configure(text=f"Show {short}")
 
         # panels
-        for name in ("chart", "orderbook", "trades"):
+        for name in ("chart", "orderbook", "trades", "watchlist"):
             self._apply_panel_visibility(name)
 
     def _apply_panel_visibility(self, panel_name: str):
@@ -559,6 +913,16 @@ class DashboardApp:
                 self.trades_card.grid_remove()
                 self.tr_btn.configure(text="Show Trades")
 
+        elif panel_name == "watchlist":
+            if vis:
+                self.watchlist_card.grid()
+                self.wl_btn.configure(text="Hide Watchlist")
+                self._safe_start(self.watchlist)
+            else:
+                self._safe_stop(self.watchlist)
+                self.watchlist_card.grid_remove()
+                self.wl_btn.configure(text="Show Watchlist")
+
     # -------------------------
     # actions
     # -------------------------
@@ -587,21 +951,32 @@ class DashboardApp:
         """Change chart/orderbook/trades symbol together (mock UX)"""
         if symbol == self.current_symbol:
             return
+        self.close_replay()
 
         # stop dependent panels first (safe)
         self._safe_stop(self.chart)
         if hasattr(self, "orderbook") and self.orderbook:
             self._safe_stop(self.orderbook)
-        if hasattr(self, "trades_panel") and self.trades_panel:
-            self._safe_stop(self.trades_panel)
+        # trades keep their connection: set_symbol() swaps the subscription
+
+        # park the outgoing symbol's live state, pick up the warm one
+        outgoing = self.symbol_cache.get(self.current_symbol)
+        if self.orderbook:
+            outgoing.book = self.orderbook.last_levels
+        if self.trades_panel:
+            outgoing.trades = self.trades_panel.snapshot_rows()
+        state = self.symbol_cache.get(symbol)
 
         self.current_symbol = symbol
+        self.activity.reset(symbol)
+        if self.feed:
+            self.feed.set_symbol(symbol)
         self.asset_var.set(symbol)
 
         # update chart panel (expects your CandleChartPanel to have set_symbol or symbol attr)
         if hasattr(self.chart, "set_symbol"):
             try:
-                self.chart.set_symbol(symbol)
+                self.chart.set_symbol(symbol, state.resampler, state.graphs)
             except Exception:
                 # fallback: recreate only chart safely (rare)
                 pass
@@ -617,6 +992,8 @@ class DashboardApp:
             if hasattr(self.orderbook, "set_symbol"):
                 try:
                     self.orderbook.set_symbol(symbol)
+                    if state.book[0]:
+                        self.orderbook.apply_snapshot(*state.book)
                 except Exception:
                     pass
             else:
@@ -625,28 +1002,18 @@ class DashboardApp:
                 except Exception:
                     pass
 
-        # update trades
+        # update trades (live resubscribe + background backfill)
         if hasattr(self, "trades_panel") and self.trades_panel:
-            if hasattr(self.trades_panel, "set_symbol"):
-                try:
-                    self.trades_panel.set_symbol(symbol)
-                except Exception:
-                    pass
-            else:
-                # common signature: recreate trades panel safely inside card (only if needed)
-                try:
-                    # if panel supports direct symbol change, above handles
-                    pass
-                except Exception:
-                    pass
+            try:
+                self.trades_panel.set_symbol(symbol, state.trades)
+            except Exception:
+                pass
 
         # restart only if visible
         if self.visible_panels.get("chart", True):
             self._safe_start(self.chart)
         if self.visible_panels.get("orderbook", True) and hasattr(self, "orderbook") and self.orderbook:
             self._safe_start(self.orderbook)
-        if self.visible_panels.get("trades", True) and hasattr(self, "trades_panel") and self.trades_panel:
-            self._safe_start(self.trades_panel)
 
         self._save_prefs()
 
@@ -659,39 +1026,254 @@ class DashboardApp:
         self.theme_btn.configure(text="Dark Mode" if self.theme_name == "light" else "Light Mode")
 
         # re-theme rounded cards
-        for card in list(self.ticker_cards.values()) + [self.chart_card, self.ob_card, self.trades_card]:
+        for card in list(self.ticker_cards.values()) + [self.chart_card, self.ob_card, self.trades_card, self.watchlist_card]:
             card.set_theme(self.theme)
 
         self._save_prefs()
 
     def save_png(self):
-        """Save matplotlib chart as PNG"""
-        try:
-            path = filedialog.asksaveasfilename(
-                defaultextension=".png",
-                filetypes=[("PNG Image", "*.png")],
-                title="Save chart as PNG"
+        """Save the chart as PNG (rendered off the Tk thread from a snapshot)"""
+        snap = self.chart.snapshot()
+        if snap is None:
+            messagebox.showerror("Error", "Chart has no data yet.")
+            return
+        path = filedialog.asksaveasfilename(
+            defaultextension=".png",
+            filetypes=[("PNG Image", "*.png")],
+            title="Save chart as PNG"
+        )
+        if not path:
+            return
+        self._run_export(lambda: export_png(snap, path, dpi=config.EXPORT_DPI), f"Saved PNG to:\n{path}")
+
+    def export_pack(self):
+        """Charts of every configured asset x EXPORT_INTERVALS into a folder or one multi-page PDF"""
+        path = filedialog.asksaveasfilename(
+            defaultextension="",
+            filetypes=[("PDF (one page per chart)", "*.pdf"), ("PNG folder", "*")],
+            title="Export chart pack (name.pdf or a folder name)"
+        )
+        if not path:
+            return
+
+        def run():
+            snaps = fetch_snapshots(
+                self.client, self.settings.symbols, config.EXPORT_INTERVALS, self.settings.kline_limit,
+                overlays=config.CHART_OVERLAYS,
             )
-            if not path:
-                return
+            files = export_pack(snaps, path, dpi=config.EXPORT_DPI, workers=config.EXPORT_WORKERS)
+            if not files:
+                raise RuntimeError("No chart data could be downloaded.")
+            return files
+
+        self._run_export(run, f"Exported chart pack to:\n{path}")
+
+    def _run_export(self, job, done_text):
+        """Run an export on a worker thread; report on the Tk thread."""
+        def finish(error):
+            self.save_btn.state(["!disabled"])
+            self.pack_btn.state(["!disabled"])
+            if error is None:
+                messagebox.showinfo("Saved", done_text)
+            else:
+                messagebox.showerror("Error", str(error))
 
-            canvas = getattr(self.chart, "canvas", None)
-            if canvas and hasattr(canvas, "figure"):
-                canvas.figure.savefig(path, dpi=200, bbox_inches="tight")
-                messagebox.showinfo("Saved", f"Saved PNG to:\n{path}")
-                return
+        def worker():
+            error = None
+            try:
+                job()
+            except Exception as e:
+                error = e
+            try:
+                self.root.after(0, finish, error)
+            except Exception:
+                pass  # app closed meanwhile
 
-            if hasattr(self.chart, "fig"):
-                self.chart.fig.savefig(path, dpi=200, bbox_inches="tight")
-                messagebox.showinfo("Saved", f"Saved PNG to:\n{path}")
-                return
+        self.save_btn.state(["disabled"])
+        self.pack_btn.state(["disabled"])
+        threading.Thread(target=worker, daemon=True).start()
 
-            messagebox.showerror("Error", "Cannot find matplotlib Figure in chart panel.")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+    def open_diagnostics(self):
+        """Show event-loop lag and slow callbacks in a separate window"""
+        if self.diag_window is not None and self.diag_window.winfo_exists():
+            self.diag_window.lift()
+            return
+
+        self.diag_window = tk.Toplevel(self.root)
+        self.diag_window.title("Diagnostics")
+        self.diag_window.geometry("640x520")
+
+        panel = DiagnosticsPanel(self.diag_window, self.monitor)
+        panel.pack(fill=tk.BOTH, expand=True)
+        panel.start()
+
+        def close():
+            panel.stop()
+            self.diag_window.destroy()
+            self.diag_window = None
+
+        self.diag_window.protocol("WM_DELETE_WINDOW", close)
+
+    def open_screener(self):
+        """Cross-symbol signal table in a separate window"""
+        if self.screener_window is not None and self.screener_window.winfo_exists():
+            self.screener_window.lift()
+            return
+
+        self.screener_window = tk.Toplevel(self.root)
+        self.screener_window.title("Screener")
+        self.screener_window.geometry("760x520")
+
+        screener = Screener(
+            self.client,
+            self.settings.screener_universe,
+            interval=self.settings.screener_interval,
+            bars=config.SCREENER_BARS,
+            workers=self.settings.screener_workers,
+            pool_min_symbols=config.SCREENER_POOL_MIN_SYMBOLS,
+        )
+        panel = ScreenerPanel(self.screener_window, screener, on_select=self.set_symbol)
+        panel.pack(fill=tk.BOTH, expand=True)
+        panel.start()
+        self.screener_panel = panel
+
+        def close():
+            panel.stop()
+            screener.stop()
+            self.screener_window.destroy()
+            self.screener_window = None
+            self.screener_panel = None
+            self._close_screener = None
+
+        self._close_screener = close
+        self.screener_window.protocol("WM_DELETE_WINDOW", close)
+
+    def open_replay(self):
+        """Play back recorded data of the current symbol through the panels"""
+        if self.replay_window is not None and self.replay_window.winfo_exists():
+            self.replay_window.lift()
+            return
+
+        self.replay_window = tk.Toplevel(self.root)
+        self.replay_window.title(f"Replay {self.current_symbol}")
+        self.replay_window.geometry("620x170")
+
+        panel = ReplayPanel(
+            self.replay_window,
+            available_days(self.record_dir, self.current_symbol),
+            on_load=lambda day: self.start_replay(day, on_time=panel.set_time),
+            on_exit=self.close_replay,
+        )
+        panel.pack(fill=tk.BOTH, expand=True)
+        self.replay_window.protocol("WM_DELETE_WINDOW", self.close_replay)
+
+    def close_replay(self):
+        if self.replay_window is not None:
+            try:
+                self.replay_window.destroy()
+            except Exception:
+                pass
+            self.replay_window = None
+        self.stop_replay()
+
+    def start_replay(self, day: str, on_time=None):
+        """
+        Switch chart / order book / trades to the recordings of `day`.
+        The panels are fed through their external-feed entry points (the
+        same ones the feed process uses) with alerts and the recorder
+        bypassed. Returns the engine, or None if the day cannot be read.
+        """
+        self.stop_replay()
+        try:
+            data = ReplayData(self.record_dir, self.current_symbol, day, cached_hours=config.REPLAY_CACHED_HOURS)
+        except Exception:
+            return None
+
+        self._safe_stop(self.chart)
+        for panel in (self.orderbook, self.trades_panel):
+            if panel:
+                self._safe_stop(panel)
+                self._live_external[panel] = panel.external_feed
+                panel.external_feed = True
+                self._safe_start(panel)
+                panel.status.config(text="Status: Replay")
+
+        def on_trades(rows):
+            if self.trades_panel:
+                self.trades_panel.push_trades(
+                    zip(rows["time"].tolist(), rows["price"].tolist(), rows["sell"], rows["qty"].tolist()), notify=False
+                )
+
+        def on_book(row):
+            if self.orderbook:
+                self.orderbook.apply_snapshot(
+                    [[row["bid"], row["bid_qty"]]], [[row["ask"], row["ask_qty"]]], notify=False
+                )
+
+        def on_klines(rows):
+            self._replay_resampler.merge(rows)
+            self.chart.redraw()
+
+        def on_seek(t, trades, book, klines):
+            # rebuilt from the day's bars up to t: a backwards jump drops the "future"
+            self._replay_resampler = Resampler(max_bars=config.KLINE_HISTORY_MINUTES)
+            self._replay_resampler.merge(klines)
+            self.chart.set_symbol(data.symbol, self._replay_resampler)
+            if self.trades_panel:
+                self.trades_panel.clear_rows()
+                on_trades(trades)
+            if book is not None:
+                on_book(book)
+
+        self.replay = ReplayEngine(
+            self.root, data, on_trades, on_book, on_klines, on_seek, on_time=on_time, tick_ms=config.REPLAY_TICK_MS
+        )
+        return self.replay
+
+    def stop_replay(self):
+        """Back to live data (no-op when not replaying)."""
+        if self.replay is None:
+            return
+        self.replay.pause()
+        self.replay = None
+        self._replay_resampler = None
+
+        state = self.symbol_cache.get(self.current_symbol)
+        self.chart.set_symbol(self.current_symbol, state.resampler, state.graphs)
+        if self.visible_panels.get("chart", True):
+            self._safe_start(self.chart)
+        for panel, external in self._live_external.items():
+            self._safe_stop(panel)
+            panel.external_feed = external
+        self._live_external.clear()
+        if self.orderbook:
+            if state.book[0]:
+                self.orderbook.apply_snapshot(*state.book, notify=False)
+            if self.visible_panels.get("orderbook", True):
+                self._safe_start(self.orderbook)
+        if self.trades_panel:
+            self.trades_panel.clear_rows()
+            self.trades_panel.restore_rows(state.trades)
+            if self.visible_panels.get("trades", True):
+                self._safe_start(self.trades_panel)
 
     def on_close(self):
         """Graceful shutdown (no crash, no noise)"""
+        self.close_replay()
+        if self._close_screener:
+            self._close_screener()
+        self.monitor.stop()
+        if self.power:
+            self.power.stop()
+        self.alerts.stop()
+        self.warmer.stop()
+        if self.recorder:
+            self.recorder.stop()
+        if self.feed:
+            self.feed_bridge.stop()
+            self.feed.stop()
+        if self.metrics_server:
+            self.metrics_server.stop()
         # stop tickers
         for sym, _ in self.assets:
             self._safe_stop(self.ticker_panels.get(sym))
@@ -700,8 +1282,19 @@ class DashboardApp:
         self._safe_stop(getattr(self, "chart", None))
         self._safe_stop(getattr(self, "orderbook", None))
         self._safe_stop(getattr(self, "trades_panel", None))
+        self._safe_stop(getattr(self, "watchlist", None))
 
+        # last: the ticker / watchlist streams run on the client's event loop
+        self.client.close()
+
+        if self._snapshot_job:
+            self.root.after_cancel(self._snapshot_job)
         self._save_prefs()
+        try:
+            self._save_runtime()
+        except Exception:
+            pass
+        self.persist.stop()  # writes what is pending before exit
         try:
             self.root.destroy()
         except Exception:
@@ -709,6 +1302,11 @@ class DashboardApp:
 
 
 if __name__ == "__main__":
+    try:
+        settings = load_settings(default_file=SETTINGS_PATH)
+    except ConfigError as e:
+        raise SystemExit(f"Config error: {e}")
+
     root = tk.Tk()
-    app = DashboardApp(root)
+    app = DashboardApp(root, settings)
     root.mainloop()
@@ -0,0 +1,283 @@
+import itertools
+import json
+import logging
+import platform
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import asdict, dataclass, field
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils import metrics
+
+try:
+    from plyer import notification  # optional desktop notifications
+except Exception:
+    notification = None
+
+log = logging.getLogger("dashboard.alerts")
+log.addHandler(logging.NullHandler())
+
+ABOVE = "above"   # fires when price crosses the level upwards
+BELOW = "below"   # fires when price crosses the level downwards
+CROSS = "cross"   # either way
+DIRECTIONS = (ABOVE, BELOW, CROSS)
+
+TICKER = "ticker"  # 24h ticker, ~1 update/s per symbol
+TAPE = "tape"      # live trades of the symbol on screen
+TAPE_FRESH_S = 5.0  # ticker prices are ignored while the tape is this recent
+
+_ids = itertools.count(1)
+
+
+@dataclass
+class Alert:
+    symbol: str
+    price: float
+    direction: str = CROSS
+    once: bool = True
+    note: str = ""
+    id: int = field(default_factory=lambda: next(_ids))
+
+
+@dataclass
+class AlertHit:
+    """One alert that fired, handed to the sinks."""
+    alert: Alert
+    prev_price: float
+    price: float
+    when: float
+
+    @property
+    def text(self) -> str:
+        arrow = "↑" if self.price > self.prev_price else "↓"
+        note = f" ({self.alert.note})" if self.alert.note else ""
+        return f"{self.alert.symbol} {arrow} {self.alert.price:,.8g} at {self.price:,.8g}{note}"
+
+
+class _SymbolAlerts:
+    """Alerts of one symbol kept sorted by price (parallel lists for bisect)."""
+
+    __slots__ = ("prices", "alerts")
+
+    def __init__(self):
+        self.prices: List[float] = []
+        self.alerts: List[Alert] = []
+
+    def add(self, alert: Alert):
+        i = bisect_right(self.prices, alert.price)
+        self.prices.insert(i, alert.price)
+        self.alerts.insert(i, alert)
+
+    def remove(self, alert: Alert) -> bool:
+        i = bisect_left(self.prices, alert.price)
+        while i < len(self.prices) and self.prices[i] == alert.price:
+            if self.alerts[i] is alert:
+                del self.prices[i]
+                del self.alerts[i]
+                return True
+            i += 1
+        return False
+
+    def crossed(self, prev: float, price: float) -> List[Alert]:
+        """
+        Alerts whose level lies between the previous and current price:
+        up move   prev < level <= price
+        down move price <= level < prev
+        Two bisections + the k hits, never a scan of the whole symbol.
+        """
+        if price > prev:
+            lo, hi = bisect_right(self.prices, prev), bisect_right(self.prices, price)
+            wanted = ABOVE
+        elif price < prev:
+            lo, hi = bisect_left(self.prices, price), bisect_left(self.prices, prev)
+            wanted = BELOW
+        else:
+            return []
+        return [a for a in self.alerts[lo:hi] if a.direction in (wanted, CROSS)]
+
+
+class AlertEngine:
+    """
+    Price-level alerts for many symbols.
+    on_price() / on_tape() are called from the feed threads (ticker / trades)
+    and only do the bisection; fired alerts are queued and delivered to the
+    sinks by a worker thread so notification I/O never blocks a feed.
+    Each source keeps its own previous price, and a symbol with a live tape
+    takes its alerts from the tape only: comparing a lagging ticker price
+    with a fresh trade would report crossings that never happened.
+    """
+
+    def __init__(self, sinks: Sequence[Callable[[AlertHit], None]] = (), max_queue: int = 1000):
+        self.sinks = list(sinks)
+        self._book: Dict[str, _SymbolAlerts] = {}
+        self._last: Dict[Tuple[str, str], float] = {}  # (source, symbol) -> previous price
+        self._tape_at: Dict[str, float] = {}  # symbol -> monotonic time of the last tape price
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[AlertHit]]" = queue.Queue(maxsize=max_queue)
+        self._worker: Optional[threading.Thread] = None
+
+    def __len__(self):
+        return sum(len(b.prices) for b in self._book.values())
+
+    # ---------- alerts ----------
+    def add(self, symbol: str, price: float, direction: str = CROSS, once: bool = True, note: str = "") -> Alert:
+        if direction not in DIRECTIONS:
+            raise ValueError(f"unknown alert direction: {direction}")
+        alert = Alert(symbol.upper(), float(price), direction, once, note)
+        with self._lock:
+            self._book.setdefault(alert.symbol, _SymbolAlerts()).add(alert)
+        return alert
+
+    def remove(self, alert: Alert) -> bool:
+        with self._lock:
+            book = self._book.get(alert.symbol)
+            return bool(book and book.remove(alert))
+
+    def alerts(self, symbol: Optional[str] = None) -> List[Alert]:
+        with self._lock:
+            books = [self._book.get(symbol.upper())] if symbol else list(self._book.values())
+            return [a for b in books if b for a in b.alerts]
+
+    def load(self, path: Path):
+        """JSON list of {"symbol", "price", "direction"?, "once"?, "note"?}."""
+        with open(path, "r", encoding="utf-8") as f:
+            for item in json.load(f):
+                self.add(
+                    item["symbol"], item["price"], item.get("direction", CROSS),
+                    item.get("once", True), item.get("note", ""),
+                )
+
+    def save(self, path: Path):
+        data = [{k: v for k, v in asdict(a).items() if k != "id"} for a in self.alerts()]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    # ---------- feed hook ----------
+    def on_tape(self, symbol: str, price: float):
+        """Trades listener: on_price() from the live tape."""
+        self.on_price(symbol, price, TAPE)
+
+    def on_price(self, symbol: str, price: float, source: str = TICKER):
+        """Called for every ticker/trade message (any thread)."""
+        symbol = symbol.upper()
+        mono = time.monotonic()
+        with self._lock:
+            key = (source, symbol)
+            prev = self._last.get(key)
+            self._last[key] = price
+            if source == TAPE:
+                self._tape_at[symbol] = mono
+            elif mono - self._tape_at.get(symbol, float("-inf")) < TAPE_FRESH_S:
+                return
+            book = self._book.get(symbol)
+            if prev is None or book is None:
+                return
+            hits = book.crossed(prev, price)
+            for alert in hits:
+                if alert.once:
+                    book.remove(alert)
+        if not hits:
+            return
+
+        now = time.time()
+        for alert in hits:
+            metrics.registry.inc("dashboard_alerts_fired_total", symbol=symbol)
+            try:
+                self._queue.put_nowait(AlertHit(alert, prev, price, now))
+            except queue.Full:
+                metrics.registry.inc("dashboard_alerts_dropped_total")
+
+    # ---------- delivery ----------
+    def start(self):
+        if self._worker is not None:
+            return
+        self._worker = threading.Thread(target=self._run, name="alerts", daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        if self._worker is None:
+            return
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        self._worker.join(timeout=1.0)
+        self._worker = None
+        for sink in self.sinks:
+            close = getattr(sink, "close", None)
+            if close is not None:
+                close()
+
+    def _run(self):
+        while True:
+            hit = self._queue.get()
+            if hit is None:
+                return
+            for sink in self.sinks:
+                try:
+                    sink(hit)
+                except Exception:
+                    log.exception("alert sink failed")
+
+
+# =========================
+# Sinks
+# =========================
+class LogSink:
+    """Writes fired alerts to the "dashboard.alerts" logger (optionally a rotating file)."""
+
+    def __init__(self, path: Optional[str] = None):
+        self._handler: Optional[RotatingFileHandler] = None
+        if path:
+            target = str(Path(path).resolve())
+            if any(getattr(h, "baseFilename", None) == target for h in log.handlers):
+                return  # another sink already writes this file
+            self._handler = RotatingFileHandler(target, maxBytes=1_000_000, backupCount=3, encoding="utf-8")
+            self._handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            log.addHandler(self._handler)
+            log.setLevel(logging.INFO)
+
+    def __call__(self, hit: AlertHit):
+        log.info("ALERT %s", hit.text)
+
+    def close(self):
+        """Detach and close the file handler this sink added."""
+        if self._handler is not None:
+            log.removeHandler(self._handler)
+            self._handler.close()
+            self._handler = None
+
+
+class DesktopSink:
+    """
+    Desktop notification: plyer when installed, otherwise notify-send (Linux)
+    or osascript (macOS). Does nothing when none is available.
+    """
+
+    def __init__(self, title: str = "Crypto alert"):
+        self.title = title
+        system = platform.system()
+        self._cmd: Optional[Callable[[str], Iterable[str]]] = None
+        if notification is None:
+            if system == "Linux" and shutil.which("notify-send"):
+                self._cmd = lambda text: ["notify-send", self.title, text]
+            elif system == "Darwin" and shutil.which("osascript"):
+                self._cmd = lambda text: [
+                    "osascript", "-e", f"display notification {json.dumps(text)} with title {json.dumps(self.title)}"
+                ]
+
+    @property
+    def available(self) -> bool:
+        return notification is not None or self._cmd is not None
+
+    def __call__(self, hit: AlertHit):
+        if notification is not None:
+            notification.notify(title=self.title, message=hit.text, timeout=5)
+        elif self._cmd is not None:
+            subprocess.run(list(self._cmd(hit.text)), timeout=5, check=False)
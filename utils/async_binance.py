@@ -0,0 +1,398 @@
+import asyncio
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils import metrics
+from utils.feed_process import combined_url
+
+try:
+    import aiohttp
+except Exception:
+    aiohttp = None
+
+
+class AsyncLoop:
+    """
+    One asyncio event loop on a daemon thread, shared by every async user
+    (REST requests and streams), so concurrency costs tasks, not threads.
+    Blocking code talks to it with run()/submit(); Tk code with submit_tk().
+    """
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="async-loop", daemon=True)
+            self._thread.start()
+        self._ready.wait()
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._ready.set()
+        self.loop.run_forever()
+
+    def stop(self):
+        with self._lock:
+            if self._thread is None:
+                return
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=2)
+            self._thread = None
+            self._ready.clear()
+
+    @property
+    def in_loop(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro) -> Future:
+        """Schedule `coro` on the loop (any thread); returns a concurrent Future."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Block the calling thread until `coro` finishes (never call from the loop itself)."""
+        if self.in_loop:
+            coro.close()
+            raise RuntimeError("AsyncLoop.run() called from the event loop thread (await instead)")
+        return self.submit(coro).result(timeout)
+
+    def submit_tk(self, root, coro, callback: Callable[[Any, Optional[BaseException]], None]) -> Future:
+        """Run `coro` on the loop and call callback(result, error) on the Tk thread."""
+        def done(fut: Future):
+            if fut.cancelled():
+                return
+            err = fut.exception()
+            try:
+                root.after(0, callback, None if err else fut.result(), err)
+            except Exception:
+                pass  # root destroyed meanwhile
+
+        fut = self.submit(coro)
+        fut.add_done_callback(done)
+        return fut
+
+
+_shared: Optional[AsyncLoop] = None
+_shared_lock = threading.Lock()
+
+
+def shared_loop() -> AsyncLoop:
+    """The process-wide AsyncLoop (started on first use)."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = AsyncLoop()
+        return _shared
+
+
+class AsyncBinanceClient:
+    """
+    aiohttp version of BinanceRESTClient (same endpoints and metrics) plus
+    async stream iterators. Every coroutine must run on one event loop
+    (normally shared_loop()); the HTTP session is created there lazily and
+    at most `max_concurrency` requests are in flight at once.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://api.binance.com",
+        ws_base: str = "wss://stream.binance.com:9443/ws",
+        timeout: int = 10,
+        max_concurrency: int = 50,
+    ):
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is not installed")
+        self.base_url = base_url.rstrip("/")
+        self.ws_base = ws_base
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.used_weight = 0  # X-MBX-USED-WEIGHT-1M reported by the last response
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._hub: Optional["StreamHub"] = None
+
+    @property
+    def hub(self) -> "StreamHub":
+        """Shared combined-stream connection (created on first use)."""
+        if self._hub is None:
+            self._hub = StreamHub(self)
+        return self._hub
+
+    async def _ensure_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._sem = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def close(self):
+        if self._hub is not None:
+            self._hub.close()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        session = await self._ensure_session()
+        url = f"{self.base_url}{path}"
+        async with self._sem:
+            started = time.perf_counter()
+            try:
+                async with session.get(url, params=params) as r:
+                    r.raise_for_status()
+                    weight = r.headers.get("X-MBX-USED-WEIGHT-1M")
+                    data = await r.json(content_type=None)
+            except Exception:
+                metrics.registry.inc("dashboard_rest_errors_total", endpoint=path)
+                raise
+            finally:
+                metrics.registry.observe("dashboard_rest_request_seconds", time.perf_counter() - started, endpoint=path)
+
+        if weight:
+            self.used_weight = int(weight)
+            metrics.registry.set("dashboard_rest_used_weight_1m", self.used_weight)
+        return data
+
+    # ---------- REST (same endpoints as BinanceRESTClient) ----------
+    async def get_price(self, symbol: str) -> Dict[str, Any]:
+        return await self._get("/api/v3/ticker/price", {"symbol": symbol})
+
+    async def get_24hr_stats(self, symbol: str) -> Dict[str, Any]:
+        return await self._get("/api/v3/ticker/24hr", {"symbol": symbol})
+
+    async def get_orderbook(self, symbol: str, limit: int = 10) -> Dict[str, Any]:
+        return await self._get("/api/v3/depth", {"symbol": symbol, "limit": limit})
+
+    async def get_trades(self, symbol: str, limit: int = 20) -> List[Dict[str, Any]]:
+        return await self._get("/api/v3/trades", {"symbol": symbol, "limit": limit})
+
+    async def get_klines(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int = 60,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+    ) -> List[List[Any]]:
+        params = {"symbol": symbol, "interval": interval, "limit": limit}
+        if start_time is not None:
+            params["startTime"] = int(start_time)
+        if end_time is not None:
+            params["endTime"] = int(end_time)
+        return await self._get("/api/v3/klines", params)
+
+    async def get_klines_many(self, items: Sequence[Tuple[str, str, int]]) -> List[Optional[list]]:
+        """[(symbol, interval, limit)] fetched concurrently; None where a request failed."""
+        async def one(symbol, interval, limit):
+            try:
+                return await self.get_klines(symbol, interval, limit)
+            except Exception:
+                return None
+
+        return list(await asyncio.gather(*(one(*req) for req in items)))
+
+    # ---------- streams ----------
+    async def stream(self, streams: Sequence[str], reconnect_s: float = 1.0, max_backoff_s: float = 30.0) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        Yield (stream, data) from one combined-stream connection, reconnecting
+        with exponential backoff until the consumer stops iterating.
+        """
+        session = await self._ensure_session()
+        url = combined_url(self.ws_base, streams)  # every message carries its stream name
+        label = streams[0] if len(streams) == 1 else "combined"
+        backoff = reconnect_s
+        connects = 0
+        while True:
+            try:
+                async with session.ws_connect(url, heartbeat=20, timeout=aiohttp.ClientTimeout(total=None)) as ws:
+                    connects += 1
+                    backoff = reconnect_s
+                    metrics.registry.inc("dashboard_ws_connects_total", stream=label)
+                    if connects > 1:
+                        metrics.registry.inc("dashboard_ws_reconnects_total", stream=label)
+                    metrics.registry.set("dashboard_ws_connected", 1, stream=label)
+                    async for msg in ws:
+                        if msg.type != aiohttp.WSMsgType.TEXT:
+                            if msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+                            continue
+                        payload = json.loads(msg.data)
+                        data = payload.get("data")
+                        if data is None:
+                            continue  # SUBSCRIBE replies etc.
+                        metrics.registry.inc("dashboard_ws_messages_total", stream=payload.get("stream", label))
+                        yield payload.get("stream", ""), data
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+            finally:
+                metrics.registry.set("dashboard_ws_connected", 0, stream=label)
+            await asyncio.sleep(backoff)
+            backoff = min(max_backoff_s, backoff * 2)
+
+    def subscribe(
+        self,
+        streams: Sequence[str],
+        on_message: Callable[[str, dict], None],
+        loop: Optional[AsyncLoop] = None,
+    ) -> Future:
+        """
+        Callback-style stream on the shared loop: on_message(stream, data) runs
+        on the loop thread (same contract as websocket-client callbacks).
+        Cancel the returned future to close the stream.
+        """
+        async def consume():
+            async for stream, data in self.stream(streams):
+                try:
+                    on_message(stream, data)
+                except Exception:
+                    pass
+
+        return (loop or shared_loop()).submit(consume())
+
+
+class HubSubscription:
+    """Handle of one StreamHub.subscribe() call; cancel() leaves (any thread)."""
+
+    __slots__ = ("hub", "sid")
+
+    def __init__(self, hub: "StreamHub", sid: int):
+        self.hub = hub
+        self.sid = sid
+
+    def cancel(self):
+        self.hub.loop.submit(self.hub._remove(self.sid))
+
+
+class StreamHub:
+    """
+    One combined-stream connection shared by many subscribers (ticker cards,
+    watchlist), instead of one socket each. Streams are added and dropped
+    with SUBSCRIBE / UNSUBSCRIBE on the open socket, batched every
+    CONTROL_DELAY_S to stay under Binance's 5 control messages/s; a
+    reconnect subscribes to whatever is wanted at that moment. Everything
+    except subscribe() / HubSubscription.cancel() runs on the loop thread.
+    """
+
+    CONTROL_DELAY_S = 0.5
+
+    def __init__(self, client: AsyncBinanceClient, loop: Optional[AsyncLoop] = None):
+        self.client = client
+        self.loop = loop or shared_loop()
+        self._subs: Dict[str, Dict[int, Callable[[str, dict], None]]] = {}  # stream -> {sid: on_message}
+        self._sids = itertools.count(1)
+        self._msg_ids = itertools.count(1)
+        self._ws = None
+        self._live: set = set()  # streams the open connection is subscribed to
+        self._task: Optional[asyncio.Task] = None
+        self._sync_handle: Optional[asyncio.TimerHandle] = None
+
+    def subscribe(self, streams: Sequence[str], on_message: Callable[[str, dict], None]) -> HubSubscription:
+        """on_message(stream, data) runs on the loop thread (same contract as subscribe())."""
+        sid = next(self._sids)
+        self.loop.submit(self._add(sid, list(streams), on_message))
+        return HubSubscription(self, sid)
+
+    def close(self):
+        self._subs.clear()
+        if self._sync_handle is not None:
+            self._sync_handle.cancel()
+            self._sync_handle = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _add(self, sid: int, streams: List[str], on_message):
+        for stream in streams:
+            self._subs.setdefault(stream, {})[sid] = on_message
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        else:
+            self._schedule_sync()
+
+    async def _remove(self, sid: int):
+        for stream in list(self._subs):
+            callbacks = self._subs[stream]
+            if callbacks.pop(sid, None) is not None and not callbacks:
+                del self._subs[stream]
+        if not self._subs:
+            self.close()
+        else:
+            self._schedule_sync()
+
+    def _schedule_sync(self):
+        if self._sync_handle is None:
+            self._sync_handle = asyncio.get_running_loop().call_later(
+                self.CONTROL_DELAY_S, lambda: asyncio.ensure_future(self._sync())
+            )
+
+    async def _sync(self):
+        """Bring the open connection's streams in line with the subscribers."""
+        self._sync_handle = None
+        ws = self._ws
+        if ws is None or ws.closed:
+            return  # the next connect uses the wanted set
+        wanted = set(self._subs)
+        add, drop = sorted(wanted - self._live), sorted(self._live - wanted)
+        try:
+            if add:
+                await ws.send_json({"method": "SUBSCRIBE", "params": add, "id": next(self._msg_ids)})
+            if drop:
+                await ws.send_json({"method": "UNSUBSCRIBE", "params": drop, "id": next(self._msg_ids)})
+        except Exception:
+            return  # connection dropped: the reconnect subscribes from scratch
+        self._live = wanted
+
+    async def _run(self, reconnect_s: float = 1.0, max_backoff_s: float = 30.0):
+        session = await self.client._ensure_session()
+        backoff = reconnect_s
+        connects = 0
+        while self._subs:
+            self._live = set(self._subs)
+            url = combined_url(self.client.ws_base, sorted(self._live))
+            try:
+                async with session.ws_connect(url, heartbeat=20, timeout=aiohttp.ClientTimeout(total=None)) as ws:
+                    self._ws = ws
+                    connects += 1
+                    backoff = reconnect_s
+                    metrics.registry.inc("dashboard_ws_connects_total", stream="hub")
+                    if connects > 1:
+                        metrics.registry.inc("dashboard_ws_reconnects_total", stream="hub")
+                    metrics.registry.set("dashboard_ws_connected", 1, stream="hub")
+                    self._schedule_sync()  # subscribers that changed while connecting
+                    async for msg in ws:
+                        if msg.type != aiohttp.WSMsgType.TEXT:
+                            if msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+                            continue
+                        payload = json.loads(msg.data)
+                        data = payload.get("data")
+                        if data is None:
+                            continue  # SUBSCRIBE replies etc.
+                        stream = payload.get("stream", "")
+                        metrics.registry.inc("dashboard_ws_messages_total", stream=stream)
+                        for on_message in list(self._subs.get(stream, {}).values()):
+                            try:
+                                on_message(stream, data)
+                            except Exception:
+                                pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+            finally:
+                self._ws = None
+                metrics.registry.set("dashboard_ws_connected", 0, stream="hub")
+            await asyncio.sleep(backoff)
+            backoff = min(max_backoff_s, backoff * 2)
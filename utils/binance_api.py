@@ -1,16 +1,62 @@
+import time
 import requests
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from utils import metrics
+from utils.async_binance import AsyncBinanceClient, AsyncLoop, aiohttp, shared_loop
 
 
 class BinanceRESTClient:
-    def __init__(self, base_url: str = "https://api.binance.com", timeout: int = 10):
+    """
+    Blocking client kept for the existing callers.
+    With aiohttp installed it is a thin wrapper: every call runs on the
+    shared AsyncBinanceClient / event loop (`aio`, `loop`), so all REST
+    traffic shares one connection pool. Without aiohttp it uses requests.
+    """
+
+    def __init__(self, base_url: str = "https://api.binance.com", timeout: int = 10,
+                 ws_base: str = "wss://stream.binance.com:9443/ws", use_async: bool = True):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self._used_weight = 0
+        self.aio: Optional[AsyncBinanceClient] = None
+        self.loop: Optional[AsyncLoop] = None
+        if use_async and aiohttp is not None:
+            self.aio = AsyncBinanceClient(base_url, ws_base=ws_base, timeout=timeout)
+            self.loop = shared_loop()
+
+    @property
+    def used_weight(self) -> int:
+        """X-MBX-USED-WEIGHT-1M reported by the last response."""
+        return self.aio.used_weight if self.aio is not None else self._used_weight
+
+    def close(self):
+        if self.aio is not None:
+            try:
+                self.loop.run(self.aio.close(), timeout=self.timeout)
+            except Exception:
+                pass
 
     def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        if self.aio is not None:
+            return self.loop.run(self.aio._get(path, params))
+
         url = f"{self.base_url}{path}"
-        r = requests.get(url, params=params, timeout=self.timeout)
-        r.raise_for_status()
+        started = time.perf_counter()
+        try:
+            r = requests.get(url, params=params, timeout=self.timeout)
+            r.raise_for_status()
+        except Exception:
+            metrics.registry.inc("dashboard_rest_errors_total", endpoint=path)
+            raise
+        finally:
+            metrics.registry.observe("dashboard_rest_request_seconds", time.perf_counter() - started, endpoint=path)
+
+        weight = r.headers.get("X-MBX-USED-WEIGHT-1M")
+        if weight:
+            self._used_weight = int(weight)
+            metrics.registry.set("dashboard_rest_used_weight_1m", self._used_weight)
         return r.json()
 
     def get_price(self, symbol: str) -> Dict[str, Any]:
@@ -25,5 +71,34 @@ class BinanceRESTClient:
     def get_trades(self, symbol: str, limit: int = 20) -> List[Dict[str, Any]]:
         return self._get("/api/v3/trades", {"symbol": symbol, "limit": limit})
 
-    def get_klines(self, symbol: str, interval: str, limit: int = 60) -> List[List[Any]]:
-        return self._get("/api/v3/klines", {"symbol": symbol, "interval": interval, "limit": limit})
+    def get_klines(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int = 60,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+    ) -> List[List[Any]]:
+        params = {"symbol": symbol, "interval": interval, "limit": limit}
+        if start_time is not None:
+            params["startTime"] = int(start_time)
+        if end_time is not None:
+            params["endTime"] = int(end_time)
+        return self._get("/api/v3/klines", params)
+
+    def get_klines_many(self, items: Sequence[Tuple[str, str, int]], max_threads: int = 8) -> List[Optional[list]]:
+        """
+        [(symbol, interval, limit)] -> rows per request (None where it failed).
+        Concurrent tasks on the event loop with aiohttp, a thread pool otherwise.
+        """
+        if self.aio is not None:
+            return self.loop.run(self.aio.get_klines_many(items))
+
+        def one(req):
+            try:
+                return self.get_klines(*req)
+            except Exception:
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_threads) as pool:
+            return list(pool.map(one, items))
@@ -0,0 +1,119 @@
+from dataclasses import dataclass, field
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+
+def to_arrays(levels: Sequence[Sequence[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """[[price, qty], ...] (strings or numbers) -> (prices, qtys) float arrays."""
+    if len(levels) == 0:
+        empty = np.empty(0, dtype=float)
+        return empty, empty
+    arr = np.asarray([lv[:2] for lv in levels], dtype=float)
+    return arr[:, 0], arr[:, 1]
+
+
+def cumulative_depth(prices: np.ndarray, qtys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Cumulative base quantity and quote notional from the best level outwards."""
+    return np.cumsum(qtys), np.cumsum(prices * qtys)
+
+
+def imbalance(bid_qty: np.ndarray, ask_qty: np.ndarray, levels: int = 0) -> float:
+    """(bids - asks) / (bids + asks) over the first `levels` levels (0 = all), in [-1, 1]."""
+    if levels > 0:
+        bid_qty = bid_qty[:levels]
+        ask_qty = ask_qty[:levels]
+    b = float(bid_qty.sum())
+    a = float(ask_qty.sum())
+    return (b - a) / (b + a) if (b + a) > 0 else 0.0
+
+
+def microprice(best_bid: float, bid_qty: float, best_ask: float, ask_qty: float) -> float:
+    """Size-weighted mid: leans towards the side with less resting size."""
+    total = bid_qty + ask_qty
+    if total <= 0:
+        return (best_bid + best_ask) / 2.0
+    return (best_bid * ask_qty + best_ask * bid_qty) / total
+
+
+def slippage_bps(prices: np.ndarray, qtys: np.ndarray, notionals: np.ndarray, buy: bool) -> np.ndarray:
+    """
+    Slippage (bps vs the best price) of market orders spending each quote
+    notional against one side of the book. NaN where the book is too thin.
+    All sizes are evaluated at once with searchsorted.
+    """
+    notionals = np.asarray(notionals, dtype=float)
+    if prices.size == 0:
+        return np.full(notionals.shape, np.nan)
+
+    cum_qty, cum_notional = cumulative_depth(prices, qtys)
+    idx = np.searchsorted(cum_notional, notionals, side="left")
+    ok = idx < prices.size
+    idx_c = np.minimum(idx, prices.size - 1)
+
+    prev_qty = np.where(idx_c > 0, cum_qty[idx_c - 1], 0.0)
+    prev_notional = np.where(idx_c > 0, cum_notional[idx_c - 1], 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        filled = prev_qty + (notionals - prev_notional) / prices[idx_c]
+        avg = notionals / filled
+
+    best = prices[0]
+    bps = (avg - best) / best * 1e4 if buy else (best - avg) / best * 1e4
+    return np.where(ok, bps, np.nan)
+
+
+@dataclass
+class BookStats:
+    best_bid: float = float("nan")
+    best_ask: float = float("nan")
+    mid: float = float("nan")
+    spread_bps: float = float("nan")
+    microprice: float = float("nan")
+    imbalance_top: float = 0.0   # first `top_levels` levels
+    imbalance_all: float = 0.0   # whole book we have
+    # quote notional -> (buy slippage bps, sell slippage bps)
+    slippage: Dict[float, Tuple[float, float]] = field(default_factory=dict)
+
+
+class BookAnalytics:
+    """
+    Order-book analytics over level arrays, recomputed per book update.
+    Everything is NumPy over the whole side; at 1000 levels per side an
+    update costs about a millisecond, most of it parsing the level strings.
+    """
+
+    def __init__(self, notionals: Sequence[float] = (10_000, 100_000, 1_000_000), top_levels: int = 10):
+        self.notionals = np.asarray(notionals, dtype=float)
+        self.top_levels = top_levels
+
+        # last arrays, kept for the depth chart
+        self.bid_px = np.empty(0)
+        self.bid_qty = np.empty(0)
+        self.ask_px = np.empty(0)
+        self.ask_qty = np.empty(0)
+        self.stats = BookStats()
+
+    def update(self, bids: Sequence[Sequence[str]], asks: Sequence[Sequence[str]]) -> BookStats:
+        self.bid_px, self.bid_qty = to_arrays(bids)
+        self.ask_px, self.ask_qty = to_arrays(asks)
+        self.stats = self.compute(self.bid_px, self.bid_qty, self.ask_px, self.ask_qty)
+        return self.stats
+
+    def compute(self, bid_px, bid_qty, ask_px, ask_qty) -> BookStats:
+        stats = BookStats()
+        if bid_px.size == 0 or ask_px.size == 0:
+            return stats
+
+        bb, ba = float(bid_px[0]), float(ask_px[0])
+        stats.best_bid = bb
+        stats.best_ask = ba
+        stats.mid = (bb + ba) / 2.0
+        stats.spread_bps = (ba - bb) / stats.mid * 1e4 if stats.mid else float("nan")
+        stats.microprice = microprice(bb, float(bid_qty[0]), ba, float(ask_qty[0]))
+        stats.imbalance_top = imbalance(bid_qty, ask_qty, self.top_levels)
+        stats.imbalance_all = imbalance(bid_qty, ask_qty)
+
+        buy = slippage_bps(ask_px, ask_qty, self.notionals, buy=True)
+        sell = slippage_bps(bid_px, bid_qty, self.notionals, buy=False)
+        stats.slippage = {float(n): (float(b), float(s)) for n, b, s in zip(self.notionals, buy, sell)}
+        return stats
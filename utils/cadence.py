@@ -0,0 +1,145 @@
+import math
+import threading
+import time
+from typing import List, Optional
+
+from utils.binance_api import BinanceRESTClient
+from utils.settings import BINANCE_WEIGHT_PER_MIN, ConfigError
+
+
+class MarketActivity:
+    """
+    How busy the symbol on screen is right now compared with its recent normal.
+    Fed with trades (tape listener) and polled prices; sample() returns
+    max(trade-rate ratio, price-movement ratio) of a fast vs a slow average,
+    so ~1.0 is "usual", >1 busier, <1 quieter.
+    Several pollers share one instance: calls within `min_dt_s` of the last
+    sample return the same score instead of splitting the counters.
+    """
+
+    def __init__(self, fast_s: float = 15.0, slow_s: float = 600.0, min_dt_s: float = 1.0):
+        self.fast_s = fast_s
+        self.slow_s = slow_s
+        self.min_dt_s = min_dt_s
+        self.symbol: Optional[str] = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self, symbol: Optional[str] = None):
+        with self._lock:
+            self.symbol = symbol.upper() if symbol else None
+            self._trades = 0
+            self._move = 0.0
+            self._last_price: Optional[float] = None
+            self._since: Optional[float] = None
+            self.rate_fast = self.rate_slow = 0.0
+            self.move_fast = self.move_slow = 0.0
+            self.score = 1.0
+
+    def on_trade(self, symbol: str, price: float, n: int = 1):
+        """Counted tape listener (WebSocket thread): `n` trades ending at `price`."""
+        if symbol.upper() != self.symbol:
+            return
+        with self._lock:
+            self._trades += n
+            self._observe(price)
+
+    def observe_price(self, price: float):
+        with self._lock:
+            self._observe(price)
+
+    def _observe(self, price: float):
+        if price > 0:
+            if self._last_price:
+                self._move += abs(math.log(price / self._last_price))
+            self._last_price = price
+
+    def sample(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._since is None:
+                self._since = now
+                return self.score
+            dt = now - self._since
+            if dt < max(self.min_dt_s, 1e-9):
+                return self.score
+            rate, move = self._trades / dt, self._move / dt
+            self._trades, self._move, self._since = 0, 0.0, now
+
+            first = self.rate_slow == 0.0 and self.move_slow == 0.0
+            a_fast = 1.0 if first else min(1.0, dt / self.fast_s)
+            a_slow = 1.0 if first else min(1.0, dt / self.slow_s)
+            self.rate_fast += a_fast * (rate - self.rate_fast)
+            self.rate_slow += a_slow * (rate - self.rate_slow)
+            self.move_fast += a_fast * (move - self.move_fast)
+            self.move_slow += a_slow * (move - self.move_slow)
+
+            ratios = [f / s for f, s in ((self.rate_fast, self.rate_slow), (self.move_fast, self.move_slow)) if s > 0]
+            self.score = max(ratios) if ratios else 1.0
+            return self.score
+
+
+class CadenceBudget:
+    """
+    Global REST weight budget shared by the adaptive pollers.
+    If what they ask for together exceeds the budget, every interval is
+    stretched by the same factor; if Binance reports the IP close to its
+    limit (X-MBX-USED-WEIGHT-1M), intervals are doubled on top.
+    """
+
+    def __init__(self, weight_per_min: float, client: Optional[BinanceRESTClient] = None, high_water: float = 0.8):
+        if weight_per_min <= 0:
+            raise ConfigError(f"no REST weight left for the adaptive pollers ({weight_per_min:.0f}/min)")
+        self.weight_per_min = float(weight_per_min)
+        self.client = client
+        self.high_water = high_water
+        self.cadences: List["AdaptiveCadence"] = []
+
+    def register(self, cadence: "AdaptiveCadence"):
+        self.cadences.append(cadence)
+
+    @property
+    def demand(self) -> float:
+        """Weight/min the pollers would use at their desired intervals."""
+        return sum(c.weight * 60_000 / c.desired_ms for c in self.cadences if c.enabled)
+
+    def factor(self) -> float:
+        f = max(1.0, self.demand / self.weight_per_min)
+        if self.client is not None and self.client.used_weight > self.high_water * BINANCE_WEIGHT_PER_MIN:
+            f *= 2.0
+        return f
+
+
+class AdaptiveCadence:
+    """
+    Poll interval of one panel: base_ms / activity score, clamped to
+    [min_ms, max_ms], then stretched by the shared budget if needed.
+    """
+
+    def __init__(
+        self,
+        activity: MarketActivity,
+        weight: float,
+        base_ms: int,
+        min_scale: float = 0.25,
+        max_scale: float = 4.0,
+        budget: Optional[CadenceBudget] = None,
+    ):
+        self.activity = activity
+        self.weight = weight
+        self.base_ms = int(base_ms)
+        self.min_ms = int(base_ms * min_scale)
+        self.max_ms = int(base_ms * max_scale)
+        self.budget = budget
+        self.desired_ms = self.base_ms
+        self.last_ms = self.base_ms
+        self.enabled = True  # panels clear this while stopped so they don't count against the budget
+        if budget is not None:
+            budget.register(self)
+
+    def next_ms(self) -> int:
+        score = max(1e-3, self.activity.sample())
+        self.desired_ms = min(self.max_ms, max(self.min_ms, int(self.base_ms / score)))
+        factor = self.budget.factor() if self.budget is not None else 1.0
+        self.last_ms = int(self.desired_ms * factor)
+        return self.last_ms
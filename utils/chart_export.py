@@ -0,0 +1,162 @@
+import argparse
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from utils.binance_api import BinanceRESTClient
+from utils.indicators import IndicatorGraph, parse_spec
+from utils.resample import Bars
+
+OVERLAY_COLORS = ["#34d399", "#f472b6", "#fbbf24", "#38bdf8", "#c084fc", "#fb7185"]
+
+BG = "#111827"
+FIGSIZE = (7, 3.6)
+
+
+@dataclass
+class ChartSnapshot:
+    """Everything needed to draw one chart, detached from the live panel (safe to pickle / use off the Tk thread)."""
+    symbol: str
+    interval: str
+    close: np.ndarray
+    lines: List[Tuple[str, np.ndarray, str, float]] = field(default_factory=list)  # (label, values, color, width)
+
+    @property
+    def name(self) -> str:
+        return f"{self.symbol}_{self.interval}"
+
+
+def draw_chart(ax, snap: ChartSnapshot):
+    """Draw a snapshot on `ax` (same look as CandleChartPanel)."""
+    ax.clear()
+    ax.set_facecolor(BG)
+    ax.tick_params(colors="#9ca3af")
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+
+    ax.plot(snap.close, color="#3b82f6", linewidth=2, label="Close")
+    for label, values, color, width in snap.lines:
+        ax.plot(values, color=color, linewidth=width, label=label)
+
+    ax.set_title(f"{snap.symbol} Close Price ({snap.interval})", color="#e5e7eb")
+    ax.set_xlabel("Time Index", color="#9ca3af")
+    ax.set_ylabel("Price", color="#9ca3af")
+    ax.legend(loc="upper left", frameon=False, labelcolor="#e5e7eb")
+
+
+def snapshot_from_bars(
+    symbol: str,
+    interval: str,
+    bars: Bars,
+    limit: int = 60,
+    ema_fast: int = 12,
+    ema_slow: int = 26,
+    overlays: Sequence[str] = (),
+) -> ChartSnapshot:
+    """Compute the chart lines for `bars` with a fresh indicator graph."""
+    g = IndicatorGraph()
+    close = g.source("close")
+    nodes = [(f"EMA{ema_fast}", g.ema(close, ema_fast), "#f59e0b", 1.6),
+             (f"EMA{ema_slow}", g.ema(close, ema_slow), "#a78bfa", 1.6)]
+    for spec in overlays:
+        for label, node in parse_spec(g, spec, close).items():
+            nodes.append((label, node, OVERLAY_COLORS[(len(nodes) - 2) % len(OVERLAY_COLORS)], 1.2))
+    g.update(bars)
+    return ChartSnapshot(
+        symbol,
+        interval,
+        np.array(bars.close[-limit:]),
+        [(label, g.values(node, limit), color, width) for label, node, color, width in nodes],
+    )
+
+
+def render_figure(snap: ChartSnapshot, figsize=FIGSIZE) -> Figure:
+    """Standalone Agg figure (no pyplot, no Tk): safe on any thread or process."""
+    fig = Figure(figsize=figsize, facecolor=BG)
+    FigureCanvasAgg(fig)
+    draw_chart(fig.add_subplot(111), snap)
+    return fig
+
+
+def export_png(snap: ChartSnapshot, path: str, dpi: int = 200) -> str:
+    render_figure(snap).savefig(path, dpi=dpi, bbox_inches="tight")
+    return path
+
+
+def export_pack(snapshots: Sequence[ChartSnapshot], out: str, dpi: int = 200, workers: int = 0) -> List[str]:
+    """
+    Write a chart pack: `out` ending in .pdf -> one multi-page PDF,
+    otherwise a directory with SYMBOL_INTERVAL.png per chart, rendered on a
+    process pool (`workers`, 0 = one per CPU).
+    """
+    if not snapshots:
+        return []
+    if out.lower().endswith(".pdf"):
+        parent = os.path.dirname(out)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        with PdfPages(out) as pdf:
+            for snap in snapshots:
+                pdf.savefig(render_figure(snap), bbox_inches="tight")
+        return [out]
+
+    os.makedirs(out, exist_ok=True)
+    paths = [os.path.join(out, f"{snap.name}.png") for snap in snapshots]
+    workers = min(workers or os.cpu_count() or 1, len(snapshots))
+    if workers <= 1:
+        return [export_png(snap, path, dpi) for snap, path in zip(snapshots, paths)]
+    # spawn: the caller may be a Tk process with live threads / X connection
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+        return list(pool.map(export_png, snapshots, paths, [dpi] * len(snapshots)))
+
+
+def fetch_snapshots(
+    client: BinanceRESTClient,
+    symbols: Sequence[str],
+    intervals: Sequence[str],
+    limit: int = 60,
+    ema_fast: int = 12,
+    ema_slow: int = 26,
+    overlays: Sequence[str] = (),
+) -> List[ChartSnapshot]:
+    """Download every symbol x interval at once (warm-up included) and build the snapshots."""
+    bars = min(1000, limit + 3 * ema_slow)
+    items = [(s.upper(), i, bars) for s in symbols for i in intervals]
+    snaps = []
+    for (symbol, interval, _), rows in zip(items, client.get_klines_many(items)):
+        if rows:
+            snaps.append(snapshot_from_bars(symbol, interval, Bars.from_klines(rows), limit, ema_fast, ema_slow, overlays))
+    return snaps
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """End-of-day chart pack: python -m utils.chart_export OUT[.pdf] [--symbols ...] [--intervals ...]"""
+    import config
+
+    p = argparse.ArgumentParser(description="Export charts for several symbols and timeframes")
+    p.add_argument("out", help="output directory, or a .pdf file for one multi-page document")
+    p.add_argument("--symbols", help="comma separated (default: configured assets)")
+    p.add_argument("--intervals", help="comma separated (default: %s)" % ",".join(config.EXPORT_INTERVALS))
+    p.add_argument("--limit", type=int, default=config.KLINE_LIMIT)
+    p.add_argument("--dpi", type=int, default=config.EXPORT_DPI)
+    p.add_argument("--workers", type=int, default=config.EXPORT_WORKERS)
+    p.add_argument("--rest-base", default=config.REST_BASE)
+    args = p.parse_args(argv)
+
+    symbols = args.symbols.split(",") if args.symbols else [s for s, _ in config.DASHBOARD_ASSETS]
+    intervals = args.intervals.split(",") if args.intervals else list(config.EXPORT_INTERVALS)
+    snaps = fetch_snapshots(BinanceRESTClient(args.rest_base), symbols, intervals, args.limit,
+                            overlays=config.CHART_OVERLAYS)
+    for path in export_pack(snaps, args.out, dpi=args.dpi, workers=args.workers):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
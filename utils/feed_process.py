@@ -0,0 +1,413 @@
+import json
+import multiprocessing as mp
+import queue
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import websocket  # websocket-client
+except Exception:
+    websocket = None
+
+# ticker slot columns: last price, 24h change, 24h change %, event time (ms)
+TICKER_FIELDS = 4
+
+TRADE_DTYPE = np.dtype([("gen", "i8"), ("time", "i8"), ("price", "f8"), ("qty", "f8"), ("sell", "u1")])
+KLINE_DTYPE = np.dtype([("gen", "i8"), ("row", "f8", (6,)), ("closed", "u1")])  # open_time, o, h, l, c, v
+
+# partial book streams only come in 5 / 10 / 20 levels
+BOOK_DEPTHS = (5, 10, 20)
+
+
+def book_dtype(depth: int) -> np.dtype:
+    return np.dtype([("gen", "i8"), ("nb", "i4"), ("na", "i4"), ("bids", "f8", (depth, 2)), ("asks", "f8", (depth, 2))])
+
+
+# =========================
+# Shared memory blocks
+# =========================
+class SeqlockArray:
+    """
+    NumPy array in shared memory guarded by a sequence counter (one writer).
+    The writer makes the counter odd while it writes and even when done;
+    a reader copies the data and retries if the counter was odd or moved.
+    """
+
+    HEADER = 8
+
+    def __init__(self, shape, dtype, name: Optional[str] = None, create: bool = False):
+        dtype = np.dtype(dtype)
+        size = self.HEADER + int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        self.shm = SharedMemory(name=name, create=create, size=size)
+        self._seq = np.ndarray((1,), np.int64, self.shm.buf, 0)
+        self.data = np.ndarray(shape, dtype, self.shm.buf, self.HEADER)
+        if create:
+            self._seq[0] = 0
+            self.data[...] = np.zeros((), dtype)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def seq(self) -> int:
+        return int(self._seq[0])
+
+    @contextmanager
+    def writing(self):
+        self._seq[0] += 1
+        try:
+            yield self.data
+        finally:
+            self._seq[0] += 1
+
+    def read(self, retries: int = 100) -> Optional[Tuple[int, np.ndarray]]:
+        """(seq, copy of the data), or None if the writer kept it busy."""
+        for _ in range(retries):
+            s1 = int(self._seq[0])
+            if s1 & 1:
+                continue
+            out = self.data.copy()
+            if int(self._seq[0]) == s1:
+                return s1, out
+        return None
+
+    def close(self, unlink: bool = False):
+        del self._seq, self.data
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+class SharedRing:
+    """
+    Fixed-size record ring in shared memory (one writer).
+    The header holds the number of records ever written (`head`) and the
+    count the write in progress will reach (`claim`); readers keep their own
+    cursor. The writer moves claim, writes the records, then moves head, so
+    a reader treats everything below claim - capacity as overwritten (those
+    slots may be in the middle of being rewritten) and drops it.
+    """
+
+    HEADER = 16
+
+    def __init__(self, dtype, capacity: int, name: Optional[str] = None, create: bool = False):
+        dtype = np.dtype(dtype)
+        self.capacity = int(capacity)
+        self.shm = SharedMemory(name=name, create=create, size=self.HEADER + self.capacity * dtype.itemsize)
+        self._head = np.ndarray((1,), np.int64, self.shm.buf, 0)
+        self._claim = np.ndarray((1,), np.int64, self.shm.buf, 8)
+        self.records = np.ndarray((self.capacity,), dtype, self.shm.buf, self.HEADER)
+        if create:
+            self._head[0] = self._claim[0] = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def head(self) -> int:
+        return int(self._head[0])
+
+    def push(self, record):
+        head = int(self._head[0])
+        self._claim[0] = head + 1
+        self.records[head % self.capacity] = record
+        self._head[0] = head + 1
+
+    def push_many(self, records: np.ndarray):
+        """Append a batch (oldest first); claimed as a whole before any slot is written."""
+        head = int(self._head[0])
+        n = len(records)
+        keep = min(n, self.capacity)
+        self._claim[0] = head + n
+        self.records[np.arange(head + n - keep, head + n) % self.capacity] = records[n - keep:]
+        self._head[0] = head + n
+
+    def read_since(self, cursor: int) -> Tuple[np.ndarray, int, int]:
+        """(records oldest first, new cursor, records lost to overrun)."""
+        head = int(self._head[0])
+        if head <= cursor:
+            return self.records[:0].copy(), head, 0
+        # slots below claim - capacity are overwritten or being overwritten
+        start = min(head, max(cursor, int(self._claim[0]) - self.capacity))
+        out = self.records[np.arange(start, head) % self.capacity]
+        # ... and the writer may have claimed more while we were copying
+        overwritten = int(self._claim[0]) - self.capacity - start
+        if overwritten > 0:
+            out = out[overwritten:]
+            start = min(head, start + overwritten)
+        return out, head, start - cursor
+
+    def close(self, unlink: bool = False):
+        del self._head, self._claim, self.records
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+# =========================
+# Feed process
+# =========================
+@dataclass
+class FeedSpec:
+    """Everything the feed process needs to attach (must stay picklable)."""
+    ws_base: str
+    symbols: List[str]
+    symbol: str
+    depth: int
+    trade_capacity: int
+    tickers_name: str
+    trades_name: str
+    book_name: str
+    kline_name: str
+
+
+def combined_url(ws_base: str, streams: Sequence[str]) -> str:
+    """wss://host:9443/ws -> wss://host:9443/stream?streams=a/b/c"""
+    root = ws_base[:-3] if ws_base.endswith("/ws") else ws_base.rstrip("/")
+    return f"{root}/stream?streams={'/'.join(streams)}"
+
+
+def symbol_streams(symbol: str, depth: int) -> List[str]:
+    s = symbol.lower()
+    return [f"{s}@trade", f"{s}@depth{depth}@100ms", f"{s}@kline_1m"]
+
+
+def _feed_main(spec: FeedSpec, ctrl, stop):
+    """
+    Entry point of the feed process: owns the socket, JSON decoding and the
+    shared book / candle / trade state. Only numbers cross the process boundary.
+    """
+    tickers = SeqlockArray((len(spec.symbols), TICKER_FIELDS), np.float64, name=spec.tickers_name)
+    trades = SharedRing(TRADE_DTYPE, spec.trade_capacity, name=spec.trades_name)
+    book = SeqlockArray((), book_dtype(spec.depth), name=spec.book_name)
+    kline = SeqlockArray((), KLINE_DTYPE, name=spec.kline_name)
+
+    index = {s.upper(): i for i, s in enumerate(spec.symbols)}
+    state = {"symbol": spec.symbol.upper(), "gen": 0, "ws": None}
+    ticker_streams = [f"{s.lower()}@ticker" for s in spec.symbols]
+
+    def on_message(ws, message):
+        msg = json.loads(message)
+        stream, d = msg.get("stream", ""), msg.get("data")
+        if d is None:
+            return  # SUBSCRIBE / UNSUBSCRIBE acks
+        name, _, kind = stream.partition("@")
+        if kind == "ticker":
+            i = index.get(d["s"])
+            if i is not None:
+                with tickers.writing() as t:
+                    t[i] = (float(d["c"]), float(d["p"]), float(d["P"]), float(d["E"]))
+            return
+        if name.upper() != state["symbol"]:
+            return  # late message of the previous symbol
+        gen = state["gen"]
+        if kind == "trade":
+            trades.push((gen, d["T"], float(d["p"]), float(d["q"]), d["m"]))
+        elif kind.startswith("depth"):
+            bids = np.asarray(d["bids"][: spec.depth], dtype=float).reshape(-1, 2)
+            asks = np.asarray(d["asks"][: spec.depth], dtype=float).reshape(-1, 2)
+            with book.writing() as b:
+                b["gen"] = gen
+                b["nb"], b["na"] = len(bids), len(asks)
+                b["bids"][: len(bids)] = bids
+                b["asks"][: len(asks)] = asks
+        elif kind.startswith("kline"):
+            k = d["k"]
+            with kline.writing() as kl:
+                kl["gen"] = gen
+                kl["row"] = (k["t"], float(k["o"]), float(k["h"]), float(k["l"]), float(k["c"]), float(k["v"]))
+                kl["closed"] = k["x"]
+
+    def run_socket():
+        while not stop.is_set():
+            url = combined_url(spec.ws_base, ticker_streams + symbol_streams(state["symbol"], spec.depth))
+            ws = websocket.WebSocketApp(url, on_message=on_message)
+            state["ws"] = ws
+            ws.run_forever(ping_interval=20)
+            stop.wait(2.0)  # reconnect back-off
+
+    if websocket is not None:
+        threading.Thread(target=run_socket, daemon=True).start()
+
+    next_id = 1
+    while not stop.is_set():
+        try:
+            cmd, arg = ctrl.get(timeout=0.5)
+        except queue.Empty:
+            continue
+        if cmd == "symbol" and arg.upper() != state["symbol"]:
+            old = symbol_streams(state["symbol"], spec.depth)
+            state["symbol"] = arg.upper()
+            state["gen"] += 1
+            ws = state["ws"]
+            try:
+                ws.send(json.dumps({"method": "UNSUBSCRIBE", "params": old, "id": next_id}))
+                ws.send(json.dumps({"method": "SUBSCRIBE", "params": symbol_streams(arg, spec.depth), "id": next_id + 1}))
+                next_id += 2
+            except Exception:
+                pass  # not connected: the reconnect uses the new symbol
+
+    if state["ws"] is not None:
+        state["ws"].close()
+    for block in (tickers, trades, book, kline):
+        block.close()
+
+
+class FeedProcess:
+    """
+    Owner side of the feed process: creates the shared memory blocks, starts
+    the process (spawn, so it never inherits Tk) and reads snapshots.
+    Readers are cheap copies; nothing here blocks on the network.
+    """
+
+    def __init__(self, ws_base: str, symbols: Sequence[str], symbol: str, depth: int = 20, trade_capacity: int = 4096):
+        self.symbols = [s.upper() for s in symbols]
+        self.depth = max(d for d in BOOK_DEPTHS if d <= max(BOOK_DEPTHS[0], depth))
+        self.tickers = SeqlockArray((len(self.symbols), TICKER_FIELDS), np.float64, create=True)
+        self.trades = SharedRing(TRADE_DTYPE, trade_capacity, create=True)
+        self.book = SeqlockArray((), book_dtype(self.depth), create=True)
+        self.kline = SeqlockArray((), KLINE_DTYPE, create=True)
+        self.spec = FeedSpec(
+            ws_base, self.symbols, symbol.upper(), self.depth, trade_capacity,
+            self.tickers.name, self.trades.name, self.book.name, self.kline.name,
+        )
+        self.symbol = symbol.upper()
+        self.gen = 0  # bumped per symbol change; stale book/trade/kline data is ignored
+
+        ctx = mp.get_context("spawn")
+        self._ctrl = ctx.Queue()
+        self._stop = ctx.Event()
+        self._proc = ctx.Process(target=_feed_main, args=(self.spec, self._ctrl, self._stop), name="feed", daemon=True)
+
+    def start(self):
+        if not self._proc.is_alive() and self._proc.exitcode is None:
+            self._proc.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._proc.pid is not None:
+            self._proc.join(timeout=2.0)
+            if self._proc.is_alive():
+                self._proc.terminate()
+        for block in (self.tickers, self.trades, self.book, self.kline):
+            block.close(unlink=True)
+
+    def set_symbol(self, symbol: str):
+        if symbol.upper() == self.symbol:
+            return
+        self.symbol = symbol.upper()
+        self.gen += 1
+        self._ctrl.put(("symbol", self.symbol))
+
+
+class FeedBridge:
+    """
+    Tk-side reader: every `render_ms` copies whatever changed in shared memory
+    and hands it to the panels on the Tk thread.
+    Callbacks:
+        on_ticker(symbol, price, change, percent)
+        on_trades(records)                   TRADE_DTYPE array, oldest first
+        on_book(bids, asks)                  (n, 2) float arrays, best first
+        on_kline(row)                        [open_time, o, h, l, c, v]
+    """
+
+    def __init__(
+        self,
+        root,
+        feed: FeedProcess,
+        render_ms: int = 100,
+        on_ticker: Optional[Callable] = None,
+        on_trades: Optional[Callable] = None,
+        on_book: Optional[Callable] = None,
+        on_kline: Optional[Callable] = None,
+    ):
+        self.root = root
+        self.feed = feed
+        self.render_ms = render_ms
+        self.on_ticker = on_ticker
+        self.on_trades = on_trades
+        self.on_book = on_book
+        self.on_kline = on_kline
+
+        self._job: Optional[str] = None
+        self._active = False
+        self._suspended = False
+        self.suspended_ms = 1000  # poll cadence in low-power mode (panels only store, alerts still fire)
+        self._ticker_times = np.zeros(len(feed.symbols))
+        self._trade_cursor = 0
+        self._book_seq = -1
+        self._kline_seq = -1
+
+    def start(self):
+        if self._active:
+            return
+        self._active = True
+        self._trade_cursor = self.feed.trades.head
+        self._poll()
+
+    def stop(self):
+        self._active = False
+        if self._job:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def suspend(self):
+        self._suspended = True
+
+    def resume(self):
+        """Back to the render cadence, with one poll right away."""
+        if not self._suspended:
+            return
+        self._suspended = False
+        if self._active:
+            if self._job:
+                try:
+                    self.root.after_cancel(self._job)
+                except Exception:
+                    pass
+            self._poll()
+
+    def _poll(self):
+        if not self._active:
+            return
+        self.poll_once()
+        self._job = self.root.after(self.suspended_ms if self._suspended else self.render_ms, self._poll)
+
+    def poll_once(self):
+        feed, gen = self.feed, self.feed.gen
+
+        snap = feed.tickers.read()
+        if snap is not None and self.on_ticker:
+            data = snap[1]
+            for i in np.flatnonzero(data[:, 3] > self._ticker_times):
+                self.on_ticker(feed.symbols[i], *data[i, :3].tolist())
+            self._ticker_times = data[:, 3]
+
+        records, self._trade_cursor, _lost = feed.trades.read_since(self._trade_cursor)
+        records = records[records["gen"] == gen]
+        if records.size and self.on_trades:
+            self.on_trades(records)
+
+        if feed.book.seq != self._book_seq:
+            snap = feed.book.read()
+            if snap is not None:
+                self._book_seq, b = snap
+                if int(b["gen"]) == gen and int(b["nb"]) and int(b["na"]) and self.on_book:
+                    self.on_book(b["bids"][: int(b["nb"])], b["asks"][: int(b["na"])])
+
+        if feed.kline.seq != self._kline_seq:
+            snap = feed.kline.read()
+            if snap is not None:
+                self._kline_seq, k = snap
+                if int(k["gen"]) == gen and k["row"][0] > 0 and self.on_kline:
+                    self.on_kline(k["row"].tolist())
@@ -0,0 +1,460 @@
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.resample import Bars
+
+
+# =========================
+# Vectorized kernels
+# =========================
+def ewm(values, alpha: float) -> np.ndarray:
+    """
+    Exponentially weighted mean along the last axis, seeded with the first value
+    (ewm[0] = x[0], then a*x + (1-a)*prev). Works on 1D or 2D (rows = series).
+
+    The recursion is solved in closed form per chunk:
+        y[i] = d^(i+1) * y[-1] + a * d^i * cumsum(x[j] * d^-j)
+    with chunks short enough that d^-j stays inside float range.
+    1D input may start with NaNs (output is NaN there); 2D rows must be finite.
+    """
+    x = np.asarray(values, dtype=float)
+    if x.ndim == 1:
+        finite = np.flatnonzero(np.isfinite(x))
+        out = np.full_like(x, np.nan)
+        if finite.size:
+            f = int(finite[0])
+            out[f:] = _ewm_rows(x[None, f:], alpha)[0]
+        return out
+    return _ewm_rows(x, alpha)
+
+
+def _ewm_rows(x: np.ndarray, alpha: float) -> np.ndarray:
+    rows, n = x.shape
+    if n == 0 or alpha >= 1.0:
+        return x.copy()
+    decay = 1.0 - alpha
+    chunk = max(1, int(300.0 / -np.log(decay)))
+
+    out = np.empty_like(x)
+    prev = x[:, 0].copy()  # seed: ewm[0] = x[0]
+    for s in range(0, n, chunk):
+        blk = x[:, s:s + chunk]
+        k = np.arange(blk.shape[1], dtype=float)
+        pw = decay ** k
+        acc = np.cumsum(blk / pw, axis=1)
+        out[:, s:s + blk.shape[1]] = prev[:, None] * (pw * decay) + alpha * acc * pw
+        prev = out[:, s + blk.shape[1] - 1]
+    return out
+
+
+def ema(values, period: int) -> np.ndarray:
+    return ewm(values, 2.0 / (max(1, int(period)) + 1.0))
+
+
+def rma(values, period: int) -> np.ndarray:
+    """Wilder's moving average (used by RSI / ATR)."""
+    return ewm(values, 1.0 / max(1, int(period)))
+
+
+def sma(values, period: int) -> np.ndarray:
+    """Rolling mean along the last axis; NaN until the window is full."""
+    x = np.asarray(values, dtype=float)
+    n = max(1, int(period))
+    out = np.full_like(x, np.nan)
+    if x.shape[-1] < n:
+        return out
+    c = np.cumsum(x, axis=-1)
+    out[..., n - 1] = c[..., n - 1] / n
+    out[..., n:] = (c[..., n:] - c[..., :-n]) / n
+    return out
+
+
+def rolling_std(values, period: int) -> np.ndarray:
+    """Population std over a sliding window (exact, no sum-of-squares cancellation)."""
+    x = np.asarray(values, dtype=float)
+    n = max(1, int(period))
+    out = np.full_like(x, np.nan)
+    if x.shape[-1] < n:
+        return out
+    out[..., n - 1:] = np.lib.stride_tricks.sliding_window_view(x, n, axis=-1).std(axis=-1)
+    return out
+
+
+def diff(values) -> np.ndarray:
+    """x[i] - x[i-1], first element 0."""
+    x = np.asarray(values, dtype=float)
+    out = np.zeros_like(x)
+    out[..., 1:] = np.diff(x, axis=-1)
+    return out
+
+
+def true_range(high, low, close) -> np.ndarray:
+    h, l, c = (np.asarray(a, dtype=float) for a in (high, low, close))
+    prev = np.empty_like(c)
+    prev[..., 0] = c[..., 0]
+    prev[..., 1:] = c[..., :-1]
+    return np.maximum(h - l, np.maximum(np.abs(h - prev), np.abs(l - prev)))
+
+
+# =========================
+# Graph nodes
+# =========================
+class Node:
+    """
+    One indicator step in the graph.
+    compute(): whole history, vectorized (also sets the incremental state)
+    peek():    value for a forming bar, state untouched
+    push():    value for a closed bar, state advanced
+    """
+
+    def __init__(self, inputs: Tuple["Node", ...] = (), **params):
+        self.inputs = inputs
+        self.params = params
+        self.key = (type(self).__name__, tuple(sorted(params.items())), tuple(i.key for i in inputs))
+
+    def compute(self, *arrays: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def peek(self, *xs: float) -> float:
+        raise NotImplementedError
+
+    def push(self, *xs: float) -> float:
+        return self.peek(*xs)
+
+    def __repr__(self):
+        return f"{self.key[0]}({', '.join(f'{k}={v}' for k, v in self.key[1])})"
+
+
+class Source(Node):
+    def __init__(self, field: str):
+        super().__init__(field=field)
+        self.field = field
+
+
+class EWM(Node):
+    def __init__(self, src: Node, alpha: float):
+        super().__init__((src,), alpha=float(alpha))
+        self.alpha = float(alpha)
+        self.prev = float("nan")
+
+    def compute(self, x):
+        out = ewm(x, self.alpha)
+        self.prev = float(out[-1]) if out.size else float("nan")
+        return out
+
+    def peek(self, x):
+        if self.prev != self.prev:  # NaN: not seeded yet
+            return x
+        return self.alpha * x + (1.0 - self.alpha) * self.prev
+
+    def push(self, x):
+        self.prev = self.peek(x)
+        return self.prev
+
+
+class SMA(Node):
+    def __init__(self, src: Node, period: int):
+        super().__init__((src,), period=int(period))
+        self.period = int(period)
+        self.window: deque = deque(maxlen=self.period)
+
+    def compute(self, x):
+        self.window = deque(x[-self.period:].tolist(), maxlen=self.period)
+        return sma(x, self.period)
+
+    def peek(self, x):
+        w = list(self.window)[1:] if len(self.window) == self.period else list(self.window)
+        w.append(x)
+        return sum(w) / self.period if len(w) == self.period else float("nan")
+
+    def push(self, x):
+        value = self.peek(x)
+        self.window.append(x)
+        return value
+
+
+class RollingStd(SMA):
+    def compute(self, x):
+        self.window = deque(x[-self.period:].tolist(), maxlen=self.period)
+        return rolling_std(x, self.period)
+
+    def peek(self, x):
+        w = list(self.window)[1:] if len(self.window) == self.period else list(self.window)
+        w.append(x)
+        return float(np.std(w)) if len(w) == self.period else float("nan")
+
+
+class Diff(Node):
+    def __init__(self, src: Node):
+        super().__init__((src,))
+        self.prev = float("nan")
+
+    def compute(self, x):
+        self.prev = float(x[-1]) if x.size else float("nan")
+        return diff(x)
+
+    def peek(self, x):
+        return 0.0 if self.prev != self.prev else x - self.prev
+
+    def push(self, x):
+        value = self.peek(x)
+        self.prev = x
+        return value
+
+
+class TrueRange(Node):
+    def __init__(self, high: Node, low: Node, close: Node):
+        super().__init__((high, low, close))
+        self.prev_close = float("nan")
+
+    def compute(self, h, l, c):
+        self.prev_close = float(c[-1]) if c.size else float("nan")
+        return true_range(h, l, c)
+
+    def peek(self, h, l, c):
+        if self.prev_close != self.prev_close:
+            return h - l
+        return max(h - l, abs(h - self.prev_close), abs(l - self.prev_close))
+
+    def push(self, h, l, c):
+        value = self.peek(h, l, c)
+        self.prev_close = c
+        return value
+
+
+class CumSum(Node):
+    def __init__(self, src: Node):
+        super().__init__((src,))
+        self.total = 0.0
+
+    def compute(self, x):
+        out = np.cumsum(x)
+        self.total = float(out[-1]) if out.size else 0.0
+        return out
+
+    def peek(self, x):
+        return self.total + x
+
+    def push(self, x):
+        self.total += x
+        return self.total
+
+
+class Combine(Node):
+    """Stateless element-wise node; fn must work on arrays and on floats."""
+
+    def __init__(self, name: str, fn: Callable, *inputs: Node):
+        super().__init__(tuple(inputs), op=name)
+        self.fn = fn
+
+    def compute(self, *arrays):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.asarray(self.fn(*arrays), dtype=float)
+
+    def peek(self, *xs):
+        try:
+            return float(self.fn(*xs))
+        except ZeroDivisionError:
+            return float("nan")
+
+
+def _rsi(gain, loss):
+    if isinstance(loss, np.ndarray):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = 100.0 - 100.0 / (1.0 + gain / loss)
+        return np.where(loss == 0, np.where(gain == 0, 50.0, 100.0), out)
+    if loss == 0:
+        return 50.0 if gain == 0 else 100.0
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+def _safe_div(a, b):
+    if isinstance(b, np.ndarray):
+        return np.where(b != 0, a / np.where(b != 0, b, 1.0), np.nan)
+    return a / b if b else float("nan")
+
+
+# =========================
+# Graph
+# =========================
+class IndicatorGraph:
+    """
+    Indicators declared as nodes of a dependency graph.
+    - identical nodes are created once (EMA12 used by an overlay and by MACD
+      is one node), so N overlays do not mean N passes
+    - compute(bars): vectorized over the whole history
+    - update(bars): if bars only extend/refresh the tail, closed bars are
+      pushed through each node and the forming bar is peeked
+    The last bar is treated as still forming.
+    """
+
+    def __init__(self, max_len: int = 20_000):
+        self.max_len = max_len
+        self._nodes: Dict[tuple, Node] = {}
+        self._order: List[Node] = []
+        self._values: Dict[tuple, np.ndarray] = {}   # committed (closed bars) values
+        self._forming: Dict[tuple, float] = {}
+        self._last_closed_time: Optional[int] = None
+        self._first_time: Optional[int] = None
+
+    # ---------- declaration ----------
+    def add(self, node: Node) -> Node:
+        existing = self._nodes.get(node.key)
+        if existing is not None:
+            return existing
+        self._nodes[node.key] = node
+        self._order.append(node)
+        self._last_closed_time = None  # new node: next update is a full compute
+        return node
+
+    def source(self, field: str = "close") -> Node:
+        return self.add(Source(field))
+
+    def ema(self, src: Node, period: int) -> Node:
+        return self.add(EWM(src, 2.0 / (int(period) + 1.0)))
+
+    def rma(self, src: Node, period: int) -> Node:
+        return self.add(EWM(src, 1.0 / int(period)))
+
+    def sma(self, src: Node, period: int) -> Node:
+        return self.add(SMA(src, period))
+
+    def macd(self, src: Node, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[Node, Node, Node]:
+        line = self.add(Combine("sub", lambda a, b: a - b, self.ema(src, fast), self.ema(src, slow)))
+        sig = self.ema(line, signal)
+        hist = self.add(Combine("sub", lambda a, b: a - b, line, sig))
+        return line, sig, hist
+
+    def rsi(self, src: Node, period: int = 14) -> Node:
+        d = self.add(Diff(src))
+        gain = self.rma(self.add(Combine("pos", lambda x: np.maximum(x, 0.0), d)), period)
+        loss = self.rma(self.add(Combine("neg", lambda x: np.maximum(-x, 0.0), d)), period)
+        return self.add(Combine("rsi", _rsi, gain, loss))
+
+    def bollinger(self, src: Node, period: int = 20, k: float = 2.0) -> Tuple[Node, Node, Node]:
+        mid = self.sma(src, period)
+        std = self.add(RollingStd(src, period))
+        upper = self.add(Combine(f"add{k}", lambda m, s: m + k * s, mid, std))
+        lower = self.add(Combine(f"sub{k}", lambda m, s: m - k * s, mid, std))
+        return upper, mid, lower
+
+    def atr(self, period: int = 14) -> Node:
+        tr = self.add(TrueRange(self.source("high"), self.source("low"), self.source("close")))
+        return self.rma(tr, period)
+
+    def vwap(self) -> Node:
+        """Cumulative VWAP over the loaded history."""
+        h, l, c, v = (self.source(f) for f in ("high", "low", "close", "volume"))
+        tp = self.add(Combine("typical", lambda a, b, x: (a + b + x) / 3.0, h, l, c))
+        pv = self.add(CumSum(self.add(Combine("mul", lambda a, b: a * b, tp, v))))
+        vol = self.add(CumSum(v))
+        return self.add(Combine("div", _safe_div, pv, vol))
+
+    def __len__(self):
+        return len(self._order)
+
+    # ---------- evaluation ----------
+    def compute(self, bars: Bars):
+        """Full vectorized pass over every closed bar, then peek the forming one."""
+        n = len(bars)
+        self._values.clear()
+        self._forming.clear()
+        self._last_closed_time = None
+        if n == 0:
+            return
+        self._first_time = int(bars.open_time[0])
+        closed = bars.slice(0, n - 1)
+        for node in self._order:
+            if isinstance(node, Source):
+                self._values[node.key] = getattr(closed, node.field).astype(float)
+            else:
+                self._values[node.key] = node.compute(*(self._values[i.key] for i in node.inputs))
+        self._last_closed_time = int(bars.open_time[-2]) if n >= 2 else None
+        self._peek_forming(bars)
+
+    def update(self, bars: Bars):
+        """Incremental update; falls back to compute() when history changed."""
+        n = len(bars)
+        last = self._last_closed_time
+        # older history was prepended (backfill): seeds change, recompute
+        if n < 2 or last is None or int(bars.open_time[0]) < self._first_time:
+            self.compute(bars)
+            return
+        i = int(np.searchsorted(bars.open_time, last))
+        if i >= n or int(bars.open_time[i]) != last:
+            self.compute(bars)
+            return
+
+        # push bars that closed since the last update
+        for j in range(i + 1, n - 1):
+            row = {f: float(getattr(bars, f)[j]) for f in ("open", "high", "low", "close", "volume")}
+            values: Dict[tuple, float] = {}
+            for node in self._order:
+                if isinstance(node, Source):
+                    values[node.key] = row[node.field]
+                else:
+                    values[node.key] = node.push(*(values[k.key] for k in node.inputs))
+            for key, value in values.items():
+                arr = np.append(self._values[key], value)
+                self._values[key] = arr[-self.max_len:]
+        self._last_closed_time = int(bars.open_time[n - 2])
+        self._peek_forming(bars)
+
+    def _peek_forming(self, bars: Bars):
+        row = {f: float(getattr(bars, f)[-1]) for f in ("open", "high", "low", "close", "volume")}
+        self._forming.clear()
+        for node in self._order:
+            if isinstance(node, Source):
+                self._forming[node.key] = row[node.field]
+            else:
+                self._forming[node.key] = node.peek(*(self._forming[k.key] for k in node.inputs))
+
+    def values(self, node: Node, n: Optional[int] = None) -> np.ndarray:
+        """Closed values + the forming bar's value, optionally only the last n."""
+        arr = np.append(self._values.get(node.key, np.empty(0)), self._forming.get(node.key, np.nan))
+        return arr if n is None else arr[-n:]
+
+    def last(self, node: Node) -> float:
+        return float(self._forming.get(node.key, float("nan")))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(v.nbytes for v in self._values.values())
+
+
+def parse_spec(graph: IndicatorGraph, spec: str, src: Optional[Node] = None) -> Dict[str, Node]:
+    """
+    "ema:50" / "sma:20" / "bb:20:2" / "macd:12:26:9" / "rsi:14" / "atr:14" / "vwap"
+    -> {label: node} registered on the graph. Missing parameters take the
+    usual defaults ("ema" = "ema:20").
+    """
+    src = src or graph.source("close")
+    name, *args = spec.lower().split(":")
+    try:
+        nums = [float(a) for a in args]
+    except ValueError:
+        raise ValueError(f"bad indicator parameters: {spec}") from None
+    if name == "ema":
+        period = int(nums[0]) if nums else 20
+        return {f"EMA{period}": graph.ema(src, period)}
+    if name == "sma":
+        period = int(nums[0]) if nums else 20
+        return {f"SMA{period}": graph.sma(src, period)}
+    if name == "bb":
+        period = int(nums[0]) if nums else 20
+        k = nums[1] if len(nums) > 1 else 2.0
+        upper, mid, lower = graph.bollinger(src, period, k)
+        return {f"BB{period} up": upper, f"BB{period} mid": mid, f"BB{period} low": lower}
+    if name == "macd":
+        fast, slow, sig = (int(v) for v in (nums + [12, 26, 9][len(nums):]))
+        line, signal, hist = graph.macd(src, fast, slow, sig)
+        return {"MACD": line, "MACD sig": signal, "MACD hist": hist}
+    if name == "rsi":
+        return {f"RSI{int(nums[0]) if nums else 14}": graph.rsi(src, int(nums[0]) if nums else 14)}
+    if name == "atr":
+        return {f"ATR{int(nums[0]) if nums else 14}": graph.atr(int(nums[0]) if nums else 14)}
+    if name == "vwap":
+        return {"VWAP": graph.vwap()}
+    raise ValueError(f"unknown indicator: {spec}")
@@ -0,0 +1,207 @@
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+from typing import Callable, Deque, List, Optional, Tuple
+
+from utils import metrics
+
+log = logging.getLogger("dashboard.loop")
+log.addHandler(logging.NullHandler())
+
+
+@dataclass
+class SlowCallback:
+    """One Tk callback that ran longer than the threshold."""
+    when: float          # wall clock (time.time) when the callback finished
+    label: str           # e.g. "CandleChartPanel._tick[BTCUSDT]"
+    duration_ms: float
+    stack: Optional[str] = None  # sampled main-thread stack (if sampling enabled)
+
+
+class TkLoopMonitor:
+    """
+    Watchdog for the Tk event loop.
+    - a periodic after() probe measures scheduling delay (loop lag)
+    - instrumented callbacks are timed; slow ones are recorded with their origin
+    - optional sampler thread grabs the Tk thread stack while a callback overruns
+    Results go to the "dashboard.loop" logger (rotating file) and are kept
+    in memory for the diagnostics view.
+    """
+
+    def __init__(
+        self,
+        root,
+        probe_ms: int = 100,
+        slow_ms: float = 50.0,
+        log_path: Optional[str] = None,
+        sample_stacks: bool = False,
+        history: int = 300,
+    ):
+        self.root = root
+        self.probe_ms = int(probe_ms)
+        self.slow_ms = float(slow_ms)
+        self.log_path = log_path
+        self.sample_stacks = sample_stacks
+
+        self.lags: Deque[Tuple[float, float]] = deque(maxlen=history)  # (time, lag_ms)
+        self.slow: Deque[SlowCallback] = deque(maxlen=history)
+        self.slow_total = 0  # ever recorded (history may have dropped older ones)
+        self.listeners: List[Callable[[str, float], None]] = []  # called with (label, duration_ms)
+
+        self._job: Optional[str] = None
+        self._active = False
+        self._expected = 0.0
+        self._handler: Optional[logging.Handler] = None
+
+        # callback currently running on the Tk thread (outermost only)
+        self._current: Optional[Tuple[str, float]] = None
+        self._sampled: Optional[str] = None
+        self._depth = 0
+        self._tk_thread_id = threading.get_ident()
+        self._sampler: Optional[threading.Thread] = None
+
+    # ---------- control ----------
+    def start(self):
+        if self._active:
+            return
+        self._active = True
+
+        if self.log_path and self._handler is None:
+            try:
+                self._handler = RotatingFileHandler(self.log_path, maxBytes=1_000_000, backupCount=3, encoding="utf-8")
+                self._handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+                log.addHandler(self._handler)
+                log.setLevel(logging.INFO)
+            except Exception:
+                self._handler = None
+
+        self._expected = time.perf_counter() + self.probe_ms / 1000.0
+        self._job = self.root.after(self.probe_ms, self._probe)
+
+        if self.sample_stacks:
+            self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        self._active = False
+        if self._job:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+        if self._handler is not None:
+            log.removeHandler(self._handler)
+            try:
+                self._handler.close()
+            except Exception:
+                pass
+            self._handler = None
+
+    # ---------- probe ----------
+    def _probe(self):
+        if not self._active:
+            return
+        now = time.perf_counter()
+        lag_ms = max(0.0, (now - self._expected) * 1000.0)
+        self.lags.append((time.time(), lag_ms))
+        metrics.registry.observe("dashboard_tk_loop_lag_seconds", lag_ms / 1000.0)
+        if lag_ms >= self.slow_ms:
+            log.warning("loop lag %.1f ms", lag_ms)
+
+        self._expected = now + self.probe_ms / 1000.0
+        self._job = self.root.after(self.probe_ms, self._probe)
+
+    def lag_stats(self) -> dict:
+        """last / p50 / p95 / max lag (ms) over the kept history."""
+        values = sorted(lag for _, lag in self.lags)
+        if not values:
+            return {"last": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        n = len(values)
+        return {
+            "last": self.lags[-1][1],
+            "p50": values[n // 2],
+            "p95": values[min(n - 1, int(n * 0.95))],
+            "max": values[-1],
+        }
+
+    # ---------- instrumentation ----------
+    def instrument(self, cls, method_name: str):
+        """
+        Wrap cls.method_name so every call is timed.
+        Patch the class before instances are created so bind()/after()
+        registrations pick up the wrapped method.
+        """
+        original = getattr(cls, method_name, None)
+        if original is None or getattr(original, "__monitored__", False):
+            return
+
+        monitor = self
+        name = f"{cls.__name__}.{method_name}"
+
+        @wraps(original)
+        def wrapper(obj, *args, **kwargs):
+            symbol = getattr(obj, "symbol", None)
+            label = f"{name}[{symbol}]" if symbol else name
+            return monitor.call(label, original, obj, *args, **kwargs)
+
+        wrapper.__monitored__ = True
+        setattr(cls, method_name, wrapper)
+
+    def call(self, label: str, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) and record it if it exceeds the threshold."""
+        outermost = self._depth == 0
+        self._depth += 1
+        started = time.perf_counter()
+        if outermost:
+            self._current = (label, started)
+            self._sampled = None
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._depth -= 1
+            duration_ms = (time.perf_counter() - started) * 1000.0
+            stack = None
+            if outermost:
+                stack = self._sampled
+                self._current = None
+                self._sampled = None
+
+            metrics.registry.observe("dashboard_callback_seconds", duration_ms / 1000.0, callback=label.split("[")[0])
+            for listener in self.listeners:
+                try:
+                    listener(label, duration_ms)
+                except Exception:
+                    pass
+
+            if duration_ms >= self.slow_ms:
+                self.slow.append(SlowCallback(time.time(), label, duration_ms, stack))
+                self.slow_total += 1
+                if stack:
+                    log.warning("slow callback %s %.1f ms\n%s", label, duration_ms, stack)
+                else:
+                    log.warning("slow callback %s %.1f ms", label, duration_ms)
+
+    # ---------- stack sampler ----------
+    def _sample_loop(self):
+        interval = max(0.005, self.slow_ms / 2000.0)
+        while self._active:
+            time.sleep(interval)
+            current = self._current
+            if current is None or self._sampled is not None:
+                continue
+            label, started = current
+            if (time.perf_counter() - started) * 1000.0 < self.slow_ms:
+                continue
+            frame = sys._current_frames().get(self._tk_thread_id)
+            if frame is None:
+                continue
+            # only keep the sample if the same callback is still running
+            if self._current is current:
+                self._sampled = "".join(traceback.format_stack(frame))
@@ -0,0 +1,189 @@
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# name -> (type, help). Metrics not listed here are exported as "untyped".
+METRICS = {
+    "dashboard_ws_connected": ("gauge", "1 while the WebSocket stream is connected"),
+    "dashboard_ws_connects_total": ("counter", "WebSocket connections opened"),
+    "dashboard_ws_reconnects_total": ("counter", "WebSocket connections opened after the first one"),
+    "dashboard_ws_messages_total": ("counter", "WebSocket messages received"),
+    "dashboard_rest_request_seconds": ("histogram", "REST request latency"),
+    "dashboard_rest_errors_total": ("counter", "REST requests that failed"),
+    "dashboard_rest_used_weight_1m": ("gauge", "Binance X-MBX-USED-WEIGHT-1M from the last response"),
+    "dashboard_callback_seconds": ("histogram", "Duration of instrumented Tk callbacks (render/tick)"),
+    "dashboard_tk_loop_lag_seconds": ("histogram", "Tk event-loop scheduling delay"),
+    "dashboard_alerts_fired_total": ("counter", "Price alerts that fired"),
+    "dashboard_alerts_dropped_total": ("counter", "Fired alerts dropped because the sink queue was full"),
+    "dashboard_power_suspended": ("gauge", "1 while the dashboard is in low-power mode"),
+    "dashboard_recorder_rows_total": ("counter", "Rows written by the market-data recorder"),
+    "dashboard_recorder_dropped_total": ("counter", "Rows dropped by the recorder (buffer full or write error)"),
+    "dashboard_recorder_pending": ("gauge", "Rows buffered by the recorder, not yet written"),
+}
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _fmt_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    body = ",".join('{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"')) for k, v in items)
+    return "{" + body + "}"
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters / gauges / histograms.
+    render() returns the Prometheus text exposition format.
+    """
+
+    enabled = True
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        # name -> labels -> [bucket counts..., count, sum]
+        self._histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = float(value)
+
+    def observe(self, name: str, value: float, **labels):
+        key = _label_key(labels)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            row = series.get(key)
+            if row is None:
+                row = series[key] = [0.0] * (len(self.buckets) + 2)
+            if idx < len(self.buckets):
+                row[idx] += 1
+            row[-2] += 1
+            row[-1] += value
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for kind, store in (("counter", self._counters), ("gauge", self._gauges)):
+                for name in sorted(store):
+                    self._header(lines, name, kind)
+                    for key, value in store[name].items():
+                        lines.append(f"{name}{_fmt_labels(key)} {value:g}")
+
+            for name in sorted(self._histograms):
+                self._header(lines, name, "histogram")
+                for key, row in self._histograms[name].items():
+                    cumulative = 0.0
+                    for bound, count in zip(self.buckets, row):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_fmt_labels(key, ('le', f'{bound:g}'))} {cumulative:g}")
+                    lines.append(f"{name}_bucket{_fmt_labels(key, ('le', '+Inf'))} {row[-2]:g}")
+                    lines.append(f"{name}_count{_fmt_labels(key)} {row[-2]:g}")
+                    lines.append(f"{name}_sum{_fmt_labels(key)} {row[-1]:g}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _header(lines: List[str], name: str, kind: str):
+        declared = METRICS.get(name)
+        if declared:
+            lines.append(f"# HELP {name} {declared[1]}")
+            kind = declared[0]
+        lines.append(f"# TYPE {name} {kind}")
+
+
+class NullRegistry:
+    """Stand-in used while metrics are disabled: every call is a no-op."""
+
+    enabled = False
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        pass
+
+    def set(self, name: str, value: float, **labels):
+        pass
+
+    def observe(self, name: str, value: float, **labels):
+        pass
+
+    def render(self) -> str:
+        return ""
+
+
+# Components always call metrics.registry.<method>(...).
+# It stays a NullRegistry unless enable() is called.
+registry = NullRegistry()
+
+
+class MetricsServer:
+    """Serves GET /metrics from its own daemon thread."""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9108):
+        self.registry = registry
+        self.host = host
+        self.port = int(port)
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._httpd is not None:
+            return
+        reg = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = reg.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_):
+                pass
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._httpd is None:
+            return
+        try:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+        except Exception:
+            pass
+        self._httpd = None
+        self._thread = None
+
+
+def enable(host: str = "127.0.0.1", port: int = 9108) -> MetricsServer:
+    """Switch the module registry to a real one and start the HTTP endpoint."""
+    global registry
+    if not isinstance(registry, MetricsRegistry):
+        registry = MetricsRegistry()
+    server = MetricsServer(registry, host, port)
+    server.start()
+    return server
@@ -0,0 +1,166 @@
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from utils.resample import FIELDS, Bars
+
+log = logging.getLogger("dashboard.persist")
+log.addHandler(logging.NullHandler())
+
+SNAPSHOT_VERSION = 1
+
+
+def atomic_write(path, data: bytes):
+    """Write to a temp file in the same directory, fsync, then rename over `path`."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def json_bytes(payload) -> bytes:
+    return json.dumps(payload, indent=2).encode("utf-8")
+
+
+class PersistenceService:
+    """
+    Debounced, atomic file writes on one worker thread.
+    put() only records the latest payload for a path (O(1), Tk thread);
+    the worker writes it once the path has been quiet for `debounce_s`
+    (or `max_delay_s` after the first pending put, so a steady stream of
+    changes still lands). Encoding happens on the worker too.
+    """
+
+    def __init__(self, debounce_s: float = 1.0, max_delay_s: float = 10.0):
+        self.debounce_s = debounce_s
+        self.max_delay_s = max_delay_s
+        # path -> (payload, encode, first_put, last_put)
+        self._pending: Dict[str, Tuple[Any, Callable[[Any], bytes], float, float]] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="persist", daemon=True)
+        self._thread.start()
+
+    def stop(self, flush: bool = True):
+        """Stop the worker; pending writes are done right away (in the caller) unless flush=False."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if flush:
+            self.flush()
+
+    def put(self, path, payload, encode: Callable[[Any], bytes] = json_bytes):
+        now = time.monotonic()
+        key = str(path)
+        with self._cond:
+            prev = self._pending.get(key)
+            self._pending[key] = (payload, encode, prev[2] if prev else now, now)
+            self._cond.notify()
+
+    def flush(self):
+        """Write everything pending now, in the calling thread."""
+        with self._cond:
+            items, self._pending = self._pending, {}
+        for path, (payload, encode, _, _) in items.items():
+            self._write(path, payload, encode)
+
+    def _due(self, first: float, last: float) -> float:
+        return min(last + self.debounce_s, first + self.max_delay_s)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    now = time.monotonic()
+                    due = [k for k, (_, _, first, last) in self._pending.items() if self._due(first, last) <= now]
+                    if due:
+                        break
+                    wait = min((self._due(first, last) - now for _, _, first, last in self._pending.values()), default=None)
+                    self._cond.wait(wait)
+                if not self._running:
+                    return
+                items = [(k, self._pending.pop(k)) for k in due]
+            for path, (payload, encode, _, _) in items:
+                self._write(path, payload, encode)
+
+    @staticmethod
+    def _write(path, payload, encode):
+        try:
+            atomic_write(path, encode(payload))
+        except Exception:
+            log.exception("could not write %s", path)
+
+
+# =========================
+# Runtime snapshot (warm restart)
+# =========================
+def encode_snapshot(snapshot: Dict[str, Any]) -> bytes:
+    """
+    {"symbols": {sym: {"bars": Bars, "book": (bids, asks), "trades": rows}},
+     "tickers": {sym: (price, change, percent)}, "current": sym}
+    -> npz bytes (bar columns as arrays, the rest as one JSON member).
+    """
+    arrays = {}
+    meta = {"version": SNAPSHOT_VERSION, "saved_at": time.time(), "current": snapshot.get("current"),
+            "tickers": snapshot.get("tickers", {}), "symbols": {}}
+    for sym, state in snapshot.get("symbols", {}).items():
+        bars = state["bars"]
+        for f in FIELDS:
+            arrays[f"{sym}.{f}"] = getattr(bars, f)
+        meta["symbols"][sym] = {"book": [list(side) for side in state.get("book", ([], []))],
+                                "trades": [list(r) for r in state.get("trades", [])]}
+    arrays["meta"] = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+    buf = io.BytesIO()
+    np.savez(buf, **arrays)
+    return buf.getvalue()
+
+
+def load_snapshot(path, max_age_s: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Inverse of encode_snapshot (None if missing, unreadable, too old or another version)."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        with np.load(str(path)) as z:
+            meta = json.loads(bytes(z["meta"]).decode("utf-8"))
+            if meta.get("version") != SNAPSHOT_VERSION:
+                return None
+            if max_age_s is not None and time.time() - meta.get("saved_at", 0) > max_age_s:
+                return None
+            symbols = {}
+            for sym, extra in meta["symbols"].items():
+                bars = Bars(*(z[f"{sym}.{f}"] for f in FIELDS))
+                bids, asks = extra["book"]
+                symbols[sym] = {"bars": bars, "book": (bids, asks), "trades": [tuple(r) for r in extra["trades"]]}
+    except Exception:
+        log.exception("could not read %s", path)
+        return None
+    meta["symbols"] = symbols
+    return meta
@@ -0,0 +1,132 @@
+import time
+from typing import Callable, Optional
+
+from utils import metrics
+
+# any of these on any widget of the window counts as user activity
+INPUT_EVENTS = ("<Motion>", "<KeyPress>", "<ButtonPress>", "<MouseWheel>", "<FocusIn>")
+
+
+class PowerManager:
+    """
+    Low-power mode for the dashboard window.
+    Suspends (on_suspend) as soon as the window is minimized/unmapped or
+    fully obscured, or after `idle_ms` without focus or input; resumes
+    (on_resume) when it is shown again or the user comes back.
+    A slow check timer also catches window managers that iconify without
+    sending <Unmap>.
+    """
+
+    def __init__(
+        self,
+        root,
+        on_suspend: Callable[[], None],
+        on_resume: Callable[[], None],
+        idle_ms: int = 300_000,
+        check_ms: int = 1000,
+    ):
+        self.root = root
+        self.on_suspend = on_suspend
+        self.on_resume = on_resume
+        self.idle_ms = int(idle_ms)
+        self.check_ms = int(check_ms)
+
+        self.suspended = False
+        self.reason: Optional[str] = None  # "hidden", "obscured" or "idle" while suspended
+        self._hidden = False
+        self._obscured = False
+        self._last_input = time.monotonic()
+        self._job: Optional[str] = None
+        self._active = False
+        self._bound = []  # (sequence, funcid)
+
+    def start(self):
+        if self._active:
+            return
+        self._active = True
+        self._last_input = time.monotonic()
+        self._bind("<Unmap>", self._on_unmap)
+        self._bind("<Map>", self._on_map)
+        self._bind("<Visibility>", self._on_visibility)
+        for seq in INPUT_EVENTS:
+            self._bind(seq, self._on_input)
+        self._job = self.root.after(self.check_ms, self._check)
+
+    def stop(self):
+        self._active = False
+        if self._job:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+        for seq, funcid in self._bound:
+            try:
+                self.root.unbind(seq, funcid)
+            except Exception:
+                pass
+        self._bound = []
+
+    def _bind(self, seq, fn):
+        self._bound.append((seq, self.root.bind(seq, fn, add="+")))
+
+    # ---------- events ----------
+    def _on_unmap(self, event):
+        if event.widget is self.root:
+            self._hidden = True
+            self._update()
+
+    def _on_map(self, event):
+        if event.widget is self.root:
+            self._hidden = False
+            self._last_input = time.monotonic()
+            self._update()
+
+    def _on_visibility(self, event):
+        if event.widget is self.root:
+            self._obscured = str(event.state) == "VisibilityFullyObscured"
+            self._update()
+
+    def _on_input(self, _event=None):
+        self._last_input = time.monotonic()
+        if self.reason == "idle":
+            self._update()
+
+    def _check(self):
+        if not self._active:
+            return
+        try:
+            self._hidden = self.root.state() in ("iconic", "withdrawn") or not self.root.winfo_viewable()
+        except Exception:
+            pass
+        self._update()
+        self._job = self.root.after(self.check_ms, self._check)
+
+    def _focused(self) -> bool:
+        try:
+            return self.root.focus_displayof() is not None
+        except Exception:
+            return True  # e.g. focus inside a Combobox popdown
+
+    def _update(self):
+        reason = None
+        if self._hidden:
+            reason = "hidden"
+        elif self._obscured:
+            reason = "obscured"
+        elif (
+            self.idle_ms > 0
+            and not self._focused()
+            and (time.monotonic() - self._last_input) * 1000.0 >= self.idle_ms
+        ):
+            reason = "idle"
+        self.reason = reason
+
+        if reason and not self.suspended:
+            self.suspended = True
+            metrics.registry.set("dashboard_power_suspended", 1)
+            self.on_suspend()
+        elif not reason and self.suspended:
+            self.suspended = False
+            metrics.registry.set("dashboard_power_suspended", 0)
+            self.on_resume()
@@ -0,0 +1,166 @@
+import io
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils import metrics
+from utils.persistence import atomic_write
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:
+    pa = None
+    pq = None
+
+HOUR_MS = 3_600_000
+
+# one structured dtype per recorded kind; "time" (ms) is always the first column
+DTYPES = {
+    "trades": np.dtype([("time", "i8"), ("price", "f8"), ("qty", "f8"), ("sell", "u1")]),
+    "book": np.dtype([("time", "i8"), ("bid", "f8"), ("bid_qty", "f8"), ("ask", "f8"), ("ask_qty", "f8")]),
+    "klines": np.dtype([("time", "i8"), ("open", "f8"), ("high", "f8"), ("low", "f8"), ("close", "f8"), ("volume", "f8")]),
+}
+
+
+def hour_dir(root, symbol: str, time_ms: int) -> Path:
+    """root/SYMBOL/YYYYMMDD-HH (UTC) for the hour containing `time_ms`."""
+    stamp = datetime.fromtimestamp(time_ms // 1000, tz=timezone.utc).strftime("%Y%m%d-%H")
+    return Path(root) / symbol.upper() / stamp
+
+
+class Recorder:
+    """
+    Background recorder of what the dashboard sees.
+    record_*() only append a tuple to a bounded deque (no locks, no I/O), so
+    feed threads are not slowed down; when a buffer is full the row is
+    dropped and counted. A worker thread drains the buffers every `flush_s`
+    and writes one self-contained chunk per kind and flush under
+    root/SYMBOL/YYYYMMDD-HH/ (atomic, so a crash loses at most `flush_s`):
+    - Parquet (pyarrow installed): <kind>-NNNNNN.parquet
+    - otherwise NumPy: <kind>-NNNNNN.npy (structured arrays, DTYPES)
+    """
+
+    def __init__(self, root, fmt: str = "auto", flush_s: float = 5.0, max_pending: int = 200_000):
+        if fmt == "auto":
+            fmt = "parquet" if pq is not None else "npy"
+        if fmt == "parquet" and pq is None:
+            raise RuntimeError("pyarrow is not installed")
+        self.root = Path(root)
+        self.fmt = fmt
+        self.flush_s = flush_s
+        self.max_pending = max_pending
+
+        self._buffers: Dict[str, Deque[tuple]] = {kind: deque() for kind in DTYPES}
+        self._last_kline: Dict[str, int] = {}  # symbol -> open_time of the last recorded closed bar
+        self._seq: Dict[Tuple[Path, str], Tuple[Path, int]] = {}  # (symbol dir, kind) -> (hour dir, next seq)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # ---------- feed side (any thread, O(1)) ----------
+    def _push(self, kind: str, row: tuple):
+        buf = self._buffers[kind]
+        if len(buf) >= self.max_pending:
+            metrics.registry.inc("dashboard_recorder_dropped_total", kind=kind)
+            return
+        buf.append(row)
+
+    def record_trade(self, symbol: str, time_ms: int, price: float, qty: float, is_sell: bool):
+        self._push("trades", (symbol, int(time_ms), price, qty, is_sell))
+
+    def record_book(self, symbol: str, bids, asks, time_ms: Optional[int] = None):
+        """Top of book from a snapshot ([price, qty] levels, best first)."""
+        if not bids or not asks:
+            return
+        t = int(time.time() * 1000) if time_ms is None else int(time_ms)
+        self._push("book", (symbol, t, float(bids[0][0]), float(bids[0][1]), float(asks[0][0]), float(asks[0][1])))
+
+    def record_klines(self, symbol: str, rows: Sequence[Sequence], now_ms: Optional[int] = None):
+        """1m kline rows as polled/streamed; only bars that closed since the last call are kept."""
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        last = self._last_kline.get(symbol, -1)
+        for r in rows:
+            t = int(r[0])
+            if t > last and t + 60_000 <= now_ms:
+                self._push("klines", (symbol, t, float(r[1]), float(r[2]), float(r[3]), float(r[4]), float(r[5])))
+                last = t
+        self._last_kline[symbol] = last
+
+    # ---------- control ----------
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Flush what is buffered."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self.flush()
+
+    @property
+    def pending(self) -> int:
+        return sum(len(b) for b in self._buffers.values())
+
+    # ---------- writer side ----------
+    def _run(self):
+        while not self._stop.wait(self.flush_s):
+            self.flush()
+
+    def flush(self):
+        for kind, buf in self._buffers.items():
+            n = len(buf)
+            if not n:
+                continue
+            rows = [buf.popleft() for _ in range(n)]
+            by_symbol: Dict[str, List[tuple]] = {}
+            for row in rows:
+                by_symbol.setdefault(row[0], []).append(row[1:])
+            for symbol, items in by_symbol.items():
+                arr = np.array(items, dtype=DTYPES[kind])
+                arr.sort(order="time", kind="stable")
+                # rotate by hour: split the chunk at hour boundaries
+                hour = arr["time"] // HOUR_MS
+                cuts = np.flatnonzero(np.diff(hour)) + 1
+                for part in np.split(arr, cuts):
+                    d = hour_dir(self.root, symbol, int(part["time"][0]))
+                    try:
+                        self._write(kind, d, part)
+                        metrics.registry.inc("dashboard_recorder_rows_total", float(part.size), kind=kind)
+                    except Exception:
+                        metrics.registry.inc("dashboard_recorder_dropped_total", float(part.size), kind=kind)
+        metrics.registry.set("dashboard_recorder_pending", self.pending)
+
+    @staticmethod
+    def _next_seq(d: Path, kind: str) -> int:
+        """One past the highest chunk number in `d` (gaps from deleted chunks are never reused)."""
+        last = -1
+        for p in d.glob(f"{kind}-*.*"):
+            num = p.stem[len(kind) + 1:]
+            if num.isdigit():
+                last = max(last, int(num))
+        return last + 1
+
+    def _write(self, kind: str, d: Path, arr: np.ndarray):
+        d.mkdir(parents=True, exist_ok=True)
+        ext = "parquet" if self.fmt == "parquet" else "npy"
+        # one entry per symbol and kind: a new hour directory replaces the old one
+        key = (d.parent, kind)
+        cur = self._seq.get(key)
+        seq = cur[1] if cur is not None and cur[0] == d else self._next_seq(d, kind)
+        self._seq[key] = (d, seq + 1)
+        out = io.BytesIO()
+        if self.fmt == "parquet":
+            pq.write_table(pa.table({name: arr[name] for name in arr.dtype.names}), out)
+        else:
+            np.save(out, arr, allow_pickle=False)
+        atomic_write(d / f"{kind}-{seq:06d}.{ext}", out.getvalue())  # readers never see half a chunk
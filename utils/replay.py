@@ -0,0 +1,239 @@
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from utils.recorder import DTYPES, HOUR_MS, pq
+from utils.resample import MINUTE_MS
+
+SPEEDS = (1, 2, 5, 10, 30, 60, 300)
+
+
+def available_days(root, symbol: str) -> List[str]:
+    """YYYYMMDD days with recordings for `symbol`, oldest first."""
+    d = Path(root) / symbol.upper()
+    if not d.is_dir():
+        return []
+    return sorted({p.name.split("-")[0] for p in d.iterdir() if p.is_dir()})
+
+
+def _hour_start(name: str) -> int:
+    return int(datetime.strptime(name, "%Y%m%d-%H").replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _read_chunk(path: Path, kind: str) -> np.ndarray:
+    if path.suffix == ".npy":
+        return np.load(str(path), allow_pickle=False)
+    table = pq.read_table(str(path))
+    arr = np.empty(table.num_rows, dtype=DTYPES[kind])
+    for name in DTYPES[kind].names:
+        arr[name] = table.column(name).to_numpy()
+    return arr
+
+
+class ReplayData:
+    """
+    One symbol-day of recordings (see Recorder) behind a timestamp index.
+    The index maps every recorded hour to its directory; an hour is read
+    only when playback or a seek needs it (a few hours are kept in an LRU),
+    and positions inside it come from searchsorted on the time column, so a
+    seek never re-reads the day from the start. Klines (1440 rows/day) are
+    loaded up front for the chart. Chunks are written atomically, so one
+    that cannot be read is damaged: it is listed in `errors` (path -> message)
+    for the UI instead of being skipped silently.
+    """
+
+    def __init__(self, root, symbol: str, day: str, cached_hours: int = 4):
+        self.symbol = symbol.upper()
+        self.day = day
+        base = Path(root) / self.symbol
+        self.hours: Dict[int, Path] = {
+            _hour_start(p.name): p for p in sorted(base.glob(f"{day}-*")) if p.is_dir()
+        }
+        if not self.hours:
+            raise FileNotFoundError(f"no recordings for {self.symbol} on {day}")
+        self.cached_hours = cached_hours
+        self.errors: Dict[str, str] = {}
+        self._cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self.klines = np.concatenate([self._read_hour(h, "klines") for h in self.hours])
+
+        # only the first and last hour are read to find the playable range
+        first, last = min(self.hours), max(self.hours)
+        start, end = self._first_time(first), self._last_time(last)
+        self.start_ms = first if start is None else start
+        self.end_ms = last + HOUR_MS - 1 if end is None else end
+
+    def _read_hour(self, hour: int, kind: str) -> np.ndarray:
+        d = self.hours[hour]
+        parts = []
+        for f in sorted(d.glob(f"{kind}-*.npy")) + sorted(d.glob(f"{kind}-*.parquet")):
+            if f.suffix == ".parquet" and pq is None:
+                self.errors[str(f)] = "pyarrow is not installed"
+                continue
+            try:
+                parts.append(_read_chunk(f, kind))
+            except Exception as e:
+                self.errors[str(f)] = str(e) or type(e).__name__
+        arr = np.concatenate(parts) if parts else np.empty(0, dtype=DTYPES[kind])
+        return arr[np.argsort(arr["time"], kind="stable")]
+
+    def _load(self, hour: int, kind: str) -> np.ndarray:
+        key = (hour, kind)
+        arr = self._cache.get(key)
+        if arr is not None:
+            self._cache.move_to_end(key)
+            return arr
+        arr = self._cache[key] = self._read_hour(hour, kind)
+        if len(self._cache) > self.cached_hours * 2:
+            self._cache.popitem(last=False)
+        return arr
+
+    def _first_time(self, hour: int) -> Optional[int]:
+        times = [self._load(hour, k)["time"] for k in ("trades", "book")]
+        times = [t[0] for t in times if t.size]
+        return int(min(times)) if times else None
+
+    def _last_time(self, hour: int) -> Optional[int]:
+        times = [self._load(hour, k)["time"] for k in ("trades", "book")]
+        times = [t[-1] for t in times if t.size]
+        return int(max(times)) if times else None
+
+    def between(self, kind: str, t0: int, t1: int) -> np.ndarray:
+        """Rows with t0 <= time < t1 (may span hours)."""
+        parts = []
+        hour = t0 - t0 % HOUR_MS
+        while hour < t1:
+            if hour in self.hours:
+                arr = self._load(hour, kind)
+                t = arr["time"]
+                parts.append(arr[np.searchsorted(t, t0, "left"):np.searchsorted(t, t1, "left")])
+            hour += HOUR_MS
+        if not parts:
+            return np.empty(0, dtype=DTYPES[kind])
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def last_before(self, kind: str, t: int, n: int = 1) -> np.ndarray:
+        """Up to `n` rows with time < t, looking back through earlier hours of the day."""
+        parts = []
+        count = 0
+        hour = t - t % HOUR_MS
+        first = min(self.hours)
+        while hour >= first and count < n:
+            if hour in self.hours:
+                arr = self._load(hour, kind)
+                arr = arr[:np.searchsorted(arr["time"], t, "left")][-(n - count):]
+                parts.insert(0, arr)
+                count += arr.size
+            hour -= HOUR_MS
+        if not parts:
+            return np.empty(0, dtype=DTYPES[kind])
+        return np.concatenate(parts)
+
+    def kline_rows(self, t0: int, t1: int) -> List[list]:
+        """Kline rows [open_time, o, h, l, c, v] of bars that closed in [t0, t1)."""
+        k = self.klines
+        close = k["time"] + MINUTE_MS
+        sel = k[(close >= t0) & (close < t1)]
+        return [list(r) for r in sel.tolist()]
+
+
+class ReplayEngine:
+    """
+    Plays ReplayData back on the Tk thread at `speed` x real time.
+    Every `tick_ms` the replay clock advances by the elapsed wall time x
+    speed and the rows recorded in that window are handed to the callbacks,
+    which feed the panels through their external-feed entry points:
+        on_trades(rows)                TRADE dtype rows, oldest first
+        on_book(row)                   last top-of-book row of the window
+        on_klines(rows)                closed 1m bars, [open_time, o, h, l, c, v]
+        on_seek(t, trades, book, klines)   state at t after a jump
+        on_time(t)                     replay clock (e.g. for the scrubber)
+    """
+
+    def __init__(
+        self,
+        root,
+        data: ReplayData,
+        on_trades: Callable,
+        on_book: Callable,
+        on_klines: Callable,
+        on_seek: Callable,
+        on_time: Optional[Callable] = None,
+        tick_ms: int = 100,
+        history_trades: int = 200,
+    ):
+        self.root = root
+        self.data = data
+        self.on_trades = on_trades
+        self.on_book = on_book
+        self.on_klines = on_klines
+        self.on_seek = on_seek
+        self.on_time = on_time
+        self.tick_ms = tick_ms
+        self.history_trades = history_trades
+
+        self.speed = 1.0
+        self.t = data.start_ms
+        self.playing = False
+        self._job: Optional[str] = None
+        self._wall: Optional[float] = None
+
+    def play(self):
+        if self.playing:
+            return
+        self.playing = True
+        self._wall = time.monotonic()
+        self._job = self.root.after(self.tick_ms, self._tick)
+
+    def pause(self):
+        self.playing = False
+        if self._job:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def set_speed(self, speed: float):
+        self.speed = max(0.1, float(speed))
+
+    def seek(self, t: int):
+        """Jump to `t`: only the hours around t are read (timestamp index)."""
+        self.t = int(min(max(t, self.data.start_ms), self.data.end_ms))
+        self._wall = time.monotonic()
+        trades = self.data.last_before("trades", self.t, self.history_trades)
+        book = self.data.last_before("book", self.t, 1)
+        klines = self.data.kline_rows(0, self.t)
+        self.on_seek(self.t, trades, book[-1] if book.size else None, klines)
+        if self.on_time:
+            self.on_time(self.t)
+
+    def _tick(self):
+        if not self.playing:
+            return
+        now = time.monotonic()
+        t1 = min(self.data.end_ms + 1, self.t + int((now - self._wall) * 1000 * self.speed))
+        self._wall = now
+        if t1 > self.t:
+            self._emit(self.t, t1)
+            self.t = t1
+        if self.on_time:
+            self.on_time(self.t)
+        if self.t > self.data.end_ms:
+            self.pause()
+            return
+        self._job = self.root.after(self.tick_ms, self._tick)
+
+    def _emit(self, t0: int, t1: int):
+        trades = self.data.between("trades", t0, t1)
+        if trades.size:
+            self.on_trades(trades[-self.history_trades:])  # older ones would scroll out of the tape anyway
+        book = self.data.between("book", t0, t1)
+        if book.size:
+            self.on_book(book[-1])
+        klines = self.data.kline_rows(t0, t1)
+        if klines:
+            self.on_klines(klines)
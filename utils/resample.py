@@ -0,0 +1,175 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+MINUTE_MS = 60_000
+
+# Binance intervals that can be built from 1m bars (epoch aligned, UTC)
+INTERVAL_MINUTES = {
+    "1m": 1,
+    "3m": 3,
+    "5m": 5,
+    "15m": 15,
+    "30m": 30,
+    "1h": 60,
+    "2h": 120,
+    "4h": 240,
+    "1d": 1440,
+}
+
+FIELDS = ("open_time", "open", "high", "low", "close", "volume")
+
+
+class Bars:
+    """Column arrays of OHLCV bars (open_time in ms)."""
+
+    __slots__ = FIELDS
+
+    def __init__(self, open_time=None, open=None, high=None, low=None, close=None, volume=None):
+        self.open_time = np.empty(0, dtype=np.int64) if open_time is None else open_time
+        self.open = np.empty(0) if open is None else open
+        self.high = np.empty(0) if high is None else high
+        self.low = np.empty(0) if low is None else low
+        self.close = np.empty(0) if close is None else close
+        self.volume = np.empty(0) if volume is None else volume
+
+    def __len__(self):
+        return int(self.open_time.size)
+
+    @classmethod
+    def from_klines(cls, klines: Sequence[Sequence]) -> "Bars":
+        """Binance kline rows -> Bars (only the OHLCV columns are kept)."""
+        if not klines:
+            return cls()
+        t = np.fromiter((k[0] for k in klines), dtype=np.int64, count=len(klines))
+        ohlcv = np.asarray([k[1:6] for k in klines], dtype=float)
+        return cls(t, ohlcv[:, 0], ohlcv[:, 1], ohlcv[:, 2], ohlcv[:, 3], ohlcv[:, 4])
+
+    def slice(self, start: int, stop: Optional[int] = None) -> "Bars":
+        return Bars(*(getattr(self, f)[start:stop] for f in FIELDS))
+
+    def tail(self, n: int) -> "Bars":
+        return self.slice(max(0, len(self) - n))
+
+    @staticmethod
+    def concat(a: "Bars", b: "Bars") -> "Bars":
+        return Bars(*(np.concatenate((getattr(a, f), getattr(b, f))) for f in FIELDS))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, f).nbytes for f in FIELDS)
+
+
+def resample(bars: Bars, minutes: int) -> Bars:
+    """
+    Group 1m bars into `minutes` buckets with one vectorized reduction per column:
+    first open, max high, min low, last close, sum volume.
+    """
+    n = len(bars)
+    if n == 0 or minutes <= 1:
+        return bars
+    bucket_ms = minutes * MINUTE_MS
+    bucket = bars.open_time // bucket_ms
+    starts = np.flatnonzero(np.diff(bucket, prepend=bucket[0] - 1))
+    ends = np.append(starts[1:], n) - 1
+    return Bars(
+        bucket[starts] * bucket_ms,
+        bars.open[starts],
+        np.maximum.reduceat(bars.high, starts),
+        np.minimum.reduceat(bars.low, starts),
+        bars.close[ends],
+        np.add.reduceat(bars.volume, starts),
+    )
+
+
+class Resampler:
+    """
+    Keeps one 1m series and derives higher timeframes from it.
+    - merge() adds/updates 1m bars (REST tail polls, backfill pages)
+    - get(tf) returns the derived series; cached per timeframe and, after a
+      merge, only the buckets touched by the changed 1m bars are recomputed
+    """
+
+    def __init__(self, max_bars: int = 15_000):
+        self.max_bars = max_bars
+        self.m1 = Bars()
+        self._cache: Dict[str, Bars] = {}
+        self._dirty_from: Dict[str, int] = {}  # tf -> earliest changed 1m open_time
+
+    def __len__(self):
+        return len(self.m1)
+
+    @property
+    def nbytes(self) -> int:
+        return self.m1.nbytes + sum(b.nbytes for b in self._cache.values())
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        return int(self.m1.open_time[-1]) if len(self.m1) else None
+
+    @property
+    def first_open_time(self) -> Optional[int]:
+        return int(self.m1.open_time[0]) if len(self.m1) else None
+
+    def merge(self, klines: Sequence[Sequence]):
+        """Merge Binance 1m kline rows (older pages, updated tail or new bars)."""
+        new = Bars.from_klines(klines)
+        if len(new) == 0:
+            return
+        changed_from = int(new.open_time[0])
+        old = self.m1
+
+        if len(old) == 0:
+            merged = new
+        elif new.open_time[0] > old.open_time[-1]:
+            merged = Bars.concat(old, new)                     # pure append
+        elif new.open_time[-1] < old.open_time[0]:
+            merged = Bars.concat(new, old)                     # older page
+        else:
+            # overlap: new rows win; keep old rows outside new's time range
+            keep_head = old.slice(0, int(np.searchsorted(old.open_time, new.open_time[0], side="left")))
+            keep_tail = old.slice(int(np.searchsorted(old.open_time, new.open_time[-1], side="right")))
+            merged = Bars.concat(Bars.concat(keep_head, new), keep_tail)
+
+        if len(merged) > self.max_bars:
+            merged = merged.tail(self.max_bars)
+            self._cache.clear()
+            self._dirty_from.clear()
+        self.m1 = merged
+
+        for tf in self._cache:
+            prev = self._dirty_from.get(tf)
+            self._dirty_from[tf] = changed_from if prev is None else min(prev, changed_from)
+
+    def get(self, interval: str) -> Bars:
+        minutes = INTERVAL_MINUTES[interval]
+        if minutes == 1:
+            return self.m1
+
+        cached = self._cache.get(interval)
+        dirty = self._dirty_from.pop(interval, None)
+        if cached is None or (dirty is not None and len(cached) and dirty < cached.open_time[0]):
+            cached = resample(self.m1, minutes)
+        elif dirty is not None:
+            # recompute only from the bucket that contains the first changed bar
+            bucket_start = (dirty // (minutes * MINUTE_MS)) * minutes * MINUTE_MS
+            keep = int(np.searchsorted(cached.open_time, bucket_start, side="left"))
+            first = int(np.searchsorted(self.m1.open_time, bucket_start, side="left"))
+            cached = Bars.concat(cached.slice(0, keep), resample(self.m1.slice(first), minutes))
+        self._cache[interval] = cached
+        return cached
+
+    def load(self, bars: Bars):
+        """Replace the 1m series (e.g. from a saved snapshot)."""
+        self.m1 = bars.tail(self.max_bars)
+        self._cache.clear()
+        self._dirty_from.clear()
+
+    def clear(self):
+        self.m1 = Bars()
+        self._cache.clear()
+        self._dirty_from.clear()
+
+
+def supported_intervals() -> List[str]:
+    return list(INTERVAL_MINUTES)
@@ -0,0 +1,176 @@
+import multiprocessing as mp
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.binance_api import BinanceRESTClient
+from utils.indicators import diff, ema, rma
+from utils.resample import INTERVAL_MINUTES, MINUTE_MS, Resampler
+
+# signal codes -> text (same wording as CandleChartPanel)
+SIGNALS = {
+    2: "BUY (EMA Cross Up)",
+    -2: "SELL (EMA Cross Down)",
+    1: "BULLISH",
+    -1: "BEARISH",
+    0: "NEUTRAL",
+}
+
+
+def crossover_codes(fast: np.ndarray, slow: np.ndarray) -> np.ndarray:
+    """EMA crossover on the last two columns of (symbols x time) arrays."""
+    prev_f, prev_s = fast[:, -2], slow[:, -2]
+    curr_f, curr_s = fast[:, -1], slow[:, -1]
+    codes = np.sign(curr_f - curr_s).astype(int)
+    codes[(prev_f <= prev_s) & (curr_f > curr_s)] = 2
+    codes[(prev_f >= prev_s) & (curr_f < curr_s)] = -2
+    return codes
+
+
+def evaluate(closes: np.ndarray, ema_fast: int = 12, ema_slow: int = 26, rsi_period: int = 14) -> Dict[str, np.ndarray]:
+    """
+    One vectorized pass over a (symbols x time) close matrix.
+    Every indicator runs along the time axis for all symbols at once.
+    """
+    fast = ema(closes, ema_fast)
+    slow = ema(closes, ema_slow)
+
+    d = diff(closes)
+    gain = rma(np.maximum(d, 0.0), rsi_period)[:, -1]
+    loss = rma(np.maximum(-d, 0.0), rsi_period)[:, -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(loss == 0, np.where(gain == 0, 50.0, 100.0), 100.0 - 100.0 / (1.0 + gain / loss))
+        change = (closes[:, -1] / closes[:, 0] - 1.0) * 100.0
+
+    return {
+        "last": closes[:, -1],
+        "change": change,
+        "ema_fast": fast[:, -1],
+        "ema_slow": slow[:, -1],
+        "rsi": rsi,
+        "signal": crossover_codes(fast, slow) if closes.shape[1] >= 2 else np.zeros(len(closes), dtype=int),
+    }
+
+
+def evaluate_parallel(closes: np.ndarray, pool: Executor, workers: int, **kwargs) -> Dict[str, np.ndarray]:
+    """Split the symbol axis across `pool` (for very large universes)."""
+    chunks = [c for c in np.array_split(closes, workers, axis=0) if len(c)]
+    parts = list(pool.map(_evaluate_kwargs, chunks, [kwargs] * len(chunks)))
+    return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+
+def _evaluate_kwargs(closes, kwargs):
+    return evaluate(closes, **kwargs)
+
+
+class Screener:
+    """
+    Keeps the last `bars` closes of every symbol in the universe and
+    evaluates signals across all of them at once.
+    First refresh downloads `bars` klines per symbol; later refreshes only
+    fetch the bars since the last one (plus the forming bar) and merge them.
+    Large universes are evaluated on a process pool kept until stop().
+    """
+
+    def __init__(
+        self,
+        client: BinanceRESTClient,
+        symbols: Sequence[str],
+        interval: str = "1m",
+        bars: int = 200,
+        ema_fast: int = 12,
+        ema_slow: int = 26,
+        workers: int = 0,
+        pool_min_symbols: int = 500,
+    ):
+        self.client = client
+        self.symbols = [s.upper() for s in symbols]
+        self.interval = interval
+        self.bars = bars
+        self.ema_fast = ema_fast
+        self.ema_slow = ema_slow
+        self.workers = workers
+        self.pool_min_symbols = pool_min_symbols
+        # Resampler used as a plain bar store (rows are already `interval` bars)
+        self._series: Dict[str, Resampler] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def interval_ms(self) -> int:
+        return INTERVAL_MINUTES.get(self.interval, 1) * MINUTE_MS
+
+    def ms_until_next_close(self) -> int:
+        now = int(time.time() * 1000)
+        return self.interval_ms - now % self.interval_ms
+
+    def stop(self):
+        """Shut the process pool down (a later evaluate() starts a new one)."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: the caller is a Tk process with live threads / X connection
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context("spawn"))
+        return self._pool
+
+    def _limit(self, symbol: str) -> int:
+        store = self._series.get(symbol)
+        if store is None or len(store) == 0:
+            return self.bars
+        # the bars since the last refresh (+ the one still forming), so a
+        # missed refresh (slow network, suspend) leaves no gap
+        missing = int((time.time() * 1000 - store.last_open_time) // self.interval_ms) + 2
+        return min(self.bars, max(2, missing))
+
+    def refresh(self, max_threads: int = 8) -> List[dict]:
+        """Fetch (network-bound: async tasks or threads), then evaluate every symbol in one pass."""
+        items = [(s, self.interval, self._limit(s)) for s in self.symbols]
+        for symbol, rows in zip(self.symbols, self.client.get_klines_many(items, max_threads=max_threads)):
+            if rows:
+                self._series.setdefault(symbol, Resampler(max_bars=self.bars)).merge(rows)
+        return self.evaluate()
+
+    def matrices(self) -> List[Tuple[List[str], np.ndarray]]:
+        """
+        (symbols, closes) per history length, so no row is padded (padding
+        would bias EMA / RSI). Series shorter than `ema_slow` are left out
+        until they have enough bars for a meaningful slow EMA.
+        """
+        by_len: Dict[int, List[str]] = {}
+        for s in self.symbols:
+            store = self._series.get(s)
+            if store is not None and len(store) >= self.ema_slow:
+                by_len.setdefault(len(store), []).append(s)
+        return [(symbols, np.vstack([self._series[s].m1.close for s in symbols]))
+                for _, symbols in sorted(by_len.items(), reverse=True)]
+
+    def evaluate(self) -> List[dict]:
+        kwargs = {"ema_fast": self.ema_fast, "ema_slow": self.ema_slow}
+        rows = []
+        for symbols, closes in self.matrices():
+            if self.workers > 1 and len(symbols) >= self.pool_min_symbols:
+                res = evaluate_parallel(closes, self._get_pool(), self.workers, **kwargs)
+            else:
+                res = evaluate(closes, **kwargs)
+            rows += self._rows(symbols, res)
+        return rows
+
+    @staticmethod
+    def _rows(symbols: List[str], res: Dict[str, np.ndarray]) -> List[dict]:
+        return [
+            {
+                "symbol": s,
+                "last": float(res["last"][i]),
+                "change": float(res["change"][i]),
+                "ema_fast": float(res["ema_fast"][i]),
+                "ema_slow": float(res["ema_slow"][i]),
+                "rsi": float(res["rsi"][i]),
+                "signal": SIGNALS[int(res["signal"][i])],
+                "code": int(res["signal"][i]),
+            }
+            for i, s in enumerate(symbols)
+        ]
@@ -0,0 +1,387 @@
+import argparse
+import json
+import logging
+from dataclasses import MISSING, dataclass, field, fields
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import config
+from utils.async_binance import aiohttp
+from utils.resample import INTERVAL_MINUTES
+
+log = logging.getLogger("dashboard.config")
+
+# Binance spot limits (per IP)
+BINANCE_WEIGHT_PER_MIN = 6000
+BINANCE_STREAMS_PER_SOCKET = 1024
+
+# REST request weights (Binance spot API)
+WEIGHT_KLINES = 2
+WEIGHT_TRADES = 25
+WEIGHT_TICKER_24HR = 2
+
+
+def depth_weight(limit: int) -> int:
+    """Weight of GET /api/v3/depth for a given limit."""
+    if limit <= 100:
+        return 5
+    if limit <= 500:
+        return 25
+    if limit <= 1000:
+        return 50
+    return 250
+
+
+class ConfigError(ValueError):
+    """Raised for an unusable configuration, or in strict mode when it exceeds the budget."""
+
+
+# (min, max) per numeric setting; None = unbounded. Values outside are clamped.
+LIMITS = {
+    "chart_poll_ms": (250, None),
+    "orderbook_poll_ms": (250, None),
+    "warm_poll_ms": (1000, None),  # 0 = warmer off
+    "kline_limit": (1, 1000),
+    "orderbook_limit": (1, 5000),
+    "trades_rows": (1, 1000),
+    "power_idle_ms": (0, None),
+    "warm_symbols": (0, None),
+    "screener_workers": (0, None),
+    "rest_weight_budget": (1, None),
+    "max_sockets": (1, None),
+    "metrics_port": (0, 65535),
+}
+OFF_ALLOWED = {"warm_poll_ms"}  # 0 switches these off instead of being clamped
+CHOICES = {
+    "kline_interval": tuple(INTERVAL_MINUTES),
+    "screener_interval": tuple(INTERVAL_MINUTES),
+    "trades_mode": ("auto", "trade", "aggTrade", "conflate"),
+}
+
+
+@dataclass
+class Settings:
+    """Runtime configuration: config.py defaults < JSON file < CLI flags."""
+    assets: List[Tuple[str, str]] = field(default_factory=lambda: list(config.DASHBOARD_ASSETS))
+    rest_base: str = config.REST_BASE
+    ws_base: str = config.WS_BASE
+
+    chart_poll_ms: int = config.CHART_POLL_MS
+    orderbook_poll_ms: int = config.ORDERBOOK_POLL_MS
+    kline_interval: str = config.KLINE_INTERVAL
+    kline_limit: int = config.KLINE_LIMIT
+    orderbook_limit: int = config.ORDERBOOK_LIMIT
+    trades_rows: int = config.TRADES_ROWS
+    trades_mode: str = config.TRADES_MODE
+    card_book_ticker: bool = config.CARD_BOOK_TICKER
+    adaptive_cadence: bool = config.ADAPTIVE_CADENCE
+    power_save: bool = config.POWER_SAVE
+    record: bool = config.RECORD
+    record_dir: str = config.RECORD_DIR
+    power_idle_ms: int = config.POWER_IDLE_MS
+    feed_process: bool = config.FEED_PROCESS
+
+    warm_symbols: int = config.WARM_SYMBOLS
+    warm_poll_ms: int = config.WARM_POLL_MS
+    prefetch_assets: bool = config.PREFETCH_ASSETS
+
+    screener_symbols: List[str] = field(default_factory=lambda: list(config.SCREENER_SYMBOLS))
+    screener_interval: str = config.SCREENER_INTERVAL
+    screener_workers: int = config.SCREENER_WORKERS
+
+    # budgets
+    rest_weight_budget: int = config.REST_WEIGHT_BUDGET
+    max_sockets: int = config.MAX_SOCKETS
+    strict: bool = False
+
+    metrics_host: str = config.METRICS_HOST
+    metrics_port: int = config.METRICS_PORT
+
+    # filled by enforce_budget(): human-readable adjustments that were made
+    notes: List[str] = field(default_factory=list)
+
+    @property
+    def symbols(self) -> List[str]:
+        return [s for s, _ in self.assets]
+
+    def short(self, symbol: str) -> str:
+        """'BTCUSDT' -> 'BTC' (from the configured label when there is one)."""
+        label = dict(self.assets).get(symbol, symbol)
+        return label.split("/")[0].strip()
+
+    @property
+    def screener_universe(self) -> List[str]:
+        return list(self.screener_symbols) or self.symbols
+
+
+def _parse_assets(value) -> List[Tuple[str, str]]:
+    """Accept ["BTCUSDT", ...], [["BTCUSDT", "BTC/USDT"], ...] or "BTCUSDT,ETHUSDT"."""
+    if isinstance(value, str):
+        value = [v for v in value.split(",") if v.strip()]
+    assets = []
+    for item in value:
+        if isinstance(item, str):
+            sym = item.strip().upper()
+            base = sym[:-4] if sym.endswith("USDT") else sym
+            assets.append((sym, f"{base}/USDT" if sym.endswith("USDT") else sym))
+        else:
+            assets.append((str(item[0]).upper(), str(item[1])))
+    return assets
+
+
+def _apply(settings: Settings, values: Dict[str, object]):
+    names = {f.name for f in fields(Settings)}
+    for key, value in values.items():
+        if value is None:
+            continue
+        if key not in names or key == "notes":
+            log.warning("unknown config key ignored: %s", key)
+            continue
+        try:
+            if key == "assets":
+                value = _parse_assets(value)
+            elif key == "screener_symbols":
+                value = [sym for sym, _ in _parse_assets(value)]
+        except (TypeError, IndexError):
+            raise ConfigError(f"{key}: expected a list of symbols, got {value!r}") from None
+        setattr(settings, key, value)
+
+
+_TRUE = ("true", "1", "yes", "on")
+_FALSE = ("false", "0", "no", "off")
+
+
+def _coerce(kind: type, value):
+    """JSON / CLI value -> the type of the setting's default (TypeError / ValueError if it is not one)."""
+    if kind is bool:
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in _TRUE or text in _FALSE:
+            return text in _TRUE
+        raise ValueError(value)
+    if kind is int:
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            raise ValueError(value)
+        return int(value)
+    if kind is str and not isinstance(value, str):
+        raise TypeError(value)
+    return value
+
+
+def validate(s: Settings) -> Settings:
+    """
+    Coerce every scalar setting to the type of its default, check CHOICES and
+    clamp into LIMITS, so a bad file or flag fails here with ConfigError
+    instead of as a zero-delay after() loop or a TypeError inside a panel.
+    """
+    for f in fields(Settings):
+        if f.default is MISSING:
+            continue  # lists: parsed by _apply
+        value = getattr(s, f.name)
+        try:
+            value = _coerce(type(f.default), value)
+        except (TypeError, ValueError):
+            raise ConfigError(f"{f.name}: expected {type(f.default).__name__}, got {value!r}") from None
+        if f.name in CHOICES and value not in CHOICES[f.name]:
+            raise ConfigError(f"{f.name}: {value!r} is not one of {', '.join(CHOICES[f.name])}")
+        if f.name in LIMITS and not (value == 0 and f.name in OFF_ALLOWED):
+            lo, hi = LIMITS[f.name]
+            clamped = max(lo, value)
+            if hi is not None:
+                clamped = min(hi, clamped)
+            if clamped != value:
+                log.warning("%s=%s is out of range, using %s", f.name, value, clamped)
+                value = clamped
+        setattr(s, f.name, value)
+    if not s.assets:
+        raise ConfigError("no assets configured")
+    return s
+
+
+# -------------------------
+# budget
+# -------------------------
+def screener_weight_per_min(s: Settings) -> float:
+    """One klines request per symbol on every screener bar close."""
+    minutes = INTERVAL_MINUTES.get(s.screener_interval, 1)
+    return WEIGHT_KLINES * len(s.screener_universe) / minutes
+
+
+def warm_symbol_count(s: Settings) -> int:
+    """Symbols the warmer refreshes besides the one on screen."""
+    return s.warm_symbols + (len(s.assets) - 1 if s.prefetch_assets else 0)
+
+
+def background_weight_per_min(s: Settings) -> float:
+    """REST weight per minute of the symbol warmer and the screener."""
+    per_min = screener_weight_per_min(s)
+    if s.warm_poll_ms > 0:
+        per_min += warm_symbol_count(s) * (WEIGHT_KLINES + depth_weight(s.orderbook_limit)) * 60_000 / s.warm_poll_ms
+    return per_min
+
+
+def rest_weight_per_min(s: Settings) -> float:
+    """REST weight per minute of the polling panels, the symbol warmer and the screener."""
+    per_min = background_weight_per_min(s)
+    if s.chart_poll_ms > 0:
+        per_min += WEIGHT_KLINES * 60_000 / s.chart_poll_ms
+    if s.orderbook_poll_ms > 0 and not s.feed_process:
+        per_min += depth_weight(s.orderbook_limit) * 60_000 / s.orderbook_poll_ms
+    return per_min
+
+
+def shares_streams(s: Settings) -> bool:
+    """Ticker cards and the watchlist ride one StreamHub connection (aiohttp installed)."""
+    return aiohttp is not None
+
+
+def hub_stream_count(s: Settings) -> int:
+    """Streams on the shared connection: the watchlist plus each card's @ticker (and @bookTicker)."""
+    if s.feed_process:
+        return 1  # the feed process owns the card streams
+    return 1 + len(s.assets) * (2 if s.card_book_ticker else 1)
+
+
+def socket_count(s: Settings) -> int:
+    """
+    websocket-client: one socket per ticker card + trades + watchlist.
+    aiohttp: cards and watchlist share one hub connection, + trades.
+    Feed process: one combined socket + watchlist.
+    """
+    if s.feed_process or shares_streams(s):
+        return 2
+    return len(s.assets) + 2
+
+
+def enforce_budget(s: Settings) -> Settings:
+    """
+    Check the configuration against the REST-weight and socket budgets.
+    strict -> raise ConfigError; otherwise degrade and record a note:
+    - screener over half the budget: scan fewer symbols
+    - REST over budget: stretch poll intervals proportionally
+    - sockets over budget: keep only as many ticker cards as fit
+    Background pollers (screener, warmer) that leave nothing for the panels
+    raise ConfigError in either mode.
+    """
+    s.notes = []
+    budget = min(s.rest_weight_budget, BINANCE_WEIGHT_PER_MIN)
+
+    screener = screener_weight_per_min(s)
+    if screener > budget / 2:
+        msg = f"screener weight {screener:.0f}/min exceeds half the budget ({budget / 2:.0f}/min)"
+        if s.strict:
+            raise ConfigError(msg)
+        universe = s.screener_universe
+        keep = max(1, int(len(universe) * budget / 2 / screener))
+        s.screener_symbols = universe[:keep]
+        screener = screener_weight_per_min(s)
+        s.notes.append(f"{msg}; screener limited to {keep} symbols")
+
+    if screener >= budget:
+        raise ConfigError(f"screener weight {screener:.0f}/min leaves nothing of budget {budget}/min")
+
+    weight = rest_weight_per_min(s)
+    if weight > budget:
+        msg = f"REST weight {weight:.0f}/min exceeds budget {budget}/min"
+        if s.strict:
+            raise ConfigError(msg)
+        # only the polled panels can be stretched
+        factor = (weight - screener) / (budget - screener)
+        s.chart_poll_ms = int(s.chart_poll_ms * factor) + 1
+        s.orderbook_poll_ms = int(s.orderbook_poll_ms * factor) + 1
+        s.warm_poll_ms = int(s.warm_poll_ms * factor) + 1
+        s.notes.append(f"{msg}; poll intervals stretched x{factor:.2f}")
+
+    # the chart / order book pollers share what the warmer and screener leave
+    background = background_weight_per_min(s)
+    if background >= budget:
+        raise ConfigError(f"background REST weight {background:.0f}/min leaves nothing of budget {budget}/min")
+
+    sockets = socket_count(s)
+    if sockets > s.max_sockets:
+        msg = f"{sockets} sockets exceed budget {s.max_sockets}"
+        if s.strict:
+            raise ConfigError(msg)
+        if s.feed_process or shares_streams(s):
+            s.notes.append(f"{msg}; ticker cards already share a connection, nothing to drop")
+        else:
+            keep = max(1, s.max_sockets - 2)
+            _drop_cards(s, keep, f"{msg}; ticker cards limited to {keep}")
+
+    streams = hub_stream_count(s)
+    if shares_streams(s) and streams > BINANCE_STREAMS_PER_SOCKET:
+        msg = f"{streams} streams exceed {BINANCE_STREAMS_PER_SOCKET} per connection"
+        if s.strict:
+            raise ConfigError(msg)
+        keep = (BINANCE_STREAMS_PER_SOCKET - 1) // (2 if s.card_book_ticker else 1)
+        _drop_cards(s, keep, f"{msg}; ticker cards limited to {keep}")
+
+    for note in s.notes:
+        log.warning(note)
+    return s
+
+
+def _drop_cards(s: Settings, keep: int, msg: str):
+    dropped = [sym for sym, _ in s.assets[keep:]]
+    s.assets = s.assets[:keep]
+    s.notes.append(f"{msg} (dropped {', '.join(dropped)}, still in watchlist)")
+
+
+# -------------------------
+# loading
+# -------------------------
+def build_arg_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description=config.APP_TITLE)
+    p.add_argument("--config", help="JSON settings file (default: dashboard.json next to main.py)")
+    p.add_argument("--assets", help="comma separated symbols, e.g. BTCUSDT,ETHUSDT")
+    p.add_argument("--ws-base", dest="ws_base")
+    p.add_argument("--rest-base", dest="rest_base")
+    p.add_argument("--chart-poll-ms", dest="chart_poll_ms", type=int)
+    p.add_argument("--orderbook-poll-ms", dest="orderbook_poll_ms", type=int)
+    p.add_argument("--kline-interval", dest="kline_interval")
+    p.add_argument("--kline-limit", dest="kline_limit", type=int)
+    p.add_argument("--orderbook-limit", dest="orderbook_limit", type=int)
+    p.add_argument("--trades-rows", dest="trades_rows", type=int)
+    p.add_argument("--trades-mode", dest="trades_mode", choices=("auto", "trade", "aggTrade", "conflate"))
+    p.add_argument("--screener-symbols", dest="screener_symbols", help="comma separated symbols scanned by the screener")
+    p.add_argument("--screener-interval", dest="screener_interval")
+    p.add_argument("--screener-workers", dest="screener_workers", type=int)
+    p.add_argument("--weight-budget", dest="rest_weight_budget", type=int)
+    p.add_argument("--max-sockets", dest="max_sockets", type=int)
+    p.add_argument("--book-ticker", dest="card_book_ticker", action="store_true", default=None,
+                   help="drive ticker cards from @bookTicker (live mid / spread)")
+    p.add_argument("--fixed-cadence", dest="adaptive_cadence", action="store_false", default=None,
+                   help="poll at the fixed intervals instead of adapting to market activity")
+    p.add_argument("--no-power-save", dest="power_save", action="store_false", default=None,
+                   help="keep rendering and polling while minimized or idle")
+    p.add_argument("--idle-ms", dest="power_idle_ms", type=int,
+                   help="unfocused time without input before low-power mode (0 = only when hidden)")
+    p.add_argument("--record", dest="record", action="store_true", default=None,
+                   help="record trades / top of book / closed klines to columnar files")
+    p.add_argument("--record-dir", dest="record_dir")
+    p.add_argument("--warm-symbols", dest="warm_symbols", type=int, help="recently viewed symbols kept warm")
+    p.add_argument("--prefetch-assets", dest="prefetch_assets", action="store_true", default=None,
+                   help="keep every configured asset warm for instant switching")
+    p.add_argument("--feed-process", dest="feed_process", action="store_true", default=None,
+                   help="decode all streams in a separate process (shared memory to the UI)")
+    p.add_argument("--metrics-port", dest="metrics_port", type=int)
+    p.add_argument("--strict", action="store_true", default=None, help="refuse configs over budget instead of degrading")
+    return p
+
+
+def load_settings(argv: Optional[Sequence[str]] = None, default_file: Optional[Path] = None) -> Settings:
+    """Defaults from config.py, then the JSON file, then CLI overrides; validated, budget enforced last."""
+    args = vars(build_arg_parser().parse_args(argv))
+    file_arg = args.pop("config")
+    settings = Settings()
+
+    path = Path(file_arg) if file_arg else default_file
+    if path is not None and path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            _apply(settings, json.load(f))
+    elif file_arg:
+        raise ConfigError(f"config file not found: {file_arg}")
+    _apply(settings, args)
+
+    return enforce_budget(validate(settings))
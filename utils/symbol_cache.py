@@ -0,0 +1,194 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.binance_api import BinanceRESTClient
+from utils.resample import MINUTE_MS, Resampler
+
+# rough per-item cost of Python-level rows (book levels, tape rows)
+LEVEL_BYTES = 200
+TRADE_ROW_BYTES = 250
+
+
+@dataclass
+class SymbolState:
+    """Everything the panels need to show a symbol without waiting on the network."""
+    symbol: str
+    resampler: Resampler
+    graphs: Dict[str, tuple] = field(default_factory=dict)  # chart: interval -> (IndicatorGraph, nodes)
+    book: Tuple[list, list] = ([], [])                       # last (bids, asks), best first
+    trades: List[tuple] = field(default_factory=list)         # tape rows, newest first
+    touched: float = 0.0
+
+    @property
+    def nbytes(self) -> int:
+        n = self.resampler.nbytes + sum(g.nbytes for g, _ in self.graphs.values())
+        n += LEVEL_BYTES * (len(self.book[0]) + len(self.book[1]))
+        n += TRADE_ROW_BYTES * len(self.trades)
+        return n
+
+
+class SymbolCache:
+    """
+    LRU of SymbolState.
+    - at most `max_symbols` recently viewed symbols (prefetched ones don't count)
+    - total size kept under `max_bytes`; least recently used go first,
+      prefetched symbols only after every viewed one
+    The symbol on screen is never evicted.
+    """
+
+    def __init__(self, max_symbols: int = 6, max_bytes: int = 64 << 20, history_minutes: int = 15_000):
+        self.max_symbols = max_symbols
+        self.max_bytes = max_bytes
+        self.history_minutes = history_minutes
+        self.prefetch: set = set()
+        self._states: "OrderedDict[str, SymbolState]" = OrderedDict()
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._states
+
+    def __len__(self):
+        return len(self._states)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(s.nbytes for s in self._states.values())
+
+    def symbols(self) -> List[str]:
+        """Least recently used first."""
+        return list(self._states)
+
+    def peek(self, symbol: str) -> Optional[SymbolState]:
+        return self._states.get(symbol.upper())
+
+    def get(self, symbol: str) -> SymbolState:
+        """State for `symbol` (created empty if needed), marked most recently used."""
+        symbol = symbol.upper()
+        state = self._states.get(symbol)
+        if state is None:
+            state = SymbolState(symbol, Resampler(max_bars=self.history_minutes))
+            self._states[symbol] = state
+        self._states.move_to_end(symbol)
+        state.touched = time.time()
+        self.evict(keep=symbol)
+        return state
+
+    def set_prefetch(self, symbols: Iterable[str]):
+        """Symbols kept warm even if never viewed (e.g. the configured assets)."""
+        self.prefetch = {s.upper() for s in symbols}
+        for s in self.prefetch:
+            if s not in self._states:
+                self._states[s] = SymbolState(s, Resampler(max_bars=self.history_minutes))
+                self._states.move_to_end(s, last=False)
+        self.evict()
+
+    def evict(self, keep: Optional[str] = None) -> List[str]:
+        dropped = []
+        viewed = [s for s in self._states if s not in self.prefetch]
+        excess = len(viewed) - self.max_symbols
+        for s in viewed:
+            if excess <= 0:
+                break
+            if s != keep:
+                del self._states[s]
+                dropped.append(s)
+                excess -= 1
+
+        # memory budget: viewed symbols first, then prefetched ones
+        if self.nbytes > self.max_bytes:
+            order = [s for s in self._states if s not in self.prefetch] + [s for s in self._states if s in self.prefetch]
+            total = self.nbytes
+            for s in order:
+                if total <= self.max_bytes:
+                    break
+                if s == keep:
+                    continue
+                total -= self._states.pop(s).nbytes
+                dropped.append(s)
+        return dropped
+
+
+class SymbolWarmer:
+    """
+    Refreshes cached symbols that are not on screen: the missing 1m tail and
+    the book, fetched on one worker thread per cycle and merged on the Tk
+    thread, so a later switch to that symbol only has to render.
+    """
+
+    def __init__(
+        self,
+        root,
+        client: BinanceRESTClient,
+        cache: SymbolCache,
+        current: Callable[[], str],
+        poll_ms: int = 30_000,
+        book_limit: int = 100,
+    ):
+        self.root = root
+        self.client = client
+        self.cache = cache
+        self.current = current
+        self.poll_ms = poll_ms
+        self.book_limit = book_limit
+
+        self._job: Optional[str] = None
+        self._active = False
+        self._busy = False
+
+    def start(self):
+        if self._active:
+            return
+        self._active = True
+        self._cycle()
+
+    def stop(self):
+        self._active = False
+        if self._job:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def _cycle(self):
+        if not self._active:
+            return
+        current = self.current().upper()
+        targets = [(s, self.cache.peek(s).resampler.last_open_time) for s in self.cache.symbols() if s != current]
+        if targets and not self._busy:
+            self._busy = True
+            threading.Thread(target=self._fetch, args=(targets,), daemon=True).start()
+        self._job = self.root.after(self.poll_ms, self._cycle)
+
+    def _fetch(self, targets):
+        results = []
+        for symbol, last in targets:
+            if not self._active:
+                break
+            try:
+                if last is None:
+                    rows = self.client.get_klines(symbol, "1m", 1000)
+                else:
+                    missing = int((time.time() * 1000 - last) // MINUTE_MS) + 2
+                    rows = self.client.get_klines(symbol, "1m", min(1000, max(2, missing)))
+                ob = self.client.get_orderbook(symbol, limit=self.book_limit)
+                results.append((symbol, rows, ob.get("bids", []), ob.get("asks", [])))
+            except Exception:
+                continue
+        try:
+            self.root.after(0, self._apply, results)
+        except Exception:
+            self._busy = False
+
+    def _apply(self, results):
+        self._busy = False
+        current = self.current().upper()
+        for symbol, rows, bids, asks in results:
+            state = self.cache.peek(symbol)
+            if state is None:
+                continue  # evicted meanwhile
+            state.resampler.merge(rows)
+            if symbol != current:
+                state.book = (bids, asks)
@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass
+class TradeBucket:
+    """Trades of one fixed time bucket (OHLCV + taker buy/sell volume)."""
+    start_ms: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+    buy_volume: float = 0.0
+    sell_volume: float = 0.0
+    count: int = 0
+
+    @property
+    def side(self) -> str:
+        """Dominant taker side of the bucket."""
+        return "SELL" if self.sell_volume > self.buy_volume else "BUY"
+
+
+class TradeConflator:
+    """
+    Client-side conflation of a trade stream into `bucket_ms` buckets.
+    add() is O(1) and returns the bucket that just closed (if the trade
+    starts a new one), so the caller renders once per bucket, not per trade.
+    """
+
+    def __init__(self, bucket_ms: int = 100):
+        self.bucket_ms = max(1, int(bucket_ms))
+        self.current: Optional[TradeBucket] = None
+
+    def add(self, time_ms: int, price: float, qty: float, is_sell: bool) -> Optional[TradeBucket]:
+        start = time_ms - time_ms % self.bucket_ms
+        closed = None
+        b = self.current
+        if b is None or start > b.start_ms:
+            closed = b
+            b = self.current = TradeBucket(start, price, price, price, price)
+        elif price > b.high:
+            b.high = price
+        elif price < b.low:
+            b.low = price
+        b.close = price
+        b.volume += qty
+        if is_sell:
+            b.sell_volume += qty
+        else:
+            b.buy_volume += qty
+        b.count += 1
+        return closed
+
+    def flush(self, now_ms: int) -> Optional[TradeBucket]:
+        """Close the open bucket once its time is over (quiet markets)."""
+        b = self.current
+        if b is not None and now_ms >= b.start_ms + self.bucket_ms:
+            self.current = None
+            return b
+        return None
+
+    def reset(self):
+        self.current = None
+
+
+class RateMeter:
+    """Messages per second, exponentially smoothed over ~`window_s`."""
+
+    def __init__(self, window_s: float = 5.0):
+        self.window_s = window_s
+        self.rate = 0.0
+        self._count = 0
+        self._since: Optional[float] = None
+
+    def tick(self, n: int = 1):
+        self._count += n
+
+    def sample(self, now: float) -> float:
+        if self._since is None:
+            self._since = now
+            return self.rate
+        dt = now - self._since
+        if dt <= 0:
+            return self.rate
+        inst = self._count / dt
+        a = min(1.0, dt / self.window_s)
+        self.rate = inst if self.rate == 0.0 else (1 - a) * self.rate + a * inst
+        self._count = 0
+        self._since = now
+        return self.rate
+
+    def reset(self):
+        self.rate = 0.0
+        self._count = 0
+        self._since = None